@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the list backend csv engines: `csv.DictReader` /
+`DictWriter` rows (the default with `pandas=False`) against
+`csv_engine='rows'` tuple rows with one header.
+
+Prints rows read and written per second, and bytes held per row
+(measured with tracemalloc, mostly the cell strings).
+
+Usage:
+    python benchmarks/bench_csv_engine.py [rows]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from datafuzz.dataset import DataSet
+
+
+def write_input(filename, num_rows):
+    """ Write a csv file with `num_rows` rows and 6 columns """
+    with open(filename, 'w', newline='') as myf:
+        writer = csv.writer(myf)
+        writer.writerow(['id', 'name', 'price', 'count', 'flag', 'city'])
+        for idx in range(num_rows):
+            writer.writerow([idx, 'name {}'.format(idx), idx * .25,
+                             idx % 100, idx % 2 == 0,
+                             'city {}'.format(idx % 50)])
+
+
+def read_input(input_file, output_file, engine):
+    """ Read the csv input with the given csv engine """
+    return DataSet('file://' + input_file, pandas=False, csv_engine=engine,
+                   output='file://' + output_file)
+
+
+def bench(num_rows, directory):
+    """ Print read, write and memory results for each engine """
+    input_file = os.path.join(directory, 'input.csv')
+    output_file = os.path.join(directory, 'output.csv')
+    write_input(input_file, num_rows)
+    for engine in ['dict', 'rows']:
+        tracemalloc.start()
+        dataset = read_input(input_file, output_file, engine)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del dataset
+        start = time.perf_counter()
+        dataset = read_input(input_file, output_file, engine)
+        read = time.perf_counter() - start
+        start = time.perf_counter()
+        dataset.to_output()
+        write = time.perf_counter() - start
+        print('{:>4}: read {:,.0f} rows/s, write {:,.0f} rows/s, '
+              '{:.0f} bytes/row'.format(engine, num_rows / read,
+                                        num_rows / write, memory / num_rows))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        bench(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 5,
+              tmp)
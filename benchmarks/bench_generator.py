@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark `DatasetGenerator.generate` on a numeric/choice schema and
+on the example sales schema (which is bound by faker).
+
+Usage:
+    python benchmarks/bench_generator.py [rows]
+"""
+import os
+import sys
+import time
+
+from datafuzz.generators import DatasetGenerator
+from datafuzz.parsers import SchemaYAMLParser
+
+SALES_SCHEMA = os.path.join(os.path.dirname(__file__), os.pardir, 'datafuzz',
+                            'examples', 'yaml_files', 'sales_schema.yaml')
+NUMERIC_SCHEMA = {'id': 'range(0,1000000)', 'score': 'arange(0,100)',
+                  'status': ['new', 'open', 'closed'], 'flag': [0, 1]}
+
+
+def bench(schema, num_rows):
+    """ Return generated rows per second """
+    generator = DatasetGenerator(dict(schema, num_rows=num_rows,
+                                      output='list', seed=1))
+    start = time.perf_counter()
+    generator.generate()
+    return num_rows / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 5
+    sales = SchemaYAMLParser(SALES_SCHEMA)
+    for name, schema in [('numeric/choice', {'schema': NUMERIC_SCHEMA}),
+                         ('sales (faker)', {'schema': sales.schema})]:
+        print('{:>15}: {:,.0f} rows/s'.format(name, bench(schema, rows)))
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark JSON output (`JSONOutput.to_json`) against the previous
+writers (`records.T.to_json` for dataframes, `json.dump(indent=4)`
+for lists).
+
+Usage:
+    python benchmarks/bench_json_output.py [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from datafuzz.dataset import DataSet
+
+
+def timed(function):
+    """ Return the seconds taken by `function()` """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def bench(num_rows, directory):
+    """ Print timings for pandas and list records of `num_rows` rows """
+    rows = [{'a': idx, 'b': idx * .5, 'c': 'value {}'.format(idx),
+             'd': idx % 7 == 0} for idx in range(num_rows)]
+    output = os.path.join(directory, 'output.json')
+    frame = pd.DataFrame(rows)
+    for name, records, previous in [
+            ('pandas', frame, lambda: frame.T.to_json(output)),
+            ('list', rows, lambda: json.dump(
+                rows, open(output, 'w', encoding='utf-8'), indent=4))]:
+        dataset = DataSet(records, output='file://' + output,
+                          pandas=name == 'pandas')
+        print('{:>7} previous: {:.2f}s, chunked: {:.2f}s'.format(
+            name, timed(previous), timed(dataset.to_output)))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        bench(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 5,
+              tmp)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark applying a function to one column of a list dataset
+(`Strategy.apply_func_to_column` with the list backend).
+
+Usage:
+    python benchmarks/bench_list_transform.py [rows ...]
+"""
+import sys
+import time
+
+from datafuzz.dataset import DataSet
+from datafuzz.noise import NoiseMaker
+
+
+def bench(num_rows):
+    """ Time one column transform on `num_rows` rows of lists """
+    dataset = DataSet([[idx, idx * 2, str(idx)] for idx in range(num_rows)],
+                      pandas=False, seed=1)
+    noizer = NoiseMaker(dataset, columns=[0], percentage=30,
+                        noise=['add_nulls'], seed=1)
+    start = time.perf_counter()
+    noizer.apply_func_to_column(lambda val: val + 1, 0)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    for rows in [int(float(arg)) for arg in sys.argv[1:]] or \
+            [10 ** 5, 10 ** 6]:
+        print('{:>10} rows: {:.2f}s'.format(rows, bench(rows)))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark `sample_indexes` against `Generator.choice(replace=False)`
+and `random.sample(range(rows))` (the previous sampling), for each
+sample fraction. Prints seconds and the tracemalloc peak for each.
+
+`random.sample` is skipped above `SLOW_ROWS` rows.
+
+Usage:
+    python benchmarks/bench_sampling.py [rows ...]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from datafuzz.utils.sampling_helpers import sample_indexes
+
+FRACTIONS = [.01, .3, .5, .99]
+SLOW_ROWS = 10 ** 7
+
+
+def measure(function):
+    """ Return the seconds taken by `function()` and its peak memory (MB)
+        (measured in a second run, as tracing slows allocations down)
+    """
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return '{:6.2f}s {:6.0f}MB'.format(seconds, peak / 2 ** 20)
+
+
+def bench(num_rows):
+    """ Print timings for `num_rows` rows and each of `FRACTIONS` """
+    rng = np.random.default_rng(0)
+    python_rng = random.Random(0)
+    for fraction in FRACTIONS:
+        size = int(num_rows * fraction)
+        results = [
+            measure(lambda: rng.choice(num_rows, size, replace=False)),
+            measure(lambda: sample_indexes(rng, num_rows, size))]
+        if num_rows <= SLOW_ROWS:
+            results.append(measure(
+                lambda: python_rng.sample(range(num_rows), size)))
+        print('{:>6.0e} {:.2f}  {}'.format(num_rows, fraction,
+                                           '  '.join(results)))
+
+
+if __name__ == '__main__':
+    print('  rows frac  choice(replace=False)  sample_indexes' +
+          '    random.sample(range)')
+    for rows in sys.argv[1:] or ['1e6', '1e7']:
+        bench(int(float(rows)))
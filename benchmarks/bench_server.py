@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark `DataStreamServer` throughput (rows/s and MB/s) for each
+framing, with clients reading over a Unix socket.
+
+Usage:
+    python benchmarks/bench_server.py [rows] [clients]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from datafuzz.generators import DatasetGenerator
+from datafuzz.server import DataStreamServer
+
+
+async def read_all(path, num_clients):
+    """ Connect `num_clients` clients and read until the server is done """
+    async def client():
+        reader, writer = await asyncio.open_unix_connection(path=path)
+        await reader.read()
+        writer.close()
+    await asyncio.gather(*[client() for _ in range(num_clients)])
+
+
+def bench(num_rows, num_clients, directory):
+    """ Print throughput for `num_rows` rows sent to each client """
+    schema = {'schema': {'num': 'range(0,1000)', 'name': 'faker.name',
+                         'score': 'range(0.0,1.0)'},
+              'output': 'list', 'num_rows': num_rows}
+    for framing in ['ndjson', 'csv']:
+        path = os.path.join(directory, '{}.sock'.format(framing))
+        stream_server = DataStreamServer(DatasetGenerator(schema),
+                                         framing=framing, unix_socket=path)
+
+        async def run():
+            server = await stream_server.start()
+            async with server:
+                await read_all(path, num_clients)
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        seconds = time.perf_counter() - start
+        print('{:>6}: {:,.0f} rows/s, {:.1f} MB/s'.format(
+            framing, stream_server.rows_sent / seconds,
+            stream_server.bytes_sent / seconds / 2 ** 20))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        bench(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 5,
+              int(sys.argv[2]) if len(sys.argv) > 2 else 1, tmp)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Console script for datafuzz."""
 import argparse
+import json
+import logging
 import sys
 from datafuzz.parsers import StrategyCLIParser, StrategyYAMLParser, \
     SchemaCLIParser, SchemaYAMLParser
@@ -19,9 +21,13 @@ def main(args=None):
 
     If arguments are properly parsed and loaded, it will execute the generation
     or run strategy to completion.
+
+    `serve` streams generated data to socket clients (see `serve`).
     """
     if args is None:
         args = sys.argv[1:]
+    if args and args[0] == 'serve':
+        return serve(get_serve_parser().parse_args(args))
     if not args or (len(args) < 3 and '--non-yaml' not in args):
         parser = get_init_parser()
     elif args[0] == 'run':
@@ -80,5 +86,58 @@ def get_yaml_parser(init_parser):
     return SchemaYAMLParser(init_parser.file_name)
 
 
+def get_serve_parser():
+    """ Generate parser for the `serve` command
+            -file_name: YAML schema to generate data with
+            --strategies: JSON strategies to apply to each batch
+            --framing: ndjson or csv
+            --batch_size: rows per write
+            --host, --port or --unix_socket: where to listen
+            --num_rows: rows per client (overrides the schema)
+
+        Returns `argparse.ArgumentParser`
+    """
+    parser = argparse.ArgumentParser(
+        description='Stream generated (and fuzzed) data to socket clients')
+    parser.add_argument('serve', choices=['serve'])
+    parser.add_argument('file_name', type=str,
+                        help="YAML with schema.")
+    parser.add_argument('-s', '--strategies', type=json.loads,
+                        help='list of strategies to apply to each batch')
+    parser.add_argument('--framing', choices=['ndjson', 'csv'],
+                        default='ndjson', help='how to frame rows')
+    parser.add_argument('--batch_size', type=int, default=1000,
+                        help='number of rows per write')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='host to listen on')
+    parser.add_argument('--port', type=int, default=8877,
+                        help='port to listen on')
+    parser.add_argument('--unix_socket', type=str,
+                        help='Unix socket path to listen on instead of port')
+    parser.add_argument('--num_rows', type=int,
+                        help='rows to send each client (0 for unbounded)')
+    return parser
+
+
+def serve(args):
+    """ Serve data generated from the schema YAML in `args.file_name`
+        until Ctrl+C is pressed (see `server.DataStreamServer`)
+    """
+    from datafuzz.generators import DatasetGenerator
+    from datafuzz.server import DataStreamServer
+
+    generator = DatasetGenerator(SchemaYAMLParser(args.file_name))
+    if args.num_rows is not None:
+        generator.num_rows = args.num_rows or None
+    strategies = args.strategies
+    if isinstance(strategies, dict):
+        strategies = [strategies]
+    logging.basicConfig(level=logging.INFO)
+    DataStreamServer(generator, strategies=strategies,
+                     framing=args.framing, batch_size=args.batch_size,
+                     host=args.host, port=args.port,
+                     unix_socket=args.unix_socket).serve_forever()
+
+
 if __name__ == "__main__":
     main(sys.argv[1:])
@@ -9,13 +9,23 @@ try:
     from collections.abc import Iterable
 except ImportError:
     from collections import Iterable
+from collections import Counter
 import os
-import random
 import re
-from json import load
-from csv import DictReader
-import dataset as dataset_db
-from datafuzz.settings import HAS_PANDAS, HAS_NUMPY
+from itertools import islice
+from json import load, loads
+from csv import DictReader, reader as csv_reader
+from datafuzz.settings import HAS_PANDAS, HAS_NUMPY, HAS_PYARROW
+from datafuzz.utils.arrow_helpers import is_arrow_file, read_table, \
+    iter_tables, split_table, table_to_records, merge_passthrough
+from datafuzz.utils.columnar_helpers import ColumnStore
+from datafuzz.utils.db_helpers import connect
+from datafuzz.utils.numpy_helpers import load_array
+from datafuzz.utils.sampling_helpers import sample_indexes
+from datafuzz.utils.stats_helpers import column_stats, sample_positions, \
+    value_type, infer_dtype, DTYPE_SAMPLE
+from datafuzz.utils.random_helpers import seed_sequence, numpy_rng, \
+    python_rng
 
 from datafuzz.output.helpers import obj_to_output
 
@@ -36,13 +46,23 @@ class DataSet(object):
     You can also specify to not use pandas by passing \
     keyword argument `pandas=False`.
 
-    Supported inputs are JSON and CSV files, numpy 2D arrays, \
+    Pass `columnar=True` to keep list data in a `ColumnStore` \
+    instead (the 'columnar' data type): one typed array per \
+    numeric column and one list per other column, which works \
+    without pandas and uses a fraction of the memory of a list \
+    of dicts.
+
+    Supported inputs are JSON, JSON Lines (.jsonl or .ndjson), CSV, \
+    Parquet and Arrow IPC (Feather) files (Parquet and Arrow \
+    require pyarrow), numpy 2D arrays \
+    (in memory or memory mapped from .npy and .npz files), \
     sql queries (you must pass a `db_uri` keyword argument and \
     a `query` argument), pandas DataFrames and Python lists \
     (of dictionaries or lists).
 
     Attributes:
-        DATA_TYPES (str):   list of possible datatypes (pandas, numpy, list).
+        DATA_TYPES (str):   list of possible datatypes
+                            (pandas, numpy, list, columnar).
         FILE_REGEX (str):   regex to find file name
         USE_PANDAS(bool):   boolean that determines whether pandas is
                             installed and also OK to use (no `pandas=False`)
@@ -53,18 +73,63 @@ class DataSet(object):
                            (if specified, can be dataframe, list,
                                                 numpy array, filename or `sql`)
         original   (obj):   copy of input which won't be modified
-        data_type  (str):   dataset datatype (pandas, numpy, list).
+        data_type  (str):   dataset datatype (pandas, numpy, list, columnar).
         db_uri     (str):   dataset database connection string
                             (required only if using `sql` as input or output)
         query      (str):   dataset database select query string
                             (required only if using `sql` as input)
         table      (str):   dataset database output table
                             (required only if using `sql` as output)
+        db (`dataset.Database`): database connection shared by
+                            validation, input and output (defaults to
+                            the shared connection for `db_uri`, see
+                            `utils.db_helpers.connect`)
+        chunksize  (int):   number of rows to hold in memory at once
+                            (optional, streams csv, json lines, sql,
+                            parquet, arrow or npy input chunk by chunk,
+                            see `DataSet.iter_chunks`)
+        sql_chunksize (int): rows to insert per transaction for `sql`
+                            output (optional, defaults to `chunksize`)
+        sql_method (str):   pandas insert method for chunked `sql`
+                            output (None for executemany or 'multi'
+                            for multi-row VALUES inserts)
+        columns   (list):   column names to load into records (optional,
+                            parquet and arrow input only; the other
+                            columns are kept in `passthrough`)
+        passthrough (`pyarrow.Table`): input columns which were not
+                            loaded into records; they are written as is
+                            to parquet and arrow output and merged into
+                            the records for other outputs
+        column_names (list): column order of a parquet or arrow input
+        csv_engine (str):   'dict' (default) to read csv rows into dicts
+                            or 'rows' to read them into tuples with the
+                            column names stored once in `header`
+                            ('rows' never uses pandas)
+        header    (list):   csv column names (set by the 'rows' engine)
+        npz_key    (str):   name of the array to read from a .npz file
+                            (optional, defaults to the first array)
+        mmap_filename (str): .npy file the records are memory mapped from
+                            (copy-on-write, see `DataSet.changed_rows`)
+        copy_on_write (bool): share memory between `records` and the
+                            input and only copy columns when a strategy
+                            first changes them (optional, default False)
+        memory_report (Counter): bytes copied per strategy name
+                            (only filled when `copy_on_write` is set)
+        seed_sequence (`numpy.random.SeedSequence`): random stream for
+                            sampling (set with the `seed` kwarg; strategies
+                            without a seed spawn their stream from it)
+        stats     (dict):   cached column statistics by column index
+                            (see `DataSet.column_stats`)
+        dtype_sample (int): number of rows to infer list and columnar
+                            column types from (default DTYPE_SAMPLE)
+        dtypes    (dict):   inferred list column types by column index
+                            (see `DataSet.column_dtype`)
 
     """
     USE_PANDAS = HAS_PANDAS
     USE_NUMPY = HAS_NUMPY
-    DATA_TYPES = ['pandas', 'numpy', 'list']
+    USE_COLUMNAR = False
+    DATA_TYPES = ['pandas', 'numpy', 'list', 'columnar']
     FILE_REGEX = r'file://(?P<filename>.*)'
 
     def __init__(self, input_obj, **kwargs):
@@ -76,11 +141,38 @@ class DataSet(object):
         self.db_uri = None
         self.table = None
         self.query = None
+        self.db = kwargs.get('db')
         self.index = -1
+        self.chunksize = kwargs.get('chunksize')
+        self.sql_chunksize = kwargs.get('sql_chunksize')
+        self.sql_method = kwargs.get('sql_method')
+        self.columns = kwargs.get('columns')
+        self.passthrough = None
+        self.column_names = None
+        self.csv_engine = kwargs.get('csv_engine') or 'dict'
+        self.header = None
+        self.npz_key = kwargs.get('npz_key')
+        self.mmap_filename = None
+        self._changed_rows = []
+        self.copy_on_write = kwargs.get('copy_on_write', False)
+        self.memory_report = Counter()
+        self._chunks = None
+        self._shared_columns = set()
+        self.stats = {}
+        self._stats_records = None
+        self.dtype_sample = kwargs.get('dtype_sample') or DTYPE_SAMPLE
+        self.dtypes = {}
+        self._sample_types = {}
+        self.seed_sequence = seed_sequence(kwargs.get('seed'))
+        self.rng = numpy_rng(self.seed_sequence)
+        self.random = python_rng(self.seed_sequence)
         validate_db = False
 
         if kwargs.get('pandas') is False:
             self.USE_PANDAS = False
+        if kwargs.get('columnar'):
+            self.USE_COLUMNAR = True
+            self.USE_PANDAS = False
         if isinstance(self.input, str) and self.input == 'sql':
             self.db_uri = kwargs.get('db_uri')
             self.query = kwargs.get('query')
@@ -143,7 +235,9 @@ class DataSet(object):
             NOTE: Files are parsed using regex and searching \
             for file://$file_name
         """
-        if self.USE_PANDAS and isinstance(self.input, pd.DataFrame):
+        if isinstance(self.input, ColumnStore):
+            self._read_columnar()
+        elif self.USE_PANDAS and isinstance(self.input, pd.DataFrame):
             self._read_pandas()
         elif self.USE_NUMPY and isinstance(self.input, np.ndarray):
             self._read_numpy()
@@ -153,10 +247,21 @@ class DataSet(object):
                     self._read_csv()
                 elif self.input.endswith('.json'):
                     self._read_json()
+                elif self.input.endswith(('.jsonl', '.ndjson')):
+                    self._read_json_lines()
+                elif is_arrow_file(self.input):
+                    self._read_arrow()
+                elif self.input.endswith(('.npy', '.npz')) and HAS_NUMPY:
+                    self._read_npy()
             elif self.input == 'sql':
                 self._read_sql()
         elif isinstance(self.input, list):
             self._read_list()
+        if self.USE_COLUMNAR and self.data_type == 'list':
+            self.input = self.to_columnar(self.input)
+            self._read_columnar()
+            if self._chunks is not None:
+                self._chunks = map(self.to_columnar, self._chunks)
 
     def validate_parsed(self):
         """ Validate if data was properly parsed. This tests:
@@ -189,7 +294,9 @@ class DataSet(object):
         try:
             assert self.db_uri is not None
             assert self.query is not None or self.table is not None
-            assert dataset_db.connect(self.db_uri)
+            if self.db is None:
+                self.db = connect(self.db_uri)
+            assert self.db
         except AssertionError:
             raise Exception(
                 'You must define a valid db_uri and ' +
@@ -199,38 +306,257 @@ class DataSet(object):
         """ Read in pandas dataframe"""
         self.original = self.input
         self.data_type = 'pandas'
-        self.records = self.original.copy()
+        self.records = self.copy_input()
+
+    def _read_columnar(self):
+        """ Read in a column store """
+        self.data_type = 'columnar'
+        self.records = self.copy_input()
+
+    def to_columnar(self, rows):
+        """ Convert list records to a `ColumnStore`
+
+            Numbers are parsed from csv values, so numeric csv
+            columns are stored as typed arrays.
+
+            Arguments:
+                rows (list or `ColumnStore`): rows to convert
+
+            Returns:
+                `ColumnStore`
+        """
+        if isinstance(rows, ColumnStore):
+            return rows
+        return ColumnStore.from_rows(
+            rows, names=self.header,
+            parse=isinstance(self.original, str) and
+            self.original.endswith('.csv'))
 
     def _read_numpy(self):
         """ Read in numpy array"""
         self.original = self.input
         self.data_type = 'numpy'
-        self.records = self.input.copy()
+        self.records = self.copy_input()
+
+    def _read_npy(self):
+        """ Read in a .npy or .npz file as a memory mapped numpy array
+
+            The array is mapped copy-on-write, so changed rows are kept
+            in memory and the file is never written to. With a
+            `chunksize`, only `chunksize` rows are copied into memory
+            at a time.
+        """
+        self.original = self.input
+        self.data_type = 'numpy'
+        array = load_array(self.input_filename, key=self.npz_key)
+        if self.chunksize:
+            self._chunks = (array[start:start + self.chunksize]
+                            for start in range(0, array.shape[0],
+                                               self.chunksize))
+            self.input = next(self._chunks, array[:0])
+            self.records = self.copy_input()
+            return
+        self.input = array
+        self.records = array
+        if isinstance(array, np.memmap) and \
+                self.input_filename.endswith('.npy'):
+            self.mmap_filename = self.input_filename
+
+    def track_rows(self, indexes):
+        """ Remember rows changed in memory mapped records
+            (see `DataSet.changed_rows`)
+
+            Arguments:
+                indexes (list or np.ndarray): changed row indexes
+        """
+        if self.mmap_filename is not None:
+            self._changed_rows.append(np.asarray(indexes, dtype=np.intp))
+
+    def changed_rows(self):
+        """ Return the rows changed in memory mapped .npy records
+
+            Returns:
+                sorted `numpy.ndarray` of row indexes or None (if the
+                records are not memory mapped or were replaced, i.e.
+                upcast or extended, since they were read)
+        """
+        if self.mmap_filename is None or self.records is not self.input:
+            return None
+        if not self._changed_rows:
+            return np.array([], dtype=np.intp)
+        return np.unique(np.concatenate(self._changed_rows))
 
     def _read_csv(self):
         """ Read in csv to list or dataframe"""
         self.original = self.input
-        if self.USE_PANDAS:
+        if self.csv_engine == 'rows':
+            self.USE_PANDAS = False
+        if self.chunksize:
+            self._chunks = self._iter_csv_chunks()
+            self.input = next(self._chunks, [])
+            self.data_type = 'pandas' if self.USE_PANDAS else 'list'
+        elif self.USE_PANDAS:
             with open(self.input_filename, 'r') as myf:
                 self.input = pd.read_csv(myf)
             self.data_type = 'pandas'
+        elif self.USE_COLUMNAR:
+            with open(self.input_filename, 'r') as myf:
+                self.input = self.to_columnar(self._csv_rows(myf))
+            self.data_type = 'columnar'
         else:
             with open(self.input_filename, 'r') as myf:
-                self.input = list(DictReader(myf))
+                self.input = list(self._csv_rows(myf))
             self.data_type = 'list'
-        self.records = self.input.copy()
+        self.records = self.copy_input()
+
+    def _csv_rows(self, myf):
+        """ Return an iterator of csv rows for the list backend
+
+            With the 'rows' csv engine (and for columnar datasets), rows
+            are tuples and the header is kept once in `self.header`
+            (instead of in every row).
+        """
+        if self.csv_engine != 'rows' and not self.USE_COLUMNAR:
+            return DictReader(myf)
+        rows = csv_reader(myf)
+        self.header = next(rows, [])
+        return map(tuple, rows)
+
+    def copy_input(self):
+        """ Return a copy of `self.input` to use as `self.records`.
+
+            With `copy_on_write`, the copy shares memory with the input
+            (a shallow dataframe copy or a numpy view) and columns are
+            only copied when they are about to change
+            (see `DataSet.materialize`).
+        """
+        if not self.copy_on_write:
+            return self.input.copy()
+        if self.data_type == 'pandas':
+            self._shared_columns = set(range(self.input.shape[1]))
+            return self.input.copy(deep=False)
+        elif self.data_type == 'numpy':
+            self._shared_columns = set(range(self.input.shape[1]))
+            return self.input.view()
+        elif self.data_type == 'columnar':
+            self._shared_columns = set(range(self.input.num_columns))
+            return self.input.copy(deep=False)
+        return self.input.copy()
+
+    def materialize(self, column):
+        """ Copy a column which still shares memory with the input
+            before it is changed in place (see `copy_on_write`).
+
+            NOTE: numpy arrays cannot be split by column, so the first
+            write to a shared numpy array copies the whole array.
+
+            Arguments:
+                column (int): column index
+
+            Returns:
+                number of bytes copied
+        """
+        if column not in self._shared_columns:
+            return 0
+        if self.data_type == 'pandas':
+            values = self.records.iloc[:, column].copy()
+            self.records.isetitem(column, values)
+            self._shared_columns.discard(column)
+            return int(values.memory_usage(index=False))
+        elif self.data_type == 'columnar':
+            self._shared_columns.discard(column)
+            return self.records.copy_column(column)
+        self.records = self.records.copy()
+        self._shared_columns = set()
+        return self.records.nbytes
+
+    def _iter_csv_chunks(self):
+        """ Yield csv chunks of `self.chunksize` rows as lists or dataframes
+        """
+        with open(self.input_filename, 'r') as myf:
+            if self.USE_PANDAS:
+                yield from pd.read_csv(myf, chunksize=self.chunksize)
+            else:
+                reader = self._csv_rows(myf)
+                yield from iter(
+                    lambda: list(islice(reader, self.chunksize)), [])
 
     def _read_sql(self):
         """ Read in sql to list or dataframe"""
         self.original = self.input
-        if self.USE_PANDAS:
-            self.input = pd.read_sql_query(self.query, self.db_uri)
+        if self.chunksize:
+            self._chunks = self._iter_sql_chunks()
+            self.input = next(self._chunks, [])
+            self.data_type = 'pandas' if self.USE_PANDAS else 'list'
+        elif self.USE_PANDAS:
+            self.input = pd.read_sql_query(self.query, self.db.engine)
             self.data_type = 'pandas'
         else:
-            with dataset_db.connect(self.db_uri) as db:
-                self.input = list(db.query(self.query))
+            self.input = list(self.db.query(self.query))
             self.data_type = 'list'
-        self.records = self.input.copy()
+        self.records = self.copy_input()
+
+    def _iter_sql_chunks(self):
+        """ Yield query results in chunks of `self.chunksize` rows
+            as lists or dataframes.
+
+            Rows are fetched from an iterating (server-side, where the
+            database supports it) cursor, so only one chunk of the
+            result set is held in memory at a time.
+        """
+        if self.USE_PANDAS:
+            with self.db.engine.connect() as conn:
+                conn = conn.execution_options(stream_results=True)
+                yield from pd.read_sql_query(self.query, conn,
+                                             chunksize=self.chunksize)
+        else:
+            rows = self.db.query(self.query, _step=self.chunksize)
+            yield from iter(lambda: list(islice(rows, self.chunksize)), [])
+
+    def _read_arrow(self):
+        """ Read in parquet or arrow ipc file to list or dataframe
+
+            Only `self.columns` (if set) are converted, the other columns
+            are kept as an Arrow table in `self.passthrough`.
+        """
+        if not HAS_PYARROW:
+            raise NotImplementedError(
+                'pyarrow is required to read Parquet and Arrow files.')
+        self.original = self.input
+        if self.chunksize:
+            self._chunks = self._iter_arrow_chunks()
+            self.input = next(self._chunks, [])
+        else:
+            self.input = self._split_table(read_table(self.input_filename))
+        if self.USE_COLUMNAR:
+            self.data_type = 'columnar'
+        else:
+            self.data_type = 'pandas' if self.USE_PANDAS else 'list'
+        self.records = self.copy_input()
+
+    def _iter_arrow_chunks(self):
+        """ Yield parquet or arrow ipc chunks of `self.chunksize` rows
+            as lists or dataframes (setting `self.passthrough` for each)
+        """
+        for table in iter_tables(self.input_filename, self.chunksize):
+            yield self._split_table(table)
+
+    def _split_table(self, table):
+        """ Keep the passthrough columns of an Arrow table and return
+            the projected columns as a list or dataframe """
+        self.column_names = table.column_names
+        table, self.passthrough = split_table(table, self.columns)
+        return table_to_records(table, self.USE_PANDAS, self.USE_COLUMNAR)
+
+    def merge_passthrough(self):
+        """ Merge `self.passthrough` columns into `self.records`
+            (called by `obj_to_output` for non-arrow outputs)
+        """
+        self.records = merge_passthrough(self.records, self.data_type,
+                                         self.passthrough, self.column_names)
+        self.passthrough = None
+        self._shared_columns = set()
+        self.invalidate_stats()
 
     def _read_json(self):
         """ Read in json to list or dataframe"""
@@ -246,7 +572,38 @@ class DataSet(object):
             if not isinstance(self.input, list):
                 raise Exception(
                     'The JSON file must contain a list for datafuzz use.')
-        self.records = self.input.copy()
+        self.records = self.copy_input()
+
+    def _read_json_lines(self):
+        """ Read in json lines (one json document per line)
+            to list or dataframe """
+        self.original = self.input
+        if self.chunksize:
+            self._chunks = self._iter_json_lines_chunks()
+            self.input = next(self._chunks, [])
+            self.data_type = 'pandas' if self.USE_PANDAS else 'list'
+        elif self.USE_PANDAS:
+            with open(self.input_filename, 'r') as myf:
+                self.input = pd.read_json(myf, lines=True)
+            self.data_type = 'pandas'
+        else:
+            with open(self.input_filename, 'r') as myf:
+                self.input = [loads(line) for line in myf if line.strip()]
+            self.data_type = 'list'
+        self.records = self.copy_input()
+
+    def _iter_json_lines_chunks(self):
+        """ Yield json lines chunks of `self.chunksize` rows
+            as lists or dataframes
+        """
+        with open(self.input_filename, 'r') as myf:
+            if self.USE_PANDAS:
+                yield from pd.read_json(myf, lines=True,
+                                        chunksize=self.chunksize)
+            else:
+                rows = (loads(line) for line in myf if line.strip())
+                yield from iter(
+                    lambda: list(islice(rows, self.chunksize)), [])
 
     def _read_list(self):
         """ Read in list to list or dataframe"""
@@ -256,7 +613,31 @@ class DataSet(object):
             self.data_type = 'pandas'
         else:
             self.data_type = 'list'
-        self.records = self.input.copy()
+        self.records = self.copy_input()
+
+    def iter_chunks(self):
+        """ Iterate over the dataset one chunk at a time.
+
+            If the dataset was created with a `chunksize`, only one \
+            chunk is read into `self.records` at a time and this \
+            dataset is yielded again for each new chunk, so strategies \
+            and output can be applied chunk by chunk with bounded memory.
+
+            Without a `chunksize` (or for inputs which cannot be \
+            streamed), the whole dataset is yielded once.
+
+            NOTE: chunks are consumed as they are read, so this can \
+            only be iterated once.
+        """
+        yield self
+        if self._chunks is None:
+            return
+        for chunk in self._chunks:
+            self.input = chunk
+            self.records = self.copy_input()
+            self.index = -1
+            self.invalidate_stats()
+            yield self
 
     @property
     def input_filename(self):
@@ -277,7 +658,7 @@ class DataSet(object):
         """
         return re.match(self.FILE_REGEX, self.output).group('filename')
 
-    def sample(self, percentage, columns=False):
+    def sample(self, percentage, columns=False, num_rows=None):
         """ Get a sample from the dataset.
 
             Arguments:
@@ -287,36 +668,51 @@ class DataSet(object):
             Kwargs:
                 columns     (bool): option to sample columns from dataset \
                                     default is False
+                num_rows     (int): number of rows to sample (used
+                                    instead of percentage if given)
             Returns:
                 A sample from the dataset with matching datatype
+                (rows keep their order in the dataset), or the sampled
+                column names (pandas) or indexes
+
+            Rows are drawn as an array of indexes
+            (see `utils.sampling_helpers.sample_indexes`), so the
+            dataset is never copied into a list to sample from.
         """
-        if self.data_type == 'pandas':
-            if columns:
-                sample = np.random.choice(
-                    self.records.columns,
-                    round(self.records.shape[1] * percentage), replace=False)
+        if columns:
+            if self.data_type in ['pandas', 'numpy']:
+                num_columns = self.records.shape[1]
+            elif self.data_type == 'columnar':
+                num_columns = self.records.num_columns
             else:
-                sample = self.records.sample(frac=percentage).copy(deep=True)
+                num_columns = len(self.records[0])
+            sample = sample_indexes(self.rng, num_columns,
+                                    round(num_columns * percentage))
+            if self.data_type == 'pandas':
+                return self.records.columns[sample].to_numpy()
+            if self.data_type == 'numpy' or not hasattr(sample, 'tolist'):
+                return sample
+            return sample.tolist()
+        if num_rows is None:
+            num_rows = round(len(self) * percentage)
+        rows = sample_indexes(self.rng, len(self), num_rows)
+        if self.data_type == 'pandas':
+            return self.records.iloc[rows]
         elif self.data_type == 'numpy':
-            if columns:
-                sample = np.random.choice(
-                    range(len(self.records[0])),
-                    round(len(self.records[0]) * percentage), replace=False)
-            else:
-                sample = self.records[
-                    np.random.choice(self.records.shape[0],
-                                     round(self.records.shape[0] * percentage),
-                                     replace=False)]
-        else:
-            if columns:
-                sample = random.sample(
-                    range(len(self.records[0])),
-                    round(len(self.records[0]) * percentage))
+            return self.records[rows]
+        elif self.data_type == 'columnar':
+            return self.records.take(rows)
+        if hasattr(rows, 'tolist'):
+            rows = rows.tolist()
+        return [self.records[idx] for idx in rows]
 
-            else:
-                sample = random.sample(self.records,
-                                       round(len(self.records) * percentage))
-        return sample
+    def spawn_seed(self):
+        """ Return a new, independent random stream for a strategy
+
+            Returns:
+                `numpy.random.SeedSequence` spawned from `self.seed_sequence`
+        """
+        return self.seed_sequence.spawn(1)[0]
 
     def append(self, rows):
         """ Append rows to DataSet records
@@ -329,7 +725,12 @@ class DataSet(object):
                 - should the index be maintained or reordered
                 - should new indexes be ordered or not
         """
-        if self.data_type == 'list':
+        if self.data_type == 'columnar':
+            for column in list(self._shared_columns):
+                self.materialize(column)
+        self._shared_columns = set()
+        self.invalidate_stats()
+        if self.data_type in ['list', 'columnar']:
             self.records.extend(rows)
         elif self.data_type == 'numpy':
             self.records = np.append(self.records, rows, axis=0)
@@ -356,8 +757,15 @@ class DataSet(object):
             return int(column)
         elif self.data_type == 'pandas':
             return self.records.columns.get_loc(column)
-        elif self.data_type == 'list' and isinstance(self.records[0], dict):
+        elif self.data_type == 'list' and \
+                isinstance(self.records[0], dict) and \
+                column in self.records[0]:
             return list(self.records[0].keys()).index(column)
+        elif self.data_type == 'columnar' and self.records.names and \
+                column in self.records.names:
+            return self.records.names.index(column)
+        elif self.header and column in self.header:
+            return self.header.index(column)
         elif isinstance(column, int):
             return column
         elif not isinstance(column, str):
@@ -368,26 +776,128 @@ class DataSet(object):
     def column_dtype(self, column):
         """ Return dtype of column
 
+            List column types are inferred from `self.dtype_sample`
+            evenly spaced rows (see `utils.stats_helpers.infer_dtype`),
+            so a null or fuzzed first row does not decide the type.
+            The inferred type is cached and updated as strategies
+            change values in the sampled rows (see `track_dtypes`).
+
             Arguments:
                 column (int): column index
 
             Return:
-                data type of the column
-
-            TODO:
-                - determine smart way to test more than one row for a list?
+                data type of the column ('int64' or 'float64' for typed
+                columnar columns)
         """
         if self.data_type == 'pandas':
             return self.records.iloc[:, column].dtype
         elif self.data_type == 'numpy':
             return self.records[:, column].dtype
+        elif self.data_type == 'columnar':
+            return self.records.dtype(column, self.dtype_sample)
+        if column not in self.dtypes:
+            key = column
+            if isinstance(self.records[0], dict):
+                key = list(self.records[0].keys())[column]
+            self._sample_types[column] = {
+                idx: value_type(self.records[idx][key]) for idx in
+                sample_positions(len(self.records), self.dtype_sample)}
+            self.dtypes[column] = infer_dtype(
+                self._sample_types[column].values())
+        return self.dtypes[column]
+
+    def track_dtypes(self, column, indexes, values):
+        """ Update the inferred type of a list column after values
+            were changed (see `DataSet.column_dtype`)
+
+            Arguments:
+                column      (int): column index
+                indexes (list or np.ndarray): changed row indexes
+                values (list or np.ndarray): new values (same order
+                                             as indexes)
+        """
+        sample = self._sample_types.get(column)
+        if sample is None:
+            return
+        if HAS_NUMPY:
+            indexes = np.asarray(list(indexes)
+                                 if isinstance(indexes, set) else indexes)
+            positions = np.flatnonzero(np.isin(indexes, list(sample)))
+        else:
+            indexes = list(indexes)
+            positions = [pos for pos, idx in enumerate(indexes)
+                         if idx in sample]
+        for pos in positions:
+            sample[int(indexes[pos])] = value_type(values[pos])
+        self.dtypes[column] = infer_dtype(sample.values())
+
+    def column_values(self, column):
+        """ Return all values of one column
+
+            Arguments:
+                column (int): column index
+
+            Returns:
+                `pandas.Series`, `numpy.ndarray`, `array.array` (typed
+                columnar columns) or list
+        """
+        if self.data_type == 'pandas':
+            return self.records.iloc[:, column]
+        elif self.data_type == 'numpy':
+            return self.records[:, column]
+        elif self.data_type == 'columnar':
+            return self.records.columns[column]
         elif isinstance(self.records[0], dict):
-            return type(list(self.records[0].values())[column])
-        return type(self.records[0][column])
+            key = list(self.records[0].keys())[column]
+            return [row.get(key) for row in self.records]
+        return [row[column] for row in self.records]
+
+    def column_stats(self, column):
+        """ Return statistics for one column, computed from one read
+            of the column and cached until it changes
+
+            Strategies call `DataSet.invalidate_stats` for the columns
+            they change; the cache is also cleared when `self.records`
+            is replaced. Call `invalidate_stats` after changing
+            `self.records` in place yourself.
+
+            Arguments:
+                column (int): column index
+
+            Returns:
+                dict with min, max, nulls, dtype and distinct
+                (see `utils.stats_helpers.column_stats`)
+        """
+        if self._stats_records is not self.records:
+            self.stats = {}
+            self._stats_records = self.records
+        if column not in self.stats:
+            self.stats[column] = column_stats(self.column_values(column),
+                                              self.column_dtype(column))
+        return self.stats[column]
+
+    def invalidate_stats(self, column=None):
+        """ Remove cached column statistics (see `DataSet.column_stats`)
+
+            Without a column, the inferred list column types are
+            removed too (i.e. when rows are added).
+
+            Kwargs:
+                column (int): column index (default: all columns)
+        """
+        if column is None:
+            self.stats = {}
+            self.dtypes = {}
+            self._sample_types = {}
+        else:
+            self.stats.pop(column, None)
 
     def column_agg(self, column, agg_func):
         """ Perform aggregate function on given column
 
+            `min` and `max` are read from the cached column statistics
+            (ignoring null values, see `DataSet.column_stats`).
+
             Arguments:
                column        (int): column index
                agg_func (function): aggregate function to perform on column
@@ -398,10 +908,8 @@ class DataSet(object):
 
                 `dataset.column_agg(3, min)`
         """
-        if self.data_type == 'pandas':
-            return agg_func(self.records.iloc[:, column])
-        elif self.data_type == 'numpy':
-            return agg_func(self.records[:, column])
-        elif isinstance(self.records[0], dict):
-            return agg_func([list(x.values())[column] for x in self.records])
-        return agg_func([x[column] for x in self.records])
+        if agg_func in (min, max):
+            value = self.column_stats(column)[agg_func.__name__]
+            if value is not None:
+                return value
+        return agg_func(self.column_values(column))
@@ -5,6 +5,7 @@ Duplicator is used as a duplication strategy for datasets.
 It will take a series of rows of the dataset, duplicate and append them.
 You can also add random noise to the duplicated rows.
 """
+from functools import partial
 from datafuzz.dataset import DataSet
 from datafuzz.strategy import Strategy
 from datafuzz.utils.noise_helpers import messy_spaces, generate_random_int, \
@@ -32,7 +33,8 @@ class Duplicator(Strategy):
         Run duplicator strategy and if add noise is selected,
         add noise to the data before appending it to the dataset.
         """
-        sample = self.dataset.sample(self.percentage)
+        num_rows = self.num_rows if self.row_offset is not None else None
+        sample = self.dataset.sample(self.percentage, num_rows=num_rows)
 
         if self.add_noise:
             sample = self.noise(sample)
@@ -52,7 +54,9 @@ class Duplicator(Strategy):
                 - implement more noise options than just random
 
         """
-        sample_dataset = DataSet(sample.copy())
+        sample_dataset = DataSet(sample, copy_on_write=True,
+                                 pandas=self.dataset.data_type == 'pandas',
+                                 seed=self.seed_sequence.spawn(1)[0])
         columns = sample_dataset.sample(self.percentage, columns=True)
         if sample_dataset.data_type == 'pandas':
             sample_dataset.records = \
@@ -73,7 +77,7 @@ class Duplicator(Strategy):
                 if kwargs.get('low') == kwargs.get('high'):
                     kwargs['high'] += 1
                 sample = self.apply_func_to_column(
-                    lambda x: func(x, **kwargs), col, 
+                    partial(func, **kwargs), col,
                     dataset=sample_dataset)
             elif col_type in [object, str]:
                 
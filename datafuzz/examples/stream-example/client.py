@@ -2,19 +2,16 @@ import asyncio
 import json
 
 
-@asyncio.coroutine
-def listen_client(loop):
+async def listen_client():
     """ Create client to listen for lines of data"""
-    reader, writer = yield from asyncio.open_unix_connection(
-        path='/tmp/mys.sock', loop=loop)
+    reader, writer = await asyncio.open_unix_connection(path='/tmp/mys.sock')
     # uncomment following lines and remove
     # open_unix_connection line to use port
-    # reader, writer = yield from asyncio.open_connection(host='127.0.0.1',
-    #                                                     port=8877,
-    #                                                     loop=loop)
+    # reader, writer = await asyncio.open_connection(host='127.0.0.1',
+    #                                                port=8877)
 
     while True:
-        data = yield from reader.readline()
+        data = await reader.readline()
 
         if data:
             cleaned = json.loads(data.decode())
@@ -26,12 +23,5 @@ def listen_client(loop):
             return
 
 
-loop = asyncio.get_event_loop()
-# Listen to messages until Ctrl+C is pressed
-coro = loop.run_until_complete(listen_client(loop))
-try:
-    loop.run_forever()
-except KeyboardInterrupt:
-    pass
-
-loop.close()
+# Listen to messages until the server closes the connection
+asyncio.run(listen_client())
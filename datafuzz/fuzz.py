@@ -5,7 +5,6 @@ Fuzzer adds basic "dumb" fuzzing strategies to datafuzz.
 It will apply a random set of noise and fuzz based on the
 column type (or sometimes randomly).
 """
-import random
 from datafuzz.strategy import Strategy
 from datafuzz.utils.fuzz_helpers import add_format, change_encoding, \
         to_bytes, insert_boms, nanify, bigints, hexify,  \
@@ -43,14 +42,16 @@ class Fuzzer(Strategy):
 
             For now, this applies a mixture of random
             and column type based transformations.
+        Columns are transformed in parallel if `workers` is set.
 
             See `Fuzzer.fuzz_str`, `Fuzzer.fuzz_random`
             and `Fuzzer.fuzz_numeric` for full list of
             possible transformations.
         """
+        tasks = []
         for column in self.columns:
             col_type = self.dataset.column_dtype(column)
-            if random.randint(0, 100) < 20:
+            if self.random.randint(0, 100) < 20:
                 fuzz = self.fuzz_random()
             elif 'datetime' in str(col_type) or '<M8[ns]' in str(col_type):
                 fuzz = self.fuzz_date()
@@ -59,7 +60,8 @@ class Fuzzer(Strategy):
             elif 'int' in str(col_type) or 'float' in str(col_type):
                 fuzz = self.fuzz_numeric()
 
-            self.apply_func_to_column(fuzz, column)
+            tasks.append((fuzz, column))
+        self.apply_funcs_to_columns(tasks)
 
     def fuzz_str(self):
         """ Return random choice from string
@@ -72,8 +74,8 @@ class Fuzzer(Strategy):
                 - to_bytes:        transform to bytes
                 - insert_boms:     insert utf-8 boms
         """
-        return random.choice([add_format, change_encoding,
-                              to_bytes, insert_boms])
+        return self.random.choice([add_format, change_encoding,
+                                   to_bytes, insert_boms])
 
 
     def fuzz_date(self):
@@ -85,7 +87,7 @@ class Fuzzer(Strategy):
                 - shift_time:      shift the time by a random amount
                 - date_to_str:     transform to string
         """
-        return random.choice([shift_time, date_to_str])
+        return self.random.choice([shift_time, date_to_str])
 
 
     def fuzz_numeric(self):
@@ -97,7 +99,7 @@ class Fuzzer(Strategy):
                 - bigints:    return big magic numbers
                 - hexify:     return hex value
         """
-        return random.choice([nanify, bigints, hexify])
+        return self.random.choice([nanify, bigints, hexify])
 
     def fuzz_random(self):
         """ Return a random choice from the random
@@ -110,4 +112,4 @@ class Fuzzer(Strategy):
                 - delimiter:  inserts multiple delimiters
                 - emoji:      inserts one random emoji
         """
-        return random.choice([sql, metachars, files, delimiter, emoji])
+        return self.random.choice([sql, metachars, files, delimiter, emoji])
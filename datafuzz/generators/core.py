@@ -4,21 +4,25 @@ Generators are used to produce datasets to use with datafuzz.
 
 You must have faker installed to use the generator.
 """
-try:
-    from collections.abc import Iterable
-except ImportError:
-    from collections import Iterable
+import json
 import logging
-import random
+import os
 import re
+from collections import deque
 from datetime import timedelta
+from functools import partial
+from itertools import islice
 from faker import Faker
 
 from datafuzz.settings import HAS_NUMPY
 from datafuzz.output import obj_to_output
+from datafuzz.utils.random_helpers import seed_sequence, numpy_rng, \
+    python_rng
+from datafuzz.utils.schema_helpers import compile_schema
+from datafuzz.utils.parallel_helpers import imap_ordered
 
 if HAS_NUMPY:
-    from numpy import arange
+    import numpy as np
 
 
 class AttributeDict(dict):
@@ -44,12 +48,32 @@ class DatasetGenerator(object):
             timeseries                (bool): whether to generate a timeseries
             records                   (list): generated data
             fake               (faker.Faker): Faker object to generate data
+            seed                       (int): random seed (optional, the
+                                              same seed gives the same data)
+            workers                    (int): number of worker processes
+                                              (optional, default 1)
+            random           (random.Random): random generator
+            rng    (numpy.random.Generator): numpy random generator
+            plan                      (list): compiled schema, a list of
+                                              (field name, draw function)
+                                              (see `compile_schema`)
+            pools                     (dict): pre-generated faker values
+                                              per field (see `build_pool`)
+            db_uri                     (str): database uri for sql output
+            table                      (str): table name for sql output
+            sql_chunksize              (int): rows to insert per
+                                              transaction into sql output
+            sql_method                 (str): pandas insert method for
+                                              sql output (None or 'multi')
 
         Parser parameters:
 
             schema          (dict): dictionary of column names and
                                     values to use
                                     (i.e. {'foo': 'faker.name',...})
+                                    faker fields may also be a dict with
+                                    `value`, `pool_size` and `pool_path`
+                                    to sample from a pool of values
             num_rows         (int): number of rows to generate
             start_time  (datetime): datetime to start from if timeseries
             increments       (str): if timeseries, you may define the
@@ -57,13 +81,17 @@ class DatasetGenerator(object):
                                     on a series of string choices
                                     ('days', 'hours', 'seconds', 'random')
             end_time    (datetime): optional end date if timeseries
+            seed             (int): optional random seed
+            workers          (int): optional number of worker processes
+                                    to generate chunks of rows with
+            db_uri, table, sql_chunksize, sql_method: optional sql
+                                    output settings (see `SQLOutput`)
 
         see also `parsers.core`
     """
 
     FILE_REGEX = r'file://(?P<filename>.*)'
-    EVAL_REGEX = [r'range\(-?\d+,-?\d+\)$',
-                  r'arange\(-?\d+(\.\d+)?,-?\d+(\.\d+)?\)$']
+    BATCH_SIZE = 100000
 
     def __init__(self, schema_parser):
         if isinstance(schema_parser, dict):
@@ -78,80 +106,378 @@ class DatasetGenerator(object):
             self.timeseries = False
         self.records = []
         self.data_type = 'list'
+        try:
+            self.seed = schema_parser.seed
+        except KeyError:
+            self.seed = None
+        try:
+            self.workers = schema_parser.workers or 1
+        except KeyError:
+            self.workers = 1
+        for name in ['db_uri', 'table', 'sql_chunksize', 'sql_method']:
+            try:
+                setattr(self, name, getattr(schema_parser, name))
+            except (KeyError, AttributeError):
+                setattr(self, name, None)
+        self.seed_sequence = seed_sequence(self.seed)
+        self.random = python_rng(self.seed_sequence)
+        self.rng = numpy_rng(self.seed_sequence)
         self.fake = Faker()
+        if self.seed is not None:
+            self.fake.seed_instance(self.seed)
+        try:
+            self.pools = dict(schema_parser.pools or {})
+        except (KeyError, AttributeError):
+            self.pools = {}
+        self.plan = self.compile_schema()
 
     def generate(self):
         """ Generate the dataset (self.records) based on
             the given schema.
 
-            If a timeseries is selected, this method
-            will pass to `Generator.generate_timeseries`
+            Rows are generated column by column, `BATCH_SIZE`
+            rows at a time (see `DatasetGenerator.iter_batches`).
+
+            If a timeseries is selected, a `timestamp` column
+            is added (see `Generator.iter_timestamps`)
         """
-        if self.timeseries:
-            self.generate_timeseries()
+        for rows in self.iter_batches():
+            self.records.extend(rows)
+
+    def iter_batches(self, batch_size=None):
+        """ Lazily generate the dataset in batches of rows
+
+            Only the batches being generated are held in memory, and
+            `self.records` is left alone, so this can be used to stream
+            very large datasets (or, with `num_rows` set to None and
+            no `end_time`, an unbounded one).
+
+            Each batch draws from its own random stream (and seeded
+            Faker), spawned in order from `self.seed_sequence`, so
+            a seeded generator gives the same rows for any number
+            of workers. With `self.workers` > 1, batches are generated
+            in a process pool and yielded in order.
+
+            Kwargs:
+                batch_size (int): rows per batch (default: `BATCH_SIZE`)
 
+            Yields:
+                list of dict rows
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        timestamp_batches = deque()
+
+        def jobs():
+            """ yield batch sizes and streams (and queue timestamps) """
+            if self.timeseries:
+                for batch in self.iter_timestamp_batches(batch_size):
+                    timestamp_batches.append(batch)
+                    yield (len(batch), self.seed_sequence.spawn(1)[0])
+                return
+            remaining = self.num_rows
+            while remaining is None or remaining > 0:
+                num_rows = batch_size if remaining is None \
+                    else min(batch_size, remaining)
+                if remaining is not None:
+                    remaining -= num_rows
+                yield (num_rows, self.seed_sequence.spawn(1)[0])
+
+        if self.workers > 1:
+            batches = imap_ordered(_generate_worker_batch, jobs(),
+                                   self.workers, initializer=_init_worker,
+                                   initargs=(self.schema, self.pools))
         else:
-            while len(self.records) < self.num_rows:
-                row = self.generate_row()
-                self.records.append(row)
+            batches = (self.generate_batch(*job) for job in jobs())
+        for rows in batches:
+            if self.timeseries:
+                for row, timestamp in zip(rows, timestamp_batches.popleft()):
+                    row['timestamp'] = timestamp
+            yield rows
+
+    def iter_rows(self, batch_size=None):
+        """ Lazily generate the dataset row by row
+
+            (see `DatasetGenerator.iter_batches`)
+
+            Yields:
+                dict rows
+        """
+        for rows in self.iter_batches(batch_size):
+            yield from rows
+
+    def iter_chunks(self):
+        """ Iterate over the generated dataset chunk by chunk
+
+            `self.records` is replaced with each new chunk and the
+            generator itself is yielded, so chunks can be passed to
+            `output.chunks_to_output` (see also `DataSet.iter_chunks`)
+
+            Yields:
+                self
+        """
+        for rows in self.iter_batches():
+            self.records = rows
+            yield self
+
+    def generate_batch(self, num_rows, seed_seq):
+        """ Generate `num_rows` rows drawing from `seed_seq`
+
+            Arguments:
+                num_rows                     (int): number of rows
+                seed_seq (`numpy.random.SeedSequence`): random stream
+
+            Returns:
+                list of dict rows
+        """
+        self.rng = numpy_rng(seed_seq)
+        self.fake.seed_instance(int(seed_seq.generate_state(1)[0]))
+        return self.columns_to_rows(self.generate_columns(num_rows))
+
+    def compile_schema(self):
+        """ Compile the parsed schema into a list of
+            (field name, draw function) pairs.
+
+            The schema is parsed once (and cached by content)
+            with `utils.schema_helpers.compile_schema`; fields which
+            are not a list, faker definition, `range` or `arange`
+            are skipped.
+
+            Returns:
+                list of tuples
+        """
+        plan = []
+        for field_name, kind, values in compile_schema(self.schema):
+            if kind == 'faker':
+                draw = partial(self.draw_faker, getattr(self.fake, values))
+            elif kind == 'range':
+                draw = partial(self.draw_range, values)
+            elif kind == 'pool':
+                if field_name not in self.pools:
+                    self.pools[field_name] = self.build_pool(*values)
+                draw = partial(self.draw_choice, self.pools[field_name])
+            else:
+                draw = partial(self.draw_choice, values)
+            plan.append((field_name, draw))
+        return plan
+
+    def build_pool(self, provider, pool_size, pool_path=None):
+        """ Pre-generate a pool of faker values to sample from
+
+            If `pool_path` is given, the pool is loaded from that
+            JSON file when it holds at least `pool_size` values;
+            otherwise the pool is generated and saved there.
+
+            Arguments:
+                provider  (str): faker provider name (i.e. 'name')
+                pool_size (int): number of values in the pool
+
+            Kwargs:
+                pool_path (str): JSON file to persist the pool
+
+            Returns:
+                np.ndarray (object dtype), or a list without numpy
+        """
+        pool = None
+        if pool_path and os.path.exists(pool_path):
+            with open(pool_path) as pool_file:
+                pool = json.load(pool_file)
+            if len(pool) < pool_size:
+                pool = None
+            else:
+                pool = pool[:pool_size]
+        if pool is None:
+            pool = self.draw_faker(getattr(self.fake, provider), pool_size)
+            if pool_path:
+                with open(pool_path, 'w') as pool_file:
+                    json.dump(pool, pool_file, default=str)
+        if not HAS_NUMPY:
+            return pool
+        values = np.empty(len(pool), dtype=object)
+        values[:] = pool
+        return values
+
+    def draw_faker(self, provider, num_rows):
+        """ Return a list of `num_rows` values from a faker provider """
+        return [provider() for _ in range(num_rows)]
+
+    def draw_range(self, values, num_rows):
+        """ Return a list of `num_rows` random choices from a range """
+        if not HAS_NUMPY:
+            return [self.rng.choice(values) for _ in range(num_rows)]
+        positions = self.rng.integers(0, len(values), num_rows)
+        return (values.start + values.step * positions).tolist()
+
+    def draw_choice(self, values, num_rows):
+        """ Return a list of `num_rows` random choices
+            from a list or numpy array """
+        if not HAS_NUMPY:
+            return [self.rng.choice(values) for _ in range(num_rows)]
+        positions = self.rng.integers(0, len(values), num_rows)
+        if HAS_NUMPY and isinstance(values, np.ndarray):
+            return values[positions].tolist()
+        return [values[pos] for pos in positions.tolist()]
+
+    def generate_columns(self, num_rows):
+        """ Generate `num_rows` values for each field in the schema
+
+            Arguments:
+                num_rows (int): number of values per column
+
+            Returns:
+                dict of field name: list of values
+        """
+        return {field_name: draw(num_rows) for field_name, draw in self.plan}
+
+    @staticmethod
+    def columns_to_rows(columns):
+        """ Transform a dict of columns into a list of dict rows """
+        names = list(columns.keys())
+        return [dict(zip(names, values))
+                for values in zip(*columns.values())]
 
     def generate_row(self):
-        """ Generate a row based on the parsed schema
-
-            NOTE: this uses string matching to determine
-            if the schema is a list, faker definition
-            or one of the matching patterns in
-            `EVAL_REGEX` and then generates data based on
-            those predefined selections.
-        """
-        row = {}
-        for field_name, field_val in self.schema.items():
-            if isinstance(field_val, str):
-                for pattern in self.EVAL_REGEX:
-                    if re.match(pattern, field_val):
-                        field_val = eval(field_val)
-                        break
-            if isinstance(field_val, str) and 'faker.' in field_val:
-                field_val = field_val.replace('faker.', '')
-                row[field_name] = getattr(self.fake, field_val)()
-            elif isinstance(field_val, Iterable):
-                row[field_name] = random.choice(field_val)
-        return row
+        """ Generate a row based on the compiled schema
+
+            Returns:
+                dict
+        """
+        return {field_name: values[0] for field_name, values in
+                self.generate_columns(1).items()}
 
     def generate_timeseries(self):
         """ Generate a timeseries with a `timestamp` column.
 
-            This uses the parser start date and increments to
+            (see `Generator.generate_timestamps`)
+        """
+        self.generate()
+
+    def generate_timestamps(self):
+        """ Generate isoformat timestamps for a timeseries
+
+            (see `Generator.iter_timestamps`)
+
+            Returns:
+                list of str
+        """
+        return list(self.iter_timestamps())
+
+    def iter_timestamps(self):
+        """ Lazily generate isoformat timestamps for a timeseries
+
+            (see `Generator.iter_timestamp_batches`)
+
+            Yields:
+                str
+        """
+        for batch in self.iter_timestamp_batches():
+            yield from batch
+
+    def iter_timestamp_batches(self, batch_size=None):
+        """ Lazily generate batches of isoformat timestamps
+
+            This uses the parser start date and increments. Each batch
+            of increments is drawn at once and added up into a
+            `datetime64` array (cut at the end time with one search)
+            which is then formatted in bulk. Time zone aware start or
+            end times (or a missing numpy) fall back to
+            `Generator.increment_time`.
 
             NOTE: a warning will be logged if there is an
             endtime given and the number of rows is not reached before
             the endtime. Endtime takes precedence if specified.
 
             TODO: should num_rows take precedence over end time?
-        """
 
-        def done(start_time, parser):
-            """ return boolean to see if enough rows are generated """
-            try:
-                if parser.end_time:
-                    return start_time >= parser.end_time
-            except KeyError:
-                pass
-            return len(self.records) >= parser.num_rows
+            Kwargs:
+                batch_size (int): timestamps per batch
+                                  (default: `BATCH_SIZE`)
 
+            Yields:
+                list of str
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        try:
+            end_time = self.parser.end_time
+        except KeyError:
+            end_time = None
         start_time = self.parser.start_time
+        count = 0
 
-        while not done(start_time, self.parser):
-            row = self.generate_row()
-            row['timestamp'] = start_time.isoformat()
-            self.records.append(row)
-            start_time += self.increment_time()
+        if not HAS_NUMPY or start_time.tzinfo is not None or \
+                getattr(end_time, 'tzinfo', None) is not None:
+            timestamps = self._iter_timestamps(start_time, end_time)
+            batches = iter(lambda: list(islice(timestamps, batch_size)), [])
+        else:
+            batches = self._iter_timestamp_arrays(start_time, end_time,
+                                                  batch_size)
+        for batch in batches:
+            count += len(batch)
+            yield batch
 
-        if len(self.records) < self.num_rows:
+        if self.num_rows is not None and count < self.num_rows:
             logging.warning(
                 'With given end time, datafuzz did not ' +
                 'generate required # of rows.')
 
+    def _iter_timestamp_arrays(self, start_time, end_time, batch_size):
+        """ Yield batches of timestamps using `datetime64` arrays
+            (see `Generator.iter_timestamp_batches`) """
+        rng = numpy_rng(self.seed_sequence.spawn(1)[0])
+        unit = 'us' if start_time.microsecond else 's'
+        current = np.datetime64(start_time, 'us')
+        end = np.datetime64(end_time, 'us') if end_time else None
+        remaining = None if end_time else self.num_rows
+        while remaining is None or remaining > 0:
+            if end is not None and current >= end:
+                return
+            size = batch_size if remaining is None \
+                else min(batch_size, remaining)
+            increments = self.draw_increments(size, rng)
+            offsets = np.cumsum(increments) - increments
+            times = current + offsets.astype('timedelta64[s]')
+            if end is not None:
+                times = times[:np.searchsorted(times, end)]
+            current += np.timedelta64(int(increments.sum()), 's')
+            if remaining is not None:
+                remaining -= size
+            yield np.datetime_as_string(times, unit=unit).tolist()
+
+    def _iter_timestamps(self, start_time, end_time):
+        """ Yield timestamps one by one using `Generator.increment_time`
+            (used for time zone aware timeseries) """
+        count = 0
+        while True:
+            if end_time:
+                if start_time >= end_time:
+                    break
+            elif self.num_rows is not None and count >= self.num_rows:
+                break
+            yield start_time.isoformat()
+            count += 1
+            start_time += self.increment_time()
+
+    def draw_increments(self, num_rows, rng):
+        """ Draw `num_rows` timeseries increments in seconds at once
+            (see `Generator.increment_time` for the increment options)
+
+            Arguments:
+                num_rows                      (int): number of increments
+                rng (`numpy.random.Generator`): generator to draw from
+
+            Returns:
+                np.ndarray of int64 seconds
+        """
+        increment = self.parser.increments
+        if increment == 'hours':
+            return rng.integers(1, 10, num_rows, endpoint=True) * 3600
+        elif increment == 'days':
+            return rng.integers(1, 5, num_rows, endpoint=True) * 86400
+        elif increment == 'seconds':
+            return rng.integers(20, 50, num_rows, endpoint=True)
+        return (rng.integers(1, 3, num_rows, endpoint=True) * 86400 +
+                rng.integers(1, 10, num_rows, endpoint=True) * 3600 +
+                rng.integers(3, 65, num_rows, endpoint=True))
+
     def increment_time(self):
         """ For timeseries generation, increment the start time
             given the parser requirements:
@@ -162,14 +488,14 @@ class DatasetGenerator(object):
         """
         increment = self.parser.increments
         if increment == 'hours':
-            return timedelta(hours=random.randint(1, 10))
+            return timedelta(hours=self.random.randint(1, 10))
         elif increment == 'days':
-            return timedelta(days=random.randint(1, 5))
+            return timedelta(days=self.random.randint(1, 5))
         elif increment == 'seconds':
-            return timedelta(seconds=random.randint(20, 50))
-        return timedelta(days=random.randint(1, 3),
-                         hours=random.randint(1, 10),
-                         seconds=random.randint(3, 65))
+            return timedelta(seconds=self.random.randint(20, 50))
+        return timedelta(days=self.random.randint(1, 3),
+                         hours=self.random.randint(1, 10),
+                         seconds=self.random.randint(3, 65))
 
     @property
     def output_filename(self):
@@ -182,3 +508,19 @@ class DatasetGenerator(object):
         """ Return or create output based on parsed schema.
         """
         return obj_to_output(self)
+
+
+_WORKER_GENERATOR = None
+
+
+def _init_worker(schema, pools):
+    """ Build the generator used by a worker process """
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = DatasetGenerator(
+        {'schema': schema, 'output': None, 'num_rows': 0, 'pools': pools})
+
+
+def _generate_worker_batch(num_rows, seed_seq):
+    """ Generate a batch of rows in a worker process
+        (see `DatasetGenerator.generate_batch`) """
+    return _WORKER_GENERATOR.generate_batch(num_rows, seed_seq)
@@ -5,12 +5,12 @@ NoiseMaker adds noise strategies to datafuzz.
 This will apply specified noise transformations to a series
 of columns.
 """
-import logging
-import random
+from functools import partial
 from datafuzz.settings import HAS_NUMPY
 from datafuzz.strategy import Strategy
 from datafuzz.utils.noise_helpers import messy_spaces, generate_random_int, \
-    generate_random_float
+    generate_random_float, change_type
+from datafuzz.utils.sampling_helpers import sample_indexes
 
 if HAS_NUMPY:
     import numpy as np
@@ -88,23 +88,27 @@ class NoiseMaker(Strategy):
         if column is None:
             for col in self.columns:
                 self.set_value(value, column=col)
+            return
+        self.track_copy(self.dataset.materialize(column))
+        self.dataset.invalidate_stats(column)
+        indexes = sample_indexes(self.rng, len(self.dataset), self.num_rows)
         if self.dataset.data_type == 'pandas':
-            self.dataset.records.loc[
-                np.random.choice(
-                    self.dataset.records.shape[0],
-                    self.num_rows), column] = value
+            if isinstance(column, str):
+                column = self.dataset.column_idx(column)
+            self.dataset.records.iloc[indexes, column] = value
         elif self.dataset.data_type == 'numpy':
-            self.dataset.records[
-                np.random.choice(
-                    self.dataset.records.shape[0],
-                    self.num_rows), column] = value
+            self.dataset.records[indexes, column] = value
+            self.dataset.track_rows(indexes)
+        elif self.dataset.data_type == 'columnar':
+            self.dataset.records.set_values(column, indexes,
+                                            [value] * len(indexes))
         else:
-            indexes = np.random.choice(len(self.dataset.records),
-                                       self.num_rows)
-            self.dataset.records = [
-                val if idx not in indexes else
-                [v if i != column else value for i, v in enumerate(val)]
-                for idx, val in enumerate(self.dataset.records)]
+            if hasattr(indexes, 'tolist'):
+                indexes = indexes.tolist()
+            self.track_copy(self.update_rows(self.dataset, indexes, column,
+                                             lambda x: value))
+            self.dataset.track_dtypes(column, indexes,
+                                      [value] * len(indexes))
 
     def nullify(self):
         """ Set null values for sample in columns """
@@ -116,6 +120,7 @@ class NoiseMaker(Strategy):
 
             NOTE: this will vary based on column type
         """
+        tasks = []
         for column in self.columns:
             col_type = self.dataset.column_dtype(column)
             min_val = self.dataset.column_agg(column, min)
@@ -128,10 +133,11 @@ class NoiseMaker(Strategy):
             elif 'int' in str(col_type):
                 func = generate_random_int
             if func:
-                self.apply_func_to_column(
-                    lambda x: func(min_val, max_val), column)
+                tasks.append((partial(func, low=min_val, high=max_val),
+                              column))
             elif col_type in [object, str]:
-                self.string_permutation(column=column)
+                tasks.append((messy_spaces, column))
+        self.apply_funcs_to_columns(tasks)
 
     def string_permutation(self, column=None):
         """ Permute string values for sample in columns
@@ -143,8 +149,8 @@ class NoiseMaker(Strategy):
                 - homonyms / autocorrect
         """
         if column is None:
-            for col in self.columns:
-                self.string_permutation(column=col)
+            self.apply_funcs_to_columns(
+                [(messy_spaces, col) for col in self.columns])
         else:
             self.apply_func_to_column(messy_spaces, column)
 
@@ -161,6 +167,7 @@ class NoiseMaker(Strategy):
                 - should we calculate IQR and insert outliers?
                 - if not, should add_outliers be a new option for noise?
         """
+        tasks = []
         for column in self.columns:
             if self.limits is None:
                 min_val = self.dataset.column_agg(column, min)
@@ -176,13 +183,12 @@ class NoiseMaker(Strategy):
             elif 'int' in str(col_type):
                 func = generate_random_int
             if func:
-                self.apply_func_to_column(lambda x: func(x,
-                                                         low=min_val,
-                                                         high=max_val),
-                                          column)
+                tasks.append((partial(func, low=min_val, high=max_val),
+                              column))
             elif col_type in [object, str]:
                 raise NotImplementedError(
                     'You must use a numeric column when using `range`')
+        self.apply_funcs_to_columns(tasks)
 
     def type_transform(self):
         """ Transform types for sample in columns.
@@ -196,17 +202,17 @@ class NoiseMaker(Strategy):
                 instead?
 
         """
+        tasks = []
         for column in self.columns:
+            func = None
             col_type = self.dataset.column_dtype(column)
             if 'int' in str(col_type):
-                func = lambda x: random.choice([str, float])(x)
+                func = partial(change_type, types=[str, float])
             elif 'float' in str(col_type):
-                func = lambda x: random.choice([str, int])(x)
+                func = partial(change_type, types=[str, int])
             elif col_type in [object, str]:
-                func = lambda x: random.choice([float, int])(x)
+                func = partial(change_type, types=[float, int])
             if func:
-                try:
-                    self.apply_func_to_column(func, column)
-                except (ValueError, TypeError):
-                    logging.exception(
-                        'Could not change type for column: %s', column)
+                tasks.append((func, column))
+
+        self.apply_funcs_to_columns(tasks, errors=(ValueError, TypeError))
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=unused-import
 """ Easier datafuzz.output imports """
-from datafuzz.output.helpers import obj_to_output
-from datafuzz.output.core import CSVOutput, JSONOutput, SQLOutput
+from datafuzz.output.helpers import obj_to_output, chunks_to_output
+from datafuzz.output.core import CSVOutput, JSONOutput, SQLOutput, \
+    JSONLinesOutput, ArrowOutput, ParquetOutput, NumpyOutput
@@ -2,17 +2,92 @@
 """
 Output classes for transforming datasets into proper output.
 
-Supported output: CSV, JSON, SQL, pandas, np 2D array, lists
+Supported output: CSV, JSON, JSON Lines, Parquet, Arrow IPC (Feather),
+numpy (.npy), SQL, pandas, np 2D array, lists
 """
+import io
 import json
+import logging
+import os
+import time
 from csv import DictWriter, writer
-import dataset as dataset_db
 
-from datafuzz.settings import HAS_NUMPY
+from datafuzz.settings import HAS_NUMPY, HAS_PYARROW, HAS_ORJSON
+from datafuzz.utils.arrow_helpers import records_to_table, \
+    join_passthrough, read_table, to_string_array
+from datafuzz.utils.db_helpers import connect
+from datafuzz.utils.numpy_helpers import save_array, append_array, \
+    write_changed_rows
 
 if HAS_NUMPY:
     import numpy as np
 
+if HAS_PYARROW:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+if HAS_ORJSON:
+    import orjson
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+JSON_ENCODER = json.JSONEncoder(default=str)
+COMPACT_JSON_ENCODER = json.JSONEncoder(default=str, separators=(',', ':'))
+
+
+def dump_json(obj):
+    """ Serialize an object to compact JSON
+
+        orjson is used if it is installed (numeric numpy arrays are
+        serialized without converting them to lists), otherwise the
+        standard library encoder.
+
+        Arguments:
+            obj (list, dict or `numpy.ndarray`): object to serialize
+
+        Returns:
+            bytes
+    """
+    if HAS_NUMPY and isinstance(obj, np.ndarray) and \
+            (obj.dtype.hasobject or not HAS_ORJSON):
+        obj = obj.tolist()
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, default=str, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # i.e. integers which don't fit in 64 bits
+            pass
+    return COMPACT_JSON_ENCODER.encode(obj).encode('utf-8')
+
+
+def json_lines(rows):
+    """ Serialize rows as JSON Lines (one JSON document per line)
+
+        Arguments:
+            rows (list of dict or list): rows to serialize
+
+        Returns:
+            str
+    """
+    if not len(rows):
+        return ''
+    return '\n'.join(map(JSON_ENCODER.encode, rows)) + '\n'
+
+
+def rows_to_dicts(rows, header):
+    """ Key list or tuple rows by the column names in `header`
+
+        Arguments:
+            rows (list): rows to convert
+            header (list): column names (see `DataSet.header`)
+
+        Returns:
+            list of dict rows (or `rows` itself, if there is no header
+            or the rows are already dicts)
+    """
+    if not header or not len(rows) or isinstance(rows[0], dict):
+        return rows
+    return [dict(zip(header, row)) for row in rows]
+
 
 class BaseOutput:
     """ Base class for output.
@@ -25,15 +100,21 @@ class BaseOutput:
             records     (obj): DataSet or generator records obj / list
             data_type   (str): DataSet or generator data_type string
             output      (str): DataSet or generator output string
+            header     (list): column names of rows which are lists or
+                               tuples (see `DataSet.header`)
 
         Keyword Arguments:
             filename    (str): DataSet or generator output string
+            append     (bool): add records to existing output instead of
+                               replacing it (used to write chunk by chunk)
     """
 
     def __init__(self, dataset, **kwargs):
         self.records = dataset.records
         self.data_type = dataset.data_type
         self.output = dataset.output
+        self.header = getattr(dataset, 'header', None)
+        self.append = kwargs.get('append', False)
         if 'filename' in kwargs:
             self.output = kwargs.get('filename')
 
@@ -41,23 +122,59 @@ class BaseOutput:
 class CSVOutput(BaseOutput):
     """ CSV output for writing datasets to CSV file.
 
+        Numeric numpy arrays are written with `np.savetxt`; object and
+        string arrays (i.e. after fuzzing or type transforms) are
+        written `CHUNKSIZE` rows at a time with a csv writer.
+
+        List or tuple rows are written after `self.header`.
+
         see also: `datafuzz.output.BaseOutput`
     """
+    BUFFER_SIZE = 2 ** 20
+    CHUNKSIZE = 10000
 
     def to_csv(self):
-        """ Write the CSVOutput to a csv file """
+        """ Write the CSVOutput to a csv file
+
+            If `self.append` is set, rows are added to the end
+            of the file without writing the header again.
+            Rows are written through a `BUFFER_SIZE` buffer.
+        """
+        mode = 'a' if self.append else 'w'
         if self.data_type == 'pandas':
-            self.records.to_csv(self.output)
+            self.records.to_csv(self.output, mode=mode,
+                                header=not self.append)
+        elif self.data_type == 'numpy' and \
+                self.records.dtype.kind in 'biuf':
+            with open(self.output, mode + 'b') as output:
+                np.savetxt(output, self.records, delimiter=",")
         elif self.data_type == 'numpy':
-            np.savetxt(self.output, self.records, delimiter=",")
+            with open(self.output, mode,
+                      buffering=self.BUFFER_SIZE) as output:
+                wrtr = writer(output)
+                for start in range(0, len(self.records), self.CHUNKSIZE):
+                    wrtr.writerows(
+                        self.records[start:start + self.CHUNKSIZE].tolist())
+        elif self.data_type == 'columnar':
+            with open(self.output, mode,
+                      buffering=self.BUFFER_SIZE) as output:
+                wrtr = writer(output)
+                if self.records.names and not self.append:
+                    wrtr.writerow(self.records.names)
+                wrtr.writerows(self.records.tuples())
         elif isinstance(self.records[0], dict):
-            with open(self.output, 'w') as output:
+            with open(self.output, mode,
+                      buffering=self.BUFFER_SIZE) as output:
                 wrtr = DictWriter(output, fieldnames=self.records[0].keys())
-                wrtr.writeheader()
+                if not self.append:
+                    wrtr.writeheader()
                 wrtr.writerows(self.records)
         else:
-            with open(self.output, 'w') as output:
+            with open(self.output, mode,
+                      buffering=self.BUFFER_SIZE) as output:
                 wrtr = writer(output)
+                if self.header and not self.append:
+                    wrtr.writerow(self.header)
                 wrtr.writerows(self.records)
         return self.output
 
@@ -65,23 +182,351 @@ class CSVOutput(BaseOutput):
 class JSONOutput(BaseOutput):
     """ JSON output for writing datasets to JSON file.
 
+        Records are written as one compact JSON list of records
+        (orient=records), serialized `chunksize` rows at a time.
+        List or tuple rows are keyed by `self.header`, if it is set.
+
         see also: `datafuzz.output.BaseOutput`
+
+        Extra parameters:
+            chunksize (int): rows serialized and written at a time
+                             (default CHUNKSIZE)
     """
+    CHUNKSIZE = 10000
+
+    def __init__(self, dataset, **kwargs):
+        super().__init__(dataset, **kwargs)
+        self.chunksize = kwargs.get('chunksize') or self.CHUNKSIZE
 
     def to_json(self):
-        """ Write the JSONOutput to a json file """
-        if self.data_type == 'pandas':
-            self.records.T.to_json(self.output)
-        elif self.data_type == 'numpy':
-            json.dump(self.records.to_list(),
-                      open(self.output, 'w', encoding='utf-8'),
-                      indent=4)
+        """ Write the JSONOutput to a json file
+
+            If `self.append` is set, records are added to
+            the JSON list already in the file.
+        """
+        if self.append:
+            return self.append_json()
+        with open(self.output, 'wb') as output:
+            output.write(b'[')
+            self.write_items(output)
+            output.write(b']')
+        return self.output
+
+    def iter_chunks(self):
+        """ Yield the records as JSON lists (bytes),
+            `self.chunksize` rows at a time """
+        for start in range(0, len(self.records), self.chunksize):
+            if self.data_type == 'pandas':
+                chunk = self.records.iloc[start:start + self.chunksize]
+                yield chunk.to_json(orient='records').encode('utf-8')
+            else:
+                yield dump_json(rows_to_dicts(
+                    self.records[start:start + self.chunksize], self.header))
+
+    def write_items(self, output, first=True):
+        """ Write the records to a binary file as comma separated JSON
+            items (without the enclosing list brackets)
+
+            Arguments:
+                output (file): file opened in binary mode
+
+            Kwargs:
+                first (bool): no items were written before
+                              (otherwise a comma is written first)
+        """
+        for chunk in self.iter_chunks():
+            items = chunk.strip()[1:-1]
+            if not items:
+                continue
+            if not first:
+                output.write(b',')
+            output.write(items)
+            first = False
+
+    def dumps(self):
+        """ Serialize the records to a JSON string """
+        output = io.BytesIO()
+        output.write(b'[')
+        self.write_items(output)
+        output.write(b']')
+        return output.getvalue().decode('utf-8')
+
+    def append_json(self):
+        """ Add records to an existing JSON file without reading it.
+
+            This replaces the closing bracket of the list in the file
+            with the serialized records, so the file is valid JSON
+            after every call.
+        """
+        with open(self.output, 'rb+') as output:
+            output.seek(0, os.SEEK_END)
+            size = output.tell()
+            output.seek(max(size - 2, 0))
+            empty = output.read() == b'[]'
+            output.seek(size - 1)
+            self.write_items(output, first=empty)
+            output.write(b']')
+        return self.output
+
+
+class JSONLinesOutput(BaseOutput):
+    """ JSON Lines (NDJSON) output for writing datasets to .jsonl or
+        .ndjson files, one record per line. List or tuple rows are
+        keyed by `self.header`, if it is set.
+
+        see also: `datafuzz.output.BaseOutput`
+
+        Extra parameters:
+            chunksize (int): rows serialized and written at a time
+                             (default CHUNKSIZE)
+    """
+    CHUNKSIZE = 10000
+
+    def __init__(self, dataset, **kwargs):
+        super().__init__(dataset, **kwargs)
+        self.chunksize = kwargs.get('chunksize') or self.CHUNKSIZE
+
+    def iter_lines(self):
+        """ Yield the records as JSON Lines, `self.chunksize` rows
+            at a time """
+        for start in range(0, len(self.records), self.chunksize):
+            if self.data_type == 'pandas':
+                chunk = self.records.iloc[start:start + self.chunksize]
+                yield chunk.to_json(orient='records', lines=True).rstrip(
+                    '\n') + '\n'
+            elif self.data_type == 'numpy':
+                yield json_lines(
+                    self.records[start:start + self.chunksize].tolist())
+            else:
+                yield json_lines(rows_to_dicts(
+                    self.records[start:start + self.chunksize], self.header))
+
+    def to_jsonl(self):
+        """ Write the records to a JSON Lines file
+
+            If `self.append` is set, lines are added to the end
+            of the file.
+        """
+        mode = 'a' if self.append else 'w'
+        with open(self.output, mode, encoding='utf-8') as output:
+            for lines in self.iter_lines():
+                output.write(lines)
+        return self.output
+
+
+class NumpyOutput(BaseOutput):
+    """ Binary numpy output for writing datasets to .npy files.
+
+        see also: `datafuzz.output.BaseOutput`
+
+        Attributes:
+            mmap_filename (str): .npy file the DataSet records are
+                                 memory mapped from (or None)
+            changed_rows (`numpy.ndarray`): rows changed in the memory
+                                            mapped records (or None)
+    """
+
+    def __init__(self, dataset, **kwargs):
+        super().__init__(dataset, **kwargs)
+        self.mmap_filename = getattr(dataset, 'mmap_filename', None)
+        self.changed_rows = None
+        if hasattr(dataset, 'changed_rows'):
+            self.changed_rows = dataset.changed_rows()
+
+    def to_array(self):
+        """ Return the records as a numpy array """
+        if self.data_type == 'numpy':
+            return self.records
+        elif self.data_type == 'pandas':
+            return self.records.to_numpy()
+        elif self.data_type == 'columnar':
+            return np.array(list(self.records.tuples()))
+        elif self.records and isinstance(self.records[0], dict):
+            return np.array([list(row.values()) for row in self.records])
+        return np.array(self.records)
+
+    def to_npy(self):
+        """ Write the records to a .npy file
+
+            Records memory mapped from a .npy file are written by
+            copying the input file and writing only the changed rows.
+            If `self.append` is set, rows are added to the end of
+            the file.
+        """
+        if self.changed_rows is not None and not self.append:
+            return write_changed_rows(self.mmap_filename, self.output,
+                                      self.records, self.changed_rows)
+        if self.append:
+            return append_array(self.output, self.to_array())
+        return save_array(self.output, self.to_array())
+
+
+class ArrowOutput(BaseOutput):
+    """ Arrow IPC (Feather) output for writing datasets to .arrow
+        or .feather files.
+
+        see also: `datafuzz.output.BaseOutput`
+
+        Extra parameters:
+            row_group_size (int): rows per record batch
+                                  (default ROW_GROUP_SIZE)
+            writers (dict): open writers by filename; if given, the
+                            writer is kept open so later chunks
+                            (`append`) are streamed into the same file
+                            (see `output.helpers.chunks_to_output`)
+
+        Attributes:
+            passthrough (`pyarrow.Table`): DataSet columns which were
+                                           not projected (written as is)
+            column_names (list): DataSet input column order
+    """
+    ROW_GROUP_SIZE = 64 * 1024
+
+    def __init__(self, dataset, **kwargs):
+        super().__init__(dataset, **kwargs)
+        self.row_group_size = kwargs.get('row_group_size') or \
+            self.ROW_GROUP_SIZE
+        self.writers = kwargs.get('writers')
+        self.passthrough = getattr(dataset, 'passthrough', None)
+        self.column_names = getattr(dataset, 'column_names', None)
+
+    def to_table(self):
+        """ Return the records (and passthrough columns) as an Arrow table
+        """
+        table = records_to_table(self.records, self.data_type,
+                                 header=self.header)
+        return join_passthrough(table, self.passthrough, self.column_names)
+
+    def open_writer(self, schema):
+        """ Open a writer for `self.output` """
+        writer = pa.ipc.new_file(self.output, schema)
+        # IPC writers don't keep their schema (Parquet writers do),
+        # but later chunks are matched against it
+        writer.schema = schema
+        return writer
+
+    def write_table(self, writer, table):
+        """ Write a table `self.row_group_size` rows at a time """
+        writer.write_table(table, max_chunksize=self.row_group_size)
+
+    def to_arrow(self):
+        """ Write the records to the output file
+
+            If `self.append` is set and `self.writers` holds an open
+            writer for the file, the records are added to it. Chunks
+            must keep the columns of the first chunk; columns which mix
+            types in any chunk are written as strings in every chunk
+            (see `ArrowOutput.match_schema`).
+        """
+        table = self.to_table()
+        writer = None
+        if self.writers is not None:
+            writer = self.writers.pop(self.output, None)
+            if writer is not None and not self.append:
+                writer.close()
+                writer = None
+        if writer is None:
+            writer = self.open_writer(table.schema)
         else:
-            json.dump(self.records,
-                      open(self.output, 'w', encoding='utf-8'),
-                      indent=4)
+            writer, table = self.match_schema(writer, table)
+        self.write_table(writer, table)
+        if self.writers is None:
+            writer.close()
+        else:
+            self.writers[self.output] = writer
         return self.output
 
+    def match_schema(self, writer, table):
+        """ Cast a later chunk to the schema of the chunks written before
+
+            Columns stored as strings are stringified. If a column can't
+            be cast (i.e. it mixes types for the first time in this
+            chunk), it is stringified too and the file written so far is
+            rewritten with that column as strings (see
+            `ArrowOutput.rewrite_output`).
+
+            Arguments:
+                writer: open Parquet or Arrow writer
+                table (`pyarrow.Table`): chunk to write
+
+            Returns:
+                tuple of (writer, table) to write the chunk with
+
+            raises Exception if the chunk has different columns
+        """
+        schema = writer.schema
+        if table.column_names != schema.names:
+            writer.close()
+            raise Exception(
+                'Chunk schema {} does not match the output schema '
+                '{}.'.format(table.schema, schema))
+        columns = []
+        strings = []
+        for field, column in zip(schema, table.columns):
+            if column.type == field.type:
+                pass
+            elif pa.types.is_string(field.type):
+                column = to_string_array(column)
+            else:
+                try:
+                    column = column.cast(field.type)
+                except (pa.ArrowInvalid, pa.ArrowTypeError,
+                        pa.ArrowNotImplementedError):
+                    column = to_string_array(column)
+                    strings.append(field.name)
+            columns.append(column)
+        if strings:
+            writer = self.rewrite_output(writer, strings)
+        return writer, pa.Table.from_arrays(columns, schema=writer.schema)
+
+    def rewrite_output(self, writer, names):
+        """ Rewrite the rows written so far with the `names` columns
+            stored as strings and return a writer to add the next chunks
+
+            The rows written so far are read back into memory, so this
+            costs one extra pass over them for each column that starts
+            mixing types after the first chunk.
+
+            Arguments:
+                writer: open Parquet or Arrow writer
+                names (list): names of the columns to store as strings
+
+            Returns:
+                writer open on the rewritten file
+        """
+        writer.close()
+        written = read_table(self.output, memory_map=False)
+        written = pa.Table.from_arrays(
+            [to_string_array(column) if name in names else column
+             for name, column in zip(written.column_names, written.columns)],
+            names=written.column_names)
+        writer = self.open_writer(written.schema)
+        self.write_table(writer, written)
+        return writer
+
+
+class ParquetOutput(ArrowOutput):
+    """ Parquet output for writing datasets to .parquet files.
+        Records are written one row group at a time.
+
+        see also: `datafuzz.output.ArrowOutput`
+    """
+
+    def open_writer(self, schema):
+        """ Open a Parquet writer for `self.output` """
+        return pq.ParquetWriter(self.output, schema)
+
+    def write_table(self, writer, table):
+        """ Write a table one row group of `self.row_group_size`
+            rows at a time """
+        writer.write_table(table, row_group_size=self.row_group_size)
+
+    def to_parquet(self):
+        """ Write the records to the Parquet file
+            (see `ArrowOutput.to_arrow`)
+        """
+        return self.to_arrow()
+
 
 class SQLOutput(BaseOutput):
     """ Database output for writing datasets to a table.
@@ -91,16 +536,92 @@ class SQLOutput(BaseOutput):
         Extra parameters:
             db_uri (str): Database URI String
             table  (str): Database table name
+            db (`dataset.Database`): connection to write with
+                                     (default: the shared connection
+                                     for `db_uri`, see
+                                     `utils.db_helpers.connect`)
+            chunksize (int): if set, write `chunksize` rows at a time,
+                             each chunk in its own transaction
+            method (str): pandas insert method for chunked writes
+                          (None for executemany or 'multi' for
+                          multi-row VALUES inserts)
+
+        Attributes:
+            progress (dict): rows and chunks written and seconds taken
+                             (filled by chunked writes)
     """
     def __init__(self, dataset, **kwargs):
         super().__init__(dataset, **kwargs)
         self.db_uri = kwargs.get('db_uri')
         self.table = kwargs.get('table')
+        self.chunksize = kwargs.get('chunksize')
+        self.method = kwargs.get('method')
+        self.db = kwargs.get('db') or connect(self.db_uri)
+        self.progress = {'rows': 0, 'chunks': 0, 'seconds': 0.0}
 
     def to_sql(self):
-        """ Write the dataset records to a sql table """
+        """ Write the dataset records to a sql table
+
+            If `self.chunksize` is set, see `SQLOutput.to_sql_chunked`
+
+            Returns:
+                number of rows written
+        """
+        if self.chunksize:
+            return self.to_sql_chunked()
+        if self.data_type == 'pandas':
+            self.records.to_sql(self.table, self.db.engine,
+                                if_exists='append' if self.append else 'fail')
+        else:
+            with self.db as db:
+                db[self.table].insert_many(
+                    rows_to_dicts(self.records, self.header))
+        return len(self.records)
+
+    def iter_record_chunks(self):
+        """ Yield the records `self.chunksize` rows at a time """
+        for start in range(0, len(self.records), self.chunksize):
+            if self.data_type == 'pandas':
+                yield self.records.iloc[start:start + self.chunksize]
+            else:
+                yield self.records[start:start + self.chunksize]
+
+    def to_sql_chunked(self):
+        """ Write the dataset records to a sql table chunk by chunk
+
+            Each chunk is inserted in its own transaction with one
+            executemany call (or multi-row VALUES inserts, see
+            `self.method`), so a failed chunk only rolls back itself
+            and memory use does not grow with the table size.
+            Progress is logged after each chunk.
+
+            Returns:
+                number of rows written
+        """
+        start_time = time.perf_counter()
         if self.data_type == 'pandas':
-            return self.records.to_sql(self.table, self.db_uri)
-        with dataset_db.connect(self.db_uri) as db:
-            table = db[self.table]
-            return table.insert_many(self.records)
+            for idx, chunk in enumerate(self.iter_record_chunks()):
+                with self.db.engine.begin() as conn:
+                    chunk.to_sql(self.table, conn, method=self.method,
+                                 if_exists='append'
+                                 if self.append or idx else 'fail')
+                self.log_progress(len(chunk), start_time)
+        else:
+            table = self.db[self.table]
+            for chunk in self.iter_record_chunks():
+                with self.db:
+                    table.insert_many(rows_to_dicts(chunk, self.header),
+                                      chunk_size=len(chunk))
+                self.log_progress(len(chunk), start_time)
+        return self.progress['rows']
+
+    def log_progress(self, num_rows, start_time):
+        """ Update and log `self.progress` after writing a chunk """
+        self.progress['rows'] += num_rows
+        self.progress['chunks'] += 1
+        self.progress['seconds'] = time.perf_counter() - start_time
+        logging.info('Wrote %d rows to %s in %d chunks (%.0f rows/s)',
+                     self.progress['rows'], self.table,
+                     self.progress['chunks'],
+                     self.progress['rows'] /
+                     max(self.progress['seconds'], 1e-9))
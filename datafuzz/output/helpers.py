@@ -2,8 +2,11 @@
 """
 Helpers for output generation.
 """
-from datafuzz.settings import HAS_PANDAS, HAS_NUMPY
-from datafuzz.output.core import CSVOutput, JSONOutput, SQLOutput
+from datafuzz.settings import HAS_PANDAS, HAS_NUMPY, HAS_PYARROW
+from datafuzz.output.core import CSVOutput, JSONOutput, SQLOutput, \
+    JSONLinesOutput, ArrowOutput, ParquetOutput, NumpyOutput, rows_to_dicts
+from datafuzz.utils.arrow_helpers import is_arrow_file, PARQUET_EXTENSIONS
+from datafuzz.utils.columnar_helpers import ColumnStore, to_column
 
 if HAS_PANDAS:
     import pandas as pd
@@ -12,45 +15,162 @@ if HAS_NUMPY:
     import numpy as np
 
 
-def obj_to_output(obj):
+def obj_to_output(obj, append=False, writers=None):
     """ Transform DataSet or generator records to output
 
         supported outputs:
-            dataset, pandas, numpy, list, csv and json
-            (specify file://$NAME.csv or file://$NAME.json)
+            dataset, pandas, numpy, list, columnar, csv, json, json lines,
+            parquet, arrow and npy (specify file://$NAME.csv,
+            file://$NAME.json, file://$NAME.jsonl / .ndjson,
+            file://$NAME.parquet, file://$NAME.arrow / .feather or
+            file://$NAME.npy)
             and sql (specify db_uri and table)
 
+        SQL output is inserted `sql_chunksize` rows at a time (or
+        `chunksize` rows, for streamed DataSets), with `sql_method`
+        as the pandas insert method (see `SQLOutput`).
+
+        Columns which were not projected when reading a Parquet or
+        Arrow file (see `DataSet.passthrough`) are written as is to
+        Parquet and Arrow outputs and merged into the records otherwise.
+
+        Kwargs:
+            append (bool): add records to an existing file or table
+                           (see `chunks_to_output`)
+            writers (dict): open Parquet and Arrow writers by filename
+                            (see `chunks_to_output`)
+
         NOTE: will raise exception if unsupported output set
     """
+    if getattr(obj, 'passthrough', None) is not None and \
+            not is_arrow_file(obj.output):
+        obj.merge_passthrough()
     if obj.output is None or obj.data_type == obj.output:
         return obj.records
     elif obj.output == 'dataset':
         from datafuzz import DataSet
-        return DataSet(obj.records)
+        return DataSet(rows_to_dicts(obj.records, getattr(obj, 'header',
+                                                          None)))
     elif obj.output == 'pandas' and HAS_PANDAS:
-        return pd.DataFrame(obj.records)
+        if obj.data_type == 'columnar':
+            return pd.DataFrame(obj.records.to_dict())
+        return pd.DataFrame(obj.records,
+                            columns=getattr(obj, 'header', None))
     elif obj.output == 'numpy' and HAS_NUMPY:
         if obj.data_type == 'pandas':
             return obj.records.values
+        elif obj.data_type == 'columnar':
+            return np.array(list(obj.records.tuples()))
         return np.array(obj.records)
     elif obj.output == 'list':
         if obj.data_type == 'numpy':
             return obj.records.tolist()
+        elif obj.data_type == 'columnar':
+            return list(obj.records)
         elif obj.data_type == 'pandas':
             return list(obj.records.T.to_dict().values())
+    elif obj.output == 'columnar':
+        if obj.data_type == 'pandas':
+            return ColumnStore([to_column(obj.records.iloc[:, idx].tolist())
+                                for idx in range(obj.records.shape[1])],
+                               names=list(obj.records.columns))
+        elif obj.data_type == 'numpy':
+            return ColumnStore([to_column(column)
+                                for column in obj.records.T.tolist()])
+        return ColumnStore.from_rows(obj.records,
+                                     names=getattr(obj, 'header', None))
     elif obj.output.startswith('file://'):
         if obj.output.endswith('.csv'):
-            output = CSVOutput(obj, filename=obj.output_filename)
+            output = CSVOutput(obj, filename=obj.output_filename,
+                               append=append)
             return output.to_csv()
 
         elif obj.output.endswith('.json'):
-            output = JSONOutput(obj, filename=obj.output_filename)
+            output = JSONOutput(obj, filename=obj.output_filename,
+                                append=append)
             return output.to_json()
+
+        elif obj.output.endswith(('.jsonl', '.ndjson')):
+            output = JSONLinesOutput(obj, filename=obj.output_filename,
+                                     append=append)
+            return output.to_jsonl()
+
+        elif is_arrow_file(obj.output) and HAS_PYARROW:
+            output_class = ParquetOutput \
+                if obj.output.endswith(PARQUET_EXTENSIONS) else ArrowOutput
+            output = output_class(obj, filename=obj.output_filename,
+                                  append=append, writers=writers,
+                                  row_group_size=getattr(obj, 'chunksize',
+                                                         None))
+            return output.to_arrow()
+
+        elif obj.output.endswith('.npy') and HAS_NUMPY:
+            output = NumpyOutput(obj, filename=obj.output_filename,
+                                 append=append)
+            return output.to_npy()
         else:
             raise NotImplementedError(
-                'Only CSV and JSON file types supported.')
+                'Only CSV, JSON, JSON Lines, Parquet, Arrow and NPY ' +
+                'file types supported (Parquet and Arrow require pyarrow).')
     elif obj.output == 'sql':
-        output = SQLOutput(obj, db_uri=obj.db_uri, table=obj.table)
+        output = SQLOutput(obj, db_uri=obj.db_uri, table=obj.table,
+                           append=append, db=getattr(obj, 'db', None),
+                           chunksize=getattr(obj, 'sql_chunksize', None) or
+                           getattr(obj, 'chunksize', None),
+                           method=getattr(obj, 'sql_method', None))
         return output.to_sql()
     raise NotImplementedError(
         'Output {} not supported'.format(obj.output))
+
+
+def chunks_to_output(chunks):
+    """ Transform a series of DataSet or generator chunks to output
+
+        Each chunk is written as soon as it is produced, so files and
+        sql tables are filled incrementally (see `DataSet.iter_chunks`).
+        Parquet and Arrow writers are kept open until the last chunk,
+        so each chunk is streamed into the file as its own row group.
+        For in-memory outputs (pandas, numpy, list, dataset) the chunk
+        outputs are combined and returned; for sql output, the total
+        number of rows written is returned.
+
+        Arguments:
+            chunks (iterable): DataSet or generator objects
+                               (the same object may be yielded again
+                               with new records)
+
+        Returns output object or filepath.
+    """
+    results = []
+    writers = {}
+    try:
+        for idx, chunk in enumerate(chunks):
+            result = obj_to_output(chunk, append=idx > 0, writers=writers)
+            if chunk.output == 'sql':
+                results = [result + (results[0] if results else 0)]
+            elif isinstance(chunk.output, str) and \
+                    chunk.output.startswith('file://'):
+                results = [result]
+            elif result is chunk.records:
+                results.append(result.copy())
+            else:
+                results.append(result)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    if len(results) < 2:
+        return results[0] if results else None
+    if HAS_PANDAS and isinstance(results[0], pd.DataFrame):
+        return pd.concat(results, ignore_index=True)
+    elif HAS_NUMPY and isinstance(results[0], np.ndarray):
+        return np.concatenate(results)
+    elif isinstance(results[0], list):
+        return [row for result in results for row in result]
+    elif isinstance(results[0], ColumnStore):
+        for result in results[1:]:
+            results[0].extend(result)
+        return results[0]
+    dataset = results[0]
+    for result in results[1:]:
+        dataset.append(result.records)
+    return dataset
@@ -107,6 +107,46 @@ class StrategyYAMLParser(BaseYAMLParser):
         """ Return data query from parsed YAML """
         return self.parsed.get('data').get('query')
 
+    @property
+    def chunksize(self):
+        """ Return data chunksize from parsed YAML """
+        return self.parsed.get('data').get('chunksize')
+
+    @property
+    def sql_chunksize(self):
+        """ Return data sql_chunksize from parsed YAML """
+        return self.parsed.get('data').get('sql_chunksize')
+
+    @property
+    def sql_method(self):
+        """ Return data sql_method from parsed YAML """
+        return self.parsed.get('data').get('sql_method')
+
+    @property
+    def copy_on_write(self):
+        """ Return data copy_on_write from parsed YAML """
+        return self.parsed.get('data').get('copy_on_write', False)
+
+    @property
+    def workers(self):
+        """ Return data workers from parsed YAML """
+        return self.parsed.get('data').get('workers')
+
+    @property
+    def seed(self):
+        """ Return data seed from parsed YAML """
+        return self.parsed.get('data').get('seed')
+
+    @property
+    def csv_engine(self):
+        """ Return data csv_engine from parsed YAML """
+        return self.parsed.get('data').get('csv_engine')
+
+    @property
+    def columnar(self):
+        """ Return data columnar from parsed YAML """
+        return self.parsed.get('data').get('columnar', False)
+
     def execute(self):
         """ Execute strategies from parsed YAML """
         return fuzz_from_parser(self)
@@ -133,6 +173,22 @@ class StrategyCLIParser:
                 query      (str): if using database input, query to execute
                 table      (str): if using database output,
                                                        table name to insert
+                chunksize  (int): if set, number of rows to read,
+                                  fuzz and write at a time
+                sql_chunksize (int): if set, number of rows to insert
+                                  per transaction into sql output
+                sql_method (str): pandas insert method for sql output
+                                  (None or 'multi', see `SQLOutput`)
+                copy_on_write (bool): only copy input columns
+                                  when strategies change them
+                workers    (int): default number of worker processes
+                                  for each strategy
+                seed       (int): random seed (the same seed and input
+                                  give the same output)
+                csv_engine (str): 'dict' or 'rows' (read csv input into
+                                  tuples with one header, see `DataSet`)
+                columnar  (bool): keep records in a column store
+                                  (see `DataSet`)
 
         Note: strategies should have all required fields
               see `strategy.Strategy`
@@ -144,6 +200,14 @@ class StrategyCLIParser:
         self.db_uri = kwargs.get('db_uri')
         self.query = kwargs.get('query')
         self.table = kwargs.get('table')
+        self.chunksize = kwargs.get('chunksize')
+        self.sql_chunksize = kwargs.get('sql_chunksize')
+        self.sql_method = kwargs.get('sql_method')
+        self.copy_on_write = kwargs.get('copy_on_write', False)
+        self.workers = kwargs.get('workers')
+        self.seed = kwargs.get('seed')
+        self.csv_engine = kwargs.get('csv_engine')
+        self.columnar = kwargs.get('columnar', False)
         self.parser = self.init_parser()
 
     def validate_arguments(self):
@@ -174,6 +238,29 @@ class StrategyCLIParser:
                             help='If using db input, query to collect data')
         parser.add_argument('--table', type=str,
                             help='If using db output, table to insert into')
+        parser.add_argument('--chunksize', type=int,
+                            help='If set, stream input in chunks of this ' +
+                            'many rows')
+        parser.add_argument('--sql_chunksize', type=int,
+                            help='If using db output, insert this many ' +
+                            'rows per transaction')
+        parser.add_argument('--sql_method', choices=['multi'],
+                            help='If using db output, insert with ' +
+                            'multi-row VALUES instead of executemany')
+        parser.add_argument('--copy_on_write', action='store_true',
+                            help='Only copy input columns when ' +
+                            'strategies change them')
+        parser.add_argument('--workers', type=int,
+                            help='Number of worker processes to use ' +
+                            'for each strategy')
+        parser.add_argument('--seed', type=int,
+                            help='Random seed for reproducible output')
+        parser.add_argument('--csv_engine', choices=['dict', 'rows'],
+                            help='Read csv rows into dicts (default) or ' +
+                            'into tuples with a single header')
+        parser.add_argument('--columnar', action='store_true',
+                            help='Keep records in typed columns ' +
+                            'instead of one dict per row')
         return parser
 
     def parse_args(self, argv=None):
@@ -191,6 +278,14 @@ class StrategyCLIParser:
         self.db_uri = args.db_uri
         self.query = args.query
         self.table = args.table
+        self.chunksize = args.chunksize
+        self.sql_chunksize = args.sql_chunksize
+        self.sql_method = args.sql_method
+        self.copy_on_write = args.copy_on_write
+        self.workers = args.workers
+        self.seed = args.seed
+        self.csv_engine = args.csv_engine
+        self.columnar = args.columnar
         self.validate_arguments()
 
     def print_help(self):
@@ -254,6 +349,36 @@ class SchemaYAMLParser(BaseYAMLParser):
         """ Return num_rows from parsed YAML """
         return self.parsed.get('num_rows')
 
+    @property
+    def seed(self):
+        """ Return seed from parsed YAML """
+        return self.parsed.get('seed')
+
+    @property
+    def workers(self):
+        """ Return workers from parsed YAML """
+        return self.parsed.get('workers')
+
+    @property
+    def db_uri(self):
+        """ Return db_uri from parsed YAML """
+        return self.parsed.get('db_uri')
+
+    @property
+    def table(self):
+        """ Return table from parsed YAML """
+        return self.parsed.get('table')
+
+    @property
+    def sql_chunksize(self):
+        """ Return sql_chunksize from parsed YAML """
+        return self.parsed.get('sql_chunksize')
+
+    @property
+    def sql_method(self):
+        """ Return sql_method from parsed YAML """
+        return self.parsed.get('sql_method')
+
     def validate_yaml(self):
         """ Validate that all required fields are parsed from YAML
 
@@ -311,6 +436,15 @@ class SchemaCLIParser:
                 num_rows            (int): number of rows to generate
                 output              (str): output string (filename)
                 schema              (dict): dictionary of schema to generate
+                seed                 (int): random seed (or None)
+                workers              (int): number of worker processes
+                                            (or None)
+                db_uri               (str): database uri for sql output
+                table                (str): table name for sql output
+                sql_chunksize        (int): rows to insert per transaction
+                                            into sql output (or None)
+                sql_method           (str): pandas insert method for
+                                            sql output (None or 'multi')
                 parser  (`ArgumentParser`): argument parser
 
         Note: length of fields should match that of values
@@ -322,6 +456,12 @@ class SchemaCLIParser:
         self.increments = kwargs.get('increments')
         self.output = kwargs.get('output')
         self.schema = kwargs.get('schema') or {}
+        self.seed = kwargs.get('seed')
+        self.workers = kwargs.get('workers')
+        self.db_uri = kwargs.get('db_uri')
+        self.table = kwargs.get('table')
+        self.sql_chunksize = kwargs.get('sql_chunksize')
+        self.sql_method = kwargs.get('sql_method')
         self.parser = self.init_parser()
 
     def validate_arguments(self):
@@ -362,6 +502,20 @@ class SchemaCLIParser:
                             choices=['hours', 'seconds', 'days', 'random'],
                             default='random',
                             help='how to increment entries')
+        parser.add_argument('--seed', type=int,
+                            help='random seed for reproducible data')
+        parser.add_argument('--workers', type=int,
+                            help='number of worker processes to use')
+        parser.add_argument('--db_uri', type=str,
+                            help='if using db output, the db URI to connect')
+        parser.add_argument('--table', type=str,
+                            help='if using db output, table to insert into')
+        parser.add_argument('--sql_chunksize', type=int,
+                            help='if using db output, rows to insert ' +
+                            'per transaction')
+        parser.add_argument('--sql_method', choices=['multi'],
+                            help='if using db output, insert with ' +
+                            'multi-row VALUES instead of executemany')
         return parser
 
     def parse_args(self, argv=None):
@@ -377,6 +531,12 @@ class SchemaCLIParser:
         self.num_rows = args.num_rows
         self.output = args.output
         self.schema = dict((f, v) for f, v in zip(args.fields, args.values))
+        self.seed = args.seed
+        self.workers = args.workers
+        self.db_uri = args.db_uri
+        self.table = args.table
+        self.sql_chunksize = args.sql_chunksize
+        self.sql_method = args.sql_method
         self.validate_arguments()
 
     def print_help(self):
@@ -9,6 +9,7 @@ from datafuzz.fuzz import Fuzzer
 from datafuzz.noise import NoiseMaker
 from datafuzz.duplicator import Duplicator
 from datafuzz.generators import DatasetGenerator
+from datafuzz.output import chunks_to_output
 
 
 def build_strategy(strategy, dataset):
@@ -28,40 +29,143 @@ def build_strategy(strategy, dataset):
     """
     percentage = strategy.get('percentage')
     columns = strategy.get('columns')
+    workers = strategy.get('workers')
+    seed = strategy.get('seed')
+    row_offset = strategy.get('row_offset')
     strategy_type = strategy.get('type').lower()
     if 'fuzz' in strategy_type:
-        return Fuzzer(dataset, percentage=percentage, columns=columns)
+        return Fuzzer(dataset, percentage=percentage, columns=columns,
+                      workers=workers, seed=seed, row_offset=row_offset)
     elif 'noise' in strategy_type:
         noise = strategy.get('noise')
         return NoiseMaker(dataset, percentage=percentage,
-                          columns=columns, noise=noise)
+                          columns=columns, noise=noise, workers=workers,
+                          seed=seed, row_offset=row_offset)
     elif 'dupli' in strategy_type or 'dupe' in strategy_type:
-        return Duplicator(dataset, percentage=percentage, columns=columns)
+        return Duplicator(dataset, percentage=percentage, columns=columns,
+                          workers=workers, seed=seed, row_offset=row_offset)
     raise NotImplementedError('No strategy for type {}'.format(strategy_type))
 
 
-def fuzz_from_parser(parser):
+def fuzz_from_parser(parser, db=None):
     """ Fuzz using parser input.
         This will generate a `dataset.Dataset` from `parser.input`,
         apply any defined strategies and call `dataset.to_output`.
 
+        If the parser defines a `chunksize`, the input is streamed:
+        strategies are applied to each chunk and each chunk is written
+        to the output before the next one is read. Columns chosen at
+        random for the first chunk are reused for all later chunks, and
+        each strategy is told how many rows earlier chunks held (its
+        `row_offset`), so row counts add up to the percentage of the
+        whole input rather than being rounded chunk by chunk.
+
+        The parser `workers` setting is used for every strategy
+        which does not set its own `workers`. If the parser defines a
+        `seed`, strategies without their own `seed` draw from streams
+        spawned from it, so the output is reproducible.
+
+        For Parquet and Arrow input, only the columns named by the
+        strategies are loaded (see `projected_columns`); the other
+        columns are passed through to the output unchanged.
+
+        SQL input and output share one connection per database URI
+        (see `utils.db_helpers.connect`), which is reused by later runs
+        against the same database.
+
         Arguments:
             parser (`parsers.StrategyCLIParser` or
                     `parsers.StrategyYAMLParser`): strategy parser
 
+        Kwargs:
+            db (`dataset.Database`): database connection to use for
+                                     sql input and output
+
         Returns:
             dataset.to_output()
     """
     dataset = DataSet(parser.input, output=parser.output,
                       db_uri=parser.db_uri, query=parser.query,
-                      table=parser.table)
-    for strategy in parser.strategies:
+                      table=parser.table, chunksize=parser.chunksize,
+                      sql_chunksize=parser.sql_chunksize,
+                      sql_method=parser.sql_method,
+                      db=db, columns=projected_columns(parser.strategies),
+                      copy_on_write=parser.copy_on_write,
+                      seed=parser.seed, csv_engine=parser.csv_engine,
+                      columnar=parser.columnar)
+    strategies = [dict(strategy) for strategy in parser.strategies]
+    if parser.workers:
+        for strategy in strategies:
+            strategy.setdefault('workers', parser.workers)
+    if not parser.chunksize:
+        run_strategies(strategies, dataset)
+        if dataset.copy_on_write:
+            logging.info('Bytes copied per strategy: %s',
+                         dict(dataset.memory_report))
+        return dataset.to_output()
+
+    def fuzzed_chunks():
+        """ apply the strategies to each chunk """
+        row_offset = 0
+        for chunk in dataset.iter_chunks():
+            num_rows = len(chunk)
+            for strategy in strategies:
+                strategy['row_offset'] = row_offset
+            strategy_objs = run_strategies(strategies, chunk)
+            row_offset += num_rows
+            for strategy, strategy_obj in zip(strategies, strategy_objs):
+                if not strategy.get('columns') and \
+                        getattr(strategy_obj, 'columns', None):
+                    strategy['columns'] = strategy_obj.columns
+            yield chunk
+    return chunks_to_output(fuzzed_chunks())
+
+
+def projected_columns(strategies):
+    """ Return the column names the strategies change, so only those
+        need to be loaded from column-oriented (Parquet and Arrow) input
+
+        Arguments:
+            strategies (list of dict): strategies to apply
+
+        Returns:
+            list of column names or None (if any strategy picks columns
+            at random, uses column indexes or adds rows)
+    """
+    columns = []
+    for strategy in strategies:
+        strategy_type = strategy.get('type').lower()
+        strategy_columns = strategy.get('columns')
+        if 'dupli' in strategy_type or 'dupe' in strategy_type or \
+                not strategy_columns:
+            return None
+        for column in strategy_columns:
+            if not isinstance(column, str) or column.isnumeric():
+                return None
+            if column not in columns:
+                columns.append(column)
+    return columns or None
+
+
+def run_strategies(strategies, dataset):
+    """ Build and run a list of strategies on a dataset
+
+        Arguments:
+            strategies (list of dict): strategies to apply
+            dataset  (`dataset.DataSet`): dataset to use
+
+        Returns:
+            list of strategy objects
+    """
+    strategy_objs = []
+    for strategy in strategies:
         strategy_obj = build_strategy(strategy, dataset)
         try:
             strategy_obj.run_strategy()
         except Exception:
             logging.exception('Error running strategy: %s', strategy)
-    return dataset.to_output()
+        strategy_objs.append(strategy_obj)
+    return strategy_objs
 
 
 def generate_from_parser(parser):
@@ -70,6 +174,10 @@ def generate_from_parser(parser):
         using `generators.DatasetGenerator`
         and then call `DatasetGenerator.to_output`.
 
+        With more than one worker, chunks of rows are generated
+        in a process pool and written to the output in order
+        (see `DatasetGenerator.iter_chunks`).
+
         Arguments:
             parser (`parsers.SchemaCLIParser` or
                     `parsers.SchemaYAMLParser`
@@ -79,5 +187,7 @@ def generate_from_parser(parser):
             generator.to_output()
     """
     generator = DatasetGenerator(parser)
+    if generator.workers > 1:
+        return chunks_to_output(generator.iter_chunks())
     generator.generate()
     return generator.to_output()
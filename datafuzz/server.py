@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Stream generated (and optionally fuzzed) data over TCP or Unix sockets.
+
+Each client gets its own stream of rows from a `DatasetGenerator`.
+Rows are transformed and serialized a batch at a time (NDJSON or CSV
+framing) and written with one call per batch. The server only waits for
+a client when its socket buffer is over the high water mark, so slow
+clients apply backpressure without holding up the others.
+"""
+import asyncio
+import csv
+import io
+import logging
+import os
+
+from datafuzz.dataset import DataSet
+from datafuzz.output.core import json_lines
+from datafuzz.parsers.helpers import run_strategies
+
+FRAMINGS = ['ndjson', 'csv']
+
+
+def serialize_rows(rows, framing='ndjson', header=False):
+    """ Serialize a batch of rows into one payload
+
+        Arguments:
+            rows (list of dict or list): rows to serialize
+
+        Kwargs:
+            framing (str): 'ndjson' (one JSON document per line)
+                           or 'csv'
+            header (bool): write a CSV header first (dict rows only)
+
+        Returns:
+            bytes
+    """
+    if framing == 'ndjson':
+        return json_lines(rows).encode('utf-8')
+    elif framing == 'csv':
+        output = io.StringIO()
+        if rows and isinstance(rows[0], dict):
+            wrtr = csv.DictWriter(output, fieldnames=list(rows[0].keys()))
+            if header:
+                wrtr.writeheader()
+        else:
+            wrtr = csv.writer(output)
+        wrtr.writerows(rows)
+        return output.getvalue().encode('utf-8')
+    raise NotImplementedError('Framing {} not supported'.format(framing))
+
+
+class DataStreamServer:
+    """ DataStreamServer streams rows from a generator to every client
+        which connects, applying strategies to each batch.
+
+        Parameters:
+            generator (`generators.DatasetGenerator`): row source
+
+        Kwargs:
+            strategies (list of dict): strategies to apply to each batch
+                                       (see `parsers.helpers.build_strategy`)
+            framing           (str): 'ndjson' (default) or 'csv'
+            batch_size        (int): rows per write (default 1000)
+            host              (str): TCP host (default 127.0.0.1)
+            port              (int): TCP port (default 8877)
+            unix_socket       (str): Unix socket path
+                                     (if set, host and port are ignored)
+            high_water        (int): bytes buffered per client before
+                                     waiting for it (default 1MB)
+
+        Attributes:
+            clients (int): number of connected clients
+            rows_sent (int): total rows sent to all clients
+            bytes_sent (int): total bytes sent to all clients
+    """
+
+    def __init__(self, generator, **kwargs):
+        self.generator = generator
+        self.strategies = kwargs.get('strategies') or []
+        self.framing = kwargs.get('framing') or 'ndjson'
+        self.batch_size = kwargs.get('batch_size') or 1000
+        self.host = kwargs.get('host') or '127.0.0.1'
+        self.port = kwargs.get('port') or 8877
+        self.unix_socket = kwargs.get('unix_socket')
+        self.high_water = kwargs.get('high_water') or 2 ** 20
+        self.clients = 0
+        self.rows_sent = 0
+        self.bytes_sent = 0
+        if self.framing not in FRAMINGS:
+            raise NotImplementedError(
+                'Framing {} not supported'.format(self.framing))
+
+    def transform(self, rows):
+        """ Apply the server strategies to a batch of rows
+
+            Arguments:
+                rows (list): generated rows
+
+            Returns:
+                list of rows
+        """
+        if not self.strategies:
+            return rows
+        dataset = DataSet(rows, pandas=False,
+                          seed=self.generator.seed_sequence.spawn(1)[0])
+        run_strategies(self.strategies, dataset)
+        return dataset.records
+
+    async def handle_client(self, reader, writer):
+        """ Stream rows to one client until the generator is exhausted
+            or the client disconnects """
+        self.clients += 1
+        writer.transport.set_write_buffer_limits(high=self.high_water)
+        try:
+            for idx, rows in enumerate(
+                    self.generator.iter_batches(self.batch_size)):
+                rows = self.transform(rows)
+                payload = serialize_rows(rows, framing=self.framing,
+                                         header=idx == 0)
+                writer.write(payload)
+                await writer.drain()
+                self.rows_sent += len(rows)
+                self.bytes_sent += len(payload)
+                # drain() returns at once while the buffer is below the
+                # high-water mark, so yield to let other clients run
+                await asyncio.sleep(0)
+        except (ConnectionResetError, BrokenPipeError):
+            logging.info('Client disconnected')
+        finally:
+            self.clients -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+
+    async def start(self):
+        """ Start listening for clients
+
+            Returns:
+                `asyncio.Server`
+        """
+        if self.unix_socket:
+            return await asyncio.start_unix_server(self.handle_client,
+                                                   path=self.unix_socket)
+        return await asyncio.start_server(self.handle_client,
+                                          self.host, self.port)
+
+    async def serve(self):
+        """ Serve clients until cancelled """
+        server = await self.start()
+        logging.info('Serving on %s', server.sockets[0].getsockname())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.unix_socket and os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
+
+    def serve_forever(self):
+        """ Serve clients until Ctrl+C is pressed """
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
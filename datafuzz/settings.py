@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=unused-import
-""" Set HAS_NUMPY and HAS_PANDAS constants
+""" Set HAS_NUMPY, HAS_PANDAS, HAS_PYARROW and HAS_ORJSON constants
     TODO: should versions be checked?
 """
 import sys
+from importlib.util import find_spec
 
 try:
     import numpy as np
@@ -11,5 +12,17 @@ try:
 except ImportError:
     pass
 
+
+def has_module(name):
+    """ Return True if module `name` can be imported (without importing it)
+    """
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 HAS_NUMPY = 'numpy' in sys.modules
 HAS_PANDAS = 'pandas' in sys.modules
+HAS_PYARROW = has_module('pyarrow')
+HAS_ORJSON = has_module('orjson')
@@ -3,14 +3,36 @@
 Strategies define how the data will be fuzzed, duplicated, noised and altered.
 """
 import logging
-import random
-from datafuzz.utils.noise_helpers import numpy_type_transform
+import pickle
+import sys
+from contextlib import ExitStack, nullcontext
+from functools import partial
+from datafuzz.utils.noise_helpers import messy_spaces, \
+    generate_random_int, generate_random_float, messy_spaces_array, \
+    generate_random_int_array, generate_random_float_array
+from datafuzz.utils.fuzz_helpers import nanify, bigints, hexify, \
+    nanify_array, bigints_array, hexify_array
+from datafuzz.utils.parallel_helpers import split_blocks, shared_values, \
+    run_blocks
+from datafuzz.utils.sampling_helpers import sample_indexes
+from datafuzz.utils.random_helpers import seed_sequence, numpy_rng, \
+    python_rng
 from datafuzz.settings import HAS_NUMPY
 
 if HAS_NUMPY:
     import numpy as np
 
 
+VECTORIZED_HELPERS = {
+    messy_spaces: messy_spaces_array,
+    generate_random_int: generate_random_int_array,
+    generate_random_float: generate_random_float_array,
+    nanify: nanify_array,
+    bigints: bigints_array,
+    hexify: hexify_array,
+}
+
+
 class Strategy(object):
     """ Strategy objects apply predefined noise and fuzz to datasets.
 
@@ -20,11 +42,27 @@ class Strategy(object):
         Kwargs:
             percentage  (int)           : percentage to distort (0-100)
                                           If none given, default to 30
+            workers     (int)           : number of processes to use
+                                          for column transformations
+                                          If none given, default to 1
+            seed        (int)           : random seed
+                                          If none given, a stream is
+                                          spawned from the dataset seed
+            row_offset  (int)           : rows in earlier chunks of the
+                                          same input (see `num_rows`)
 
         Attributes:
             dataset (`datafuzz.DataSet`): dataset to noise / alter
             percentage (float)          : percentage to distort (0-1)
+            workers (int)               : number of worker processes
+            row_offset (int)            : rows in earlier chunks (or None)
+            seed_sequence (`numpy.random.SeedSequence`): random stream
+                                          (column and block streams are
+                                          spawned from it)
+            rng   (`numpy.random.Generator`): numpy random generator
+            random (`random.Random`)    : python random generator
 
+        NOTE: the same seed gives the same output for any number of workers.
 
         NOTE: each strategy type may have additional required keyword arguments
 
@@ -34,6 +72,8 @@ class Strategy(object):
     def __init__(self, dataset, **kwargs):
         self.dataset = dataset
         self.type = kwargs.get('type')
+        self.workers = kwargs.get('workers') or 1
+        self.row_offset = kwargs.get('row_offset')
         if kwargs.get('percentage'):
             self.percentage = kwargs.get('percentage') / 100
         else:
@@ -44,13 +84,29 @@ class Strategy(object):
         except AssertionError:
             raise Exception('You must define a percentage between 1 and 100')
 
+        if kwargs.get('seed') is not None:
+            self.seed_sequence = seed_sequence(kwargs.get('seed'))
+        else:
+            self.seed_sequence = self.dataset.spawn_seed()
+        self.rng = numpy_rng(self.seed_sequence)
+        self.random = python_rng(self.seed_sequence)
+
     @property
     def num_rows(self):
         """ return number of rows to transform in dataset
             based on given percentage.
 
             NOTE: this uses rounding so only whole numbers are returned.
+
+            If `self.row_offset` is set (the dataset is one chunk of a
+            larger input), the rounding remainder is carried over from
+            earlier chunks, so the row counts of all chunks add up to
+            the percentage of the whole input.
         """
+        if self.row_offset is not None:
+            return round((self.row_offset + len(self.dataset)) *
+                         self.percentage) - \
+                round(self.row_offset * self.percentage)
         if self.dataset.data_type in ['pandas', 'numpy']:
             return round(
                 self.dataset.records.shape[0] * self.percentage)
@@ -72,17 +128,46 @@ class Strategy(object):
         if all([isinstance(c, int) or
                 (isinstance(c, str) and c.isnumeric()) for c in columns]):
             columns = [int(c) for c in columns]
-        if self.dataset.data_type == 'pandas' and any([isinstance(c, str)
-                                                       for c in columns]):
+        if self.dataset.data_type in ['pandas', 'list', 'columnar'] and \
+                any([isinstance(c, str) for c in columns]):
             columns = [self.dataset.column_idx(col) for col in columns]
         return columns
 
+    @staticmethod
+    def vectorize(function):
+        """ Return the batch (numpy) version of a helper function
+
+            Helpers registered in `VECTORIZED_HELPERS` (and `partial`
+            objects wrapping them) have a batch version which takes
+            a whole column slice and returns a new array in one call.
+
+            Arguments:
+                function (func or `functools.partial`): helper function
+
+            Returns:
+                batch function (or None if there is no batch version)
+        """
+        if isinstance(function, partial) and not function.args:
+            batch_func = VECTORIZED_HELPERS.get(function.func)
+            if batch_func:
+                return partial(batch_func, **function.keywords)
+            return None
+        try:
+            return VECTORIZED_HELPERS.get(function)
+        except TypeError:
+            return None
+
     def apply_func_to_column(self, function, column, dataset=None):
         """
         Apply a function to a column in a given dataset.
 
         (this should work as uniformly as possible across data types)
 
+        For numpy and pandas datasets (and typed columns of columnar
+        datasets), helpers with a batch version (see `Strategy.vectorize`)
+        are applied to the whole column slice at once instead of value
+        by value.
+
         Arguments:
             function    (lambda or other func): function to apply
             column                       (int): column index
@@ -96,42 +181,224 @@ class Strategy(object):
 
         Note: This performs transformations on `dataset.records` in place.
         """
-        indexes = []
         if dataset is None:
             dataset = self.dataset
-        if dataset.data_type in ['pandas', 'numpy']:
-            while len(indexes) == 0:
-                indexes = random.sample(list(range(dataset.records.shape[0])),
-                    random.randint(1, dataset.records.shape[0]))
-            if dataset.data_type == 'pandas':
-                dataset.records.iloc[indexes, column] = \
-                        dataset.records.iloc[indexes, column].map(function)
-            else:
-                try:
-                    dataset.records[indexes, column] = np.apply_along_axis(
-                        function, 0, dataset.records[indexes, column])
-                except (TypeError, ValueError):
-                    try:
-                        func = np.vectorize(function)
-                        dataset.records[indexes, column] = np.apply_along_axis(
-                            func, 0, dataset.records[indexes, column])
-                    except ValueError as exc:
-                        # Force type change.
-                        try:
-                            numpy_type_transform(exc, dataset)
-                            dataset.records[indexes,
-                                            column] = np.apply_along_axis(
-                                                function, 0,
-                                                dataset.records[indexes,
-                                                                column])
-                        except ValueError:
-                            logging.exception('Could not transform numpy type')
-        else:
-            while len(indexes) == 0:
-                indexes = random.sample(list(range(len(dataset.records))), 
-                    random.randint(0, len(dataset.records)))
-            dataset.records = [
-                val if idx not in indexes else
-                [v if i != column else function(v) for i, v in enumerate(val)]
-                for idx, val in enumerate(dataset.records)]
+        self.apply_funcs_to_columns([(function, column)], dataset=dataset)
         return dataset
+
+    def apply_funcs_to_columns(self, tasks, dataset=None, errors=()):
+        """
+        Apply a series of functions to columns in a given dataset.
+
+        The sampled values of each column are split into blocks of rows,
+        each with its own random stream spawned from
+        `self.seed_sequence`, and the new values are put back in order.
+        With `self.workers` > 1, the blocks are transformed in a process
+        pool and numeric numpy values are passed to the workers through
+        shared memory. Functions which cannot be sent to another process
+        (i.e. lambdas) are applied in the main process.
+
+        NOTE: each column should only appear once in `tasks`.
+
+        Arguments:
+            tasks (list of tuples): (function, column) pairs
+
+        Kwargs:
+            dataset        (`dataset.DataSet`): dataset to use
+                                                defaults to self.dataset
+            errors                   (tuple): exception types which only
+                                              skip the column raising
+                                              them (they are logged and
+                                              the other columns change)
+
+        Returns:
+            list of columns skipped because of `errors`
+        """
+        if dataset is None:
+            dataset = self.dataset
+        workers = self.workers
+        if workers > 1 and not all(self._picklable(function)
+                                   for function, _ in tasks):
+            logging.info('Applying functions in the main process')
+            workers = 1
+
+        jobs, jobs_per_task, samples = [], [], []
+        with ExitStack() as stack:
+            for function, column in tasks:
+                task_seed = self.seed_sequence.spawn(1)[0]
+                indexes = self.sample_rows(dataset, rng=numpy_rng(task_seed))
+                values = self.column_values(dataset, indexes, column)
+                batch_func = None
+                if HAS_NUMPY and isinstance(values, np.ndarray):
+                    batch_func = self.vectorize(function)
+                shared = stack.enter_context(
+                    shared_values(values) if workers > 1
+                    else nullcontext(values))
+                blocks = split_blocks(len(values))
+                jobs.extend((function, batch_func, shared, start, stop,
+                             block_seed) for (start, stop), block_seed in
+                            zip(blocks, task_seed.spawn(len(blocks))))
+                jobs_per_task.append(len(blocks))
+                samples.append((column, indexes,
+                                HAS_NUMPY and isinstance(values, np.ndarray)))
+            results = run_blocks(jobs, workers, errors=errors)
+
+        skipped = []
+        for (column, indexes, is_array), num_jobs in zip(samples,
+                                                         jobs_per_task):
+            task_results, results = results[:num_jobs], results[num_jobs:]
+            try:
+                failed = [result for result in task_results
+                          if isinstance(result, BaseException)]
+                if failed:
+                    raise failed[0]
+                if is_array:
+                    values = np.concatenate(task_results)
+                else:
+                    values = [val for result in task_results
+                              for val in result]
+                self.assign_values(dataset, indexes, column, values)
+            except errors:
+                logging.exception('Could not transform column: %s', column)
+                skipped.append(column)
+        return skipped
+
+    @staticmethod
+    def _picklable(function):
+        """ Return True if the function can be sent to a worker process """
+        try:
+            pickle.dumps(function)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+        return True
+
+    def sample_rows(self, dataset, rng=None):
+        """ Return a random, non-empty sample of row indexes to transform
+
+            Arguments:
+                dataset (`dataset.DataSet`): dataset to sample
+
+            Kwargs:
+                rng (`numpy.random.Generator`): generator to draw from
+                                                defaults to self.rng
+
+            Returns:
+                sorted np.ndarray of unique row indexes
+                (see `utils.sampling_helpers.sample_indexes`)
+                (a list without numpy)
+        """
+        rng = rng or self.rng
+        num_records = len(dataset)
+        if not HAS_NUMPY:
+            return sample_indexes(rng, num_records,
+                                  rng.randint(1, num_records))
+        return sample_indexes(rng, num_records,
+                              rng.integers(1, num_records, endpoint=True))
+
+    @staticmethod
+    def column_values(dataset, indexes, column):
+        """ Return the values of one column at the given row indexes
+
+            Returns:
+                np.ndarray for numpy and pandas datasets (and typed
+                columnar columns), otherwise a list
+        """
+        if dataset.data_type == 'pandas':
+            values = dataset.records.iloc[indexes, column]
+            if values.dtype.kind in 'mM':
+                # keep Timestamps so date helpers can use them
+                return values.to_numpy(dtype=object)
+            return values.to_numpy()
+        elif dataset.data_type == 'numpy':
+            return dataset.records[indexes, column]
+        elif dataset.data_type == 'columnar':
+            return dataset.records.column_values(column, indexes)
+        values = []
+        for idx in indexes:
+            row = dataset.records[idx]
+            if isinstance(row, dict):
+                row = list(row.values())
+            values.append(row[column])
+        return values
+
+    def assign_values(self, dataset, indexes, column, values):
+        """ Set new values for one column at the given row indexes
+
+            Numpy records are upcast first if the new values need it
+            (typed columnar columns are widened, see
+            `ColumnStore.set_values`).
+
+            Arguments:
+                dataset (`dataset.DataSet`): dataset to update
+                indexes    (list): row indexes to update
+                column      (int): column index
+                values (list or np.ndarray): new values (same order as
+                                             indexes)
+        """
+        dataset.invalidate_stats(column)
+        if dataset.data_type == 'list':
+            new_values = iter(values)
+            self.track_copy(self.update_rows(
+                dataset, indexes, column, lambda x: next(new_values)))
+            dataset.track_dtypes(column, indexes, values)
+            return
+        self.track_copy(dataset.materialize(column))
+        if dataset.data_type == 'pandas':
+            dataset.records.iloc[indexes, column] = values
+            return
+        elif dataset.data_type == 'columnar':
+            dataset.records.set_values(column, indexes, values)
+            return
+        new_type = np.result_type(dataset.records.dtype, values.dtype)
+        if new_type != dataset.records.dtype:
+            # Upcast once instead of waiting for a failed assignment.
+            dataset.records = dataset.records.astype(new_type)
+        dataset.records[indexes, column] = values
+        dataset.track_rows(indexes)
+
+    def track_copy(self, num_bytes):
+        """ Add bytes copied while running this strategy
+            to `self.dataset.memory_report` (see `DataSet.copy_on_write`)
+
+            Arguments:
+                num_bytes (int): number of bytes copied
+        """
+        if num_bytes:
+            self.dataset.memory_report[type(self).__name__] += num_bytes
+
+    @staticmethod
+    def update_rows(dataset, indexes, column, function):
+        """
+        Apply a function to one column of the given rows of a list dataset.
+
+        Only the rows at `indexes` are touched: each one is copied,
+        updated and put back in place, so the rest of `dataset.records`
+        (and any rows shared with `dataset.input`) are left alone.
+        Works for rows which are lists, tuples or dictionaries (rows
+        keep their type).
+
+        Arguments:
+            dataset (`dataset.DataSet`): list dataset to update
+            indexes       (iterable): unique row indexes to update
+            column             (int): column index
+            function (lambda or other func): function to apply
+
+        Returns:
+            number of bytes copied (only counted with `copy_on_write`)
+        """
+        records = dataset.records
+        copied = 0
+        for idx in indexes:
+            row = records[idx]
+            if isinstance(row, dict):
+                row = dict(row)
+                key = list(row.keys())[column]
+                row[key] = function(row[key])
+            else:
+                values = list(row)
+                values[column] = function(values[column])
+                row = values if isinstance(row, list) else type(row)(values)
+            records[idx] = row
+            if dataset.copy_on_write:
+                copied += sys.getsizeof(row)
+        return copied
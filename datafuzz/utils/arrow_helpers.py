@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for Parquet and Arrow IPC (Feather) files.
+
+Files are read into Arrow tables and only the projected columns
+(the columns strategies change) are converted to dataframes or lists.
+The other columns stay in Arrow memory as a passthrough table and are
+joined back, without conversion, when the records are written.
+
+NOTE: requires pyarrow (see `settings.HAS_PYARROW`)
+"""
+from datafuzz.settings import HAS_PANDAS, HAS_PYARROW
+from datafuzz.utils.columnar_helpers import ColumnStore, to_column
+
+if HAS_PANDAS:
+    import pandas as pd
+
+if HAS_PYARROW:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+IPC_EXTENSIONS = ('.arrow', '.feather')
+
+
+def is_arrow_file(filename):
+    """ Return True if the filename is a Parquet or Arrow IPC file """
+    return isinstance(filename, str) and \
+        filename.endswith(PARQUET_EXTENSIONS + IPC_EXTENSIONS)
+
+
+def read_table(filename, memory_map=True):
+    """ Read a Parquet or Arrow IPC file into an Arrow table
+
+        Arrow IPC files are memory mapped, so columns which are
+        only passed through are never copied.
+
+        Arguments:
+            filename (str): file path
+
+        Kwargs:
+            memory_map (bool): map the file instead of reading it into
+                               memory (default True; the file must not
+                               be overwritten while the table is used)
+
+        Returns:
+            `pyarrow.Table`
+    """
+    if filename.endswith(PARQUET_EXTENSIONS):
+        return pq.read_table(filename, memory_map=memory_map)
+    return feather.read_table(filename, memory_map=memory_map)
+
+
+def iter_tables(filename, chunksize):
+    """ Yield a Parquet or Arrow IPC file `chunksize` rows at a time
+
+        Arguments:
+            filename  (str): file path
+            chunksize (int): rows per table
+
+        Yields:
+            `pyarrow.Table`
+    """
+    if filename.endswith(PARQUET_EXTENSIONS):
+        batches = pq.ParquetFile(filename, memory_map=True).iter_batches(
+            batch_size=chunksize)
+    else:
+        batches = read_table(filename).to_batches(max_chunksize=chunksize)
+    for batch in batches:
+        yield pa.Table.from_batches([batch])
+
+
+def split_table(table, columns=None):
+    """ Split a table into projected and passthrough columns
+
+        Arguments:
+            table (`pyarrow.Table`): table to split
+
+        Kwargs:
+            columns (list): column names to project (default: all)
+
+        Returns:
+            tuple of (projected table, passthrough table or None)
+
+        raises Exception if a column is not in the table
+    """
+    if not columns:
+        return table, None
+    missing = set(columns) - set(table.column_names)
+    if missing:
+        raise Exception('Columns {} could not be found!'.format(
+            sorted(missing)))
+    rest = [name for name in table.column_names if name not in columns]
+    projected = table.select([name for name in table.column_names
+                              if name in columns])
+    return projected, table.select(rest) if rest else None
+
+
+def table_to_records(table, use_pandas=True, columnar=False):
+    """ Convert an Arrow table to a dataframe, column store
+        (see `utils.columnar_helpers.ColumnStore`) or list of dicts """
+    if columnar:
+        return ColumnStore([to_column(column.to_pylist())
+                            for column in table.columns],
+                           names=table.column_names)
+    if use_pandas and HAS_PANDAS:
+        return table.to_pandas()
+    return table.to_pylist()
+
+
+def to_arrow_array(values):
+    """ Convert column values to an Arrow array
+
+        Columns with mixed types (i.e. after fuzzing) can't be stored
+        in one Arrow type, so they are stored as strings.
+
+        Arguments:
+            values (list, `pandas.Series` or `numpy.ndarray`): column values
+
+        Returns:
+            `pyarrow.Array`
+    """
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return to_string_array(values)
+
+
+def to_string_array(values):
+    """ Convert column values to an Arrow string array
+        (None and NaN values are kept as nulls)
+
+        Arguments:
+            values (list, `pandas.Series`, `numpy.ndarray`
+                    or `pyarrow.Array`): column values
+
+        Returns:
+            `pyarrow.Array`
+    """
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        values = values.to_pylist()
+    return pa.array([None if val is None or
+                     (isinstance(val, float) and val != val)
+                     else str(val) for val in values], type=pa.string())
+
+
+def records_to_table(records, data_type, header=None):
+    """ Convert DataSet or generator records to an Arrow table
+
+        Arguments:
+            records  (obj): dataframe, numpy 2D array, column store or list
+            data_type (str): records data type
+                             (pandas, numpy, columnar or list)
+
+        Kwargs:
+            header (list): column names of list or tuple rows
+                           (default: column indexes)
+
+        Returns:
+            `pyarrow.Table`
+    """
+    if data_type == 'pandas':
+        names = [str(name) for name in records.columns]
+        arrays = [to_arrow_array(records.iloc[:, idx])
+                  for idx in range(records.shape[1])]
+    elif data_type == 'numpy':
+        names = [str(idx) for idx in range(records.shape[1])]
+        arrays = [to_arrow_array(records[:, idx])
+                  for idx in range(records.shape[1])]
+    elif data_type == 'columnar':
+        names = records.names or [str(idx)
+                                  for idx in range(records.num_columns)]
+        arrays = [to_arrow_array(column) for column in records.columns]
+    elif records and isinstance(records[0], dict):
+        names = list(records[0].keys())
+        arrays = [to_arrow_array([row.get(name) for row in records])
+                  for name in names]
+    elif header:
+        names = [str(name) for name in header]
+        arrays = [to_arrow_array([row[idx] for row in records])
+                  for idx in range(len(names))]
+    else:
+        names = [str(idx) for idx in range(len(records[0]) if records else 0)]
+        arrays = [to_arrow_array([row[idx] for row in records])
+                  for idx in range(len(names))]
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def join_passthrough(table, passthrough, column_names):
+    """ Join passthrough columns back onto a table of projected columns
+
+        Arguments:
+            table       (`pyarrow.Table`): projected columns
+            passthrough (`pyarrow.Table`): passthrough columns (or None)
+            column_names (list): column order of the input file
+
+        Returns:
+            `pyarrow.Table`
+
+        raises Exception if rows were added or removed, as the
+        passthrough columns would no longer line up
+    """
+    if passthrough is None:
+        return table
+    if table.num_rows != passthrough.num_rows:
+        raise Exception(
+            'Column projection requires strategies which keep the number '
+            'of rows ({} rows, {} passthrough rows).'.format(
+                table.num_rows, passthrough.num_rows))
+    names = [name for name in column_names
+             if name in table.column_names or
+             name in passthrough.column_names]
+    names += [name for name in table.column_names if name not in names]
+    return pa.Table.from_arrays(
+        [(table if name in table.column_names else passthrough).column(name)
+         for name in names], names=names)
+
+
+def merge_passthrough(records, data_type, passthrough, column_names):
+    """ Merge passthrough columns into records (for non-Arrow outputs)
+
+        Arguments:
+            records  (obj): dataframe, column store or list of dicts
+            data_type (str): records data type (pandas, columnar or list)
+            passthrough (`pyarrow.Table`): passthrough columns
+            column_names (list): column order of the input file
+
+        Returns:
+            dataframe, column store or list of dicts with every column
+    """
+    if len(records) != passthrough.num_rows:
+        raise Exception(
+            'Column projection requires strategies which keep the number '
+            'of rows ({} rows, {} passthrough rows).'.format(
+                len(records), passthrough.num_rows))
+    if data_type == 'pandas':
+        merged = pd.concat([records.reset_index(drop=True),
+                            passthrough.to_pandas()], axis=1)
+        return merged[[name for name in column_names
+                       if name in merged.columns]]
+    elif data_type == 'columnar':
+        columns = records.to_dict()
+        return ColumnStore(
+            [columns[name] if name in columns else
+             to_column(passthrough.column(name).to_pylist())
+             for name in column_names], names=column_names)
+    return [{name: row[name] if name in row else extra.get(name)
+             for name in column_names}
+            for row, extra in zip(records, passthrough.to_pylist())]
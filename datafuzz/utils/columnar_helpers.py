@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Column store for the 'columnar' DataSet backend.
+
+Records are kept as one container per column instead of one dict or
+list per row: integer and float columns are typed `array.array`s
+(8 bytes per value) and other columns are plain lists of values.
+Only the standard library is required; with numpy installed, typed
+columns are read and written as numpy arrays without copying.
+"""
+from array import array
+from itertools import chain, islice
+import sys
+from datafuzz.settings import HAS_NUMPY
+from datafuzz.utils.stats_helpers import sample_positions, value_type, \
+    infer_dtype, DTYPE_SAMPLE
+
+if HAS_NUMPY:
+    import numpy as np
+
+INT_TYPE = 'q'
+FLOAT_TYPE = 'd'
+DTYPES = {INT_TYPE: 'int64', FLOAT_TYPE: 'float64'}
+MAX_EXACT_FLOAT = 2 ** 53
+BLOCK_ROWS = 64 * 1024
+
+
+def to_column(values, parse=False):
+    """ Return the most compact container for a column of values
+
+        Arguments:
+            values (iterable): column values
+
+        Kwargs:
+            parse (bool): values are strings (i.e. read from csv) and
+                          numbers should be parsed from them (empty
+                          strings become NaN in float columns)
+
+        Returns:
+            `array.array` ('q' for integers, 'd' for floats) or list
+    """
+    values = list(values)
+    if parse:
+        try:
+            return array(INT_TYPE, [int(val) for val in values])
+        except (ValueError, TypeError, OverflowError):
+            pass
+        try:
+            return array(FLOAT_TYPE, [float(val) if val != '' else
+                                      float('nan') for val in values])
+        except (ValueError, TypeError):
+            return values
+    types = set(map(type, values))
+    try:
+        if types == {int}:
+            return array(INT_TYPE, values)
+        elif types in ({float}, {int, float}):
+            return array(FLOAT_TYPE, values)
+    except OverflowError:
+        pass
+    return values
+
+
+def widen_column(column, values):
+    """ Return a copy of a typed column which can hold `values`
+
+        Integer columns become float columns if the values are numbers
+        (and the integers can be stored exactly as floats), otherwise
+        the column becomes a list.
+
+        Arguments:
+            column (`array.array`): typed column
+            values (list): values which did not fit the column
+
+        Returns:
+            `array.array` or list
+    """
+    if column.typecode == INT_TYPE and \
+            -MAX_EXACT_FLOAT <= min(column, default=0) and \
+            max(column, default=0) <= MAX_EXACT_FLOAT:
+        try:
+            array(FLOAT_TYPE, values)
+            return array(FLOAT_TYPE, column)
+        except (TypeError, OverflowError):
+            pass
+    return list(column)
+
+
+def extend_column(column, values):
+    """ Return a column extended with more values (in place if the
+        column can hold them)
+
+        Arguments:
+            column (`array.array` or list): column to extend
+            values (`array.array` or list): values to add (see `to_column`)
+
+        Returns:
+            `array.array` or list
+    """
+    if not len(column):
+        return values[:]
+    if isinstance(column, array):
+        if isinstance(values, array) and values.typecode == column.typecode:
+            column.extend(values)
+            return column
+        column = widen_column(column, values)
+        if isinstance(column, array):
+            column.extend(array(column.typecode, values))
+            return column
+    column.extend(values)
+    return column
+
+
+def column_nbytes(column):
+    """ Return the bytes held by a column container (not counting the
+        objects a list column points to) """
+    if isinstance(column, array):
+        return column.itemsize * len(column)
+    return sys.getsizeof(column)
+
+
+class ColumnStore(object):
+    """ Records stored column by column (see `DataSet` `columnar=True`)
+
+        Indexing and iteration work like a list of rows: a row is a dict
+        if the columns are named and a tuple otherwise, and a slice is a
+        list of rows, so outputs which write lists of rows chunk by chunk
+        only build one chunk of rows at a time.
+
+        Arguments:
+            columns (list): column containers (see `to_column`)
+
+        Kwargs:
+            names (list): column names
+
+        Attributes:
+            columns (list): typed `array.array` or list per column
+            names   (list): column names (or None)
+    """
+    __slots__ = ('columns', 'names')
+
+    def __init__(self, columns, names=None):
+        self.columns = list(columns)
+        self.names = list(names) if names is not None else None
+
+    @classmethod
+    def from_rows(cls, rows, names=None, parse=False):
+        """ Build a column store from rows, `BLOCK_ROWS` rows at a time
+
+            Arguments:
+                rows (iterable): dicts or sequences
+
+            Kwargs:
+                names (list): column names (defaults to the keys of the
+                              first row if rows are dicts)
+                parse  (bool): parse numbers from strings (see `to_column`)
+
+            Returns:
+                `ColumnStore`
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return cls([[] for _ in names or []], names)
+        if isinstance(first, dict) and names is None:
+            names = list(first.keys())
+        num_columns = len(names) if names is not None else len(first)
+        columns = [[] for _ in range(num_columns)]
+        rows = chain([first], rows)
+        while True:
+            block = list(islice(rows, BLOCK_ROWS))
+            if not block:
+                break
+            if isinstance(block[0], dict):
+                block = [[row.get(name) for name in names] for row in block]
+            for idx, values in enumerate(zip(*block)):
+                columns[idx] = extend_column(columns[idx],
+                                             to_column(values, parse))
+        return cls(columns, names)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    @property
+    def num_columns(self):
+        """ Return the number of columns """
+        return len(self.columns)
+
+    def _row(self, values):
+        """ Return row values as a dict (named columns) or tuple """
+        if self.names is None:
+            return values
+        return dict(zip(self.names, values))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._row(values) for values in
+                    zip(*[column[idx] for column in self.columns])]
+        return self._row(tuple(column[idx] for column in self.columns))
+
+    def __iter__(self):
+        for values in self.tuples():
+            yield self._row(values)
+
+    def tuples(self):
+        """ Iterate over the rows as tuples (without column names) """
+        return zip(*self.columns)
+
+    def to_dict(self):
+        """ Return a dict of column name (or index) to column container """
+        return dict(zip(self.names or range(len(self.columns)),
+                        self.columns))
+
+    def copy(self, deep=True):
+        """ Return a copy of the store
+
+            Kwargs:
+                deep (bool): copy the columns (otherwise the new store
+                             shares the column containers)
+        """
+        if not deep:
+            return ColumnStore(self.columns, self.names)
+        return ColumnStore([column[:] for column in self.columns],
+                           self.names)
+
+    def copy_column(self, column):
+        """ Replace a (shared) column with a copy of it
+
+            Returns:
+                number of bytes copied
+        """
+        self.columns[column] = self.columns[column][:]
+        return column_nbytes(self.columns[column])
+
+    def take(self, indexes):
+        """ Return a new store with the rows at `indexes` """
+        if hasattr(indexes, 'tolist'):
+            indexes = indexes.tolist()
+        columns = []
+        for column in self.columns:
+            values = [column[idx] for idx in indexes]
+            if isinstance(column, array):
+                values = array(column.typecode, values)
+            columns.append(values)
+        return ColumnStore(columns, self.names)
+
+    def extend(self, rows):
+        """ Add rows to the end of the store
+
+            Arguments:
+                rows (`ColumnStore` or iterable of dicts or sequences)
+        """
+        if not isinstance(rows, ColumnStore):
+            rows = ColumnStore.from_rows(rows, names=self.names)
+        for idx, values in enumerate(rows.columns):
+            self.columns[idx] = extend_column(self.columns[idx], values)
+
+    def dtype(self, column, sample_size=DTYPE_SAMPLE):
+        """ Return the data type of a column
+
+            Kwargs:
+                sample_size (int): rows to infer list column types from
+
+            Returns:
+                'int64' or 'float64' for typed columns, otherwise the
+                most common type of the sampled values
+                (see `utils.stats_helpers.infer_dtype`)
+        """
+        values = self.columns[column]
+        if isinstance(values, array):
+            return DTYPES[values.typecode]
+        return infer_dtype(value_type(values[idx]) for idx in
+                           sample_positions(len(values), sample_size))
+
+    def column_values(self, column, indexes):
+        """ Return the values of a column at the given row indexes
+
+            Returns:
+                np.ndarray for typed columns (if numpy is installed),
+                otherwise a list
+        """
+        values = self.columns[column]
+        if HAS_NUMPY and isinstance(values, array):
+            return np.frombuffer(values, dtype=values.typecode)[indexes]
+        if hasattr(indexes, 'tolist'):
+            indexes = indexes.tolist()
+        return [values[idx] for idx in indexes]
+
+    def set_values(self, column, indexes, values):
+        """ Set the values of a column at the given row indexes
+
+            Typed columns are widened (see `widen_column`) if the new
+            values do not fit them.
+
+            Arguments:
+                column      (int): column index
+                indexes    (list or np.ndarray): row indexes
+                values (list or np.ndarray): new values (same order
+                                             as indexes)
+        """
+        current = self.columns[column]
+        if HAS_NUMPY and isinstance(values, np.ndarray):
+            if isinstance(current, array) and values.dtype.kind in (
+                    'i' if current.typecode == INT_TYPE else 'if'):
+                np.frombuffer(current, dtype=current.typecode)[
+                    indexes] = values
+                return
+            values = values.tolist()
+        if hasattr(indexes, 'tolist'):
+            indexes = indexes.tolist()
+        if isinstance(current, array):
+            try:
+                for idx, value in zip(indexes, values):
+                    current[idx] = value
+                return
+            except (TypeError, OverflowError):
+                current = self.columns[column] = widen_column(current, values)
+        for idx, value in zip(indexes, values):
+            current[idx] = value
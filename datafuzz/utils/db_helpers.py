@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for sharing database connections.
+
+`connect` returns one `dataset.Database` per database URI for the whole
+process, so validating, reading and writing a dataset (and later runs
+against the same database) reuse the same engine and connection pool.
+Pandas reads and writes use the engine of the same object
+(`Database.engine`).
+"""
+import threading
+import dataset as dataset_db
+
+_CONNECTIONS = {}
+_LOCK = threading.Lock()
+
+
+def connect(db_uri):
+    """ Return the shared `dataset.Database` for a database URI
+
+        Arguments:
+            db_uri (str): database URI
+
+        Returns:
+            `dataset.Database`
+    """
+    with _LOCK:
+        db = _CONNECTIONS.get(db_uri)
+        if db is None or db.engine is None:
+            db = _CONNECTIONS[db_uri] = dataset_db.connect(db_uri)
+        return db
+
+
+def close_connections(db_uri=None):
+    """ Close shared connections (for one URI or all of them)
+
+        Call this before removing a database file which may still
+        be open, or at the end of a process.
+
+        Kwargs:
+            db_uri (str): database URI (default: all URIs)
+    """
+    with _LOCK:
+        uris = [db_uri] if db_uri else list(_CONNECTIONS.keys())
+        for uri in uris:
+            db = _CONNECTIONS.pop(uri, None)
+            if db is not None and db.engine is not None:
+                db.close()
@@ -2,6 +2,10 @@
 # pylint: disable=unused-argument
 """
 Helpers for fuzzing.
+
+Helpers which pick random values take an optional `rng` keyword argument
+(a `random.Random` instance, or a `numpy.random.Generator` for the
+batch methods).
 """
 import codecs
 import logging
@@ -18,19 +22,19 @@ if HAS_NUMPY:
 # STRING METHODS
 
 
-def add_format(val):
+def add_format(val, rng=random):
     """ Insert format strings """
     if not isinstance(val, str):
         val = str(val)
-    idx = random.randint(0, len(val))
-    format_str = '%{}'.format(random.choice(list('fdsr')))
+    idx = rng.randint(0, len(val))
+    format_str = '%{}'.format(rng.choice(list('fdsr')))
     return val[:idx] + format_str + val[idx:]
 
-def change_encoding(val):
+def change_encoding(val, rng=random):
     """ Return byte value with perhaps bad encoding  """
     if not isinstance(val, str):
         val = str(val)
-    choice = random.choice(
+    choice = rng.choice(
         ['utf-16', 'latin-1', 'windows-1250', 'iso-8859-1'])
     return val.encode(choice, errors='replace')
 
@@ -49,12 +53,12 @@ def insert_boms(val):
 
 # DATE METHODS
 
-def shift_time(val):
+def shift_time(val, rng=random):
     """ Insert UTF BOMs at start of string  """
-    return val + timedelta(weeks=random.randint(-125, 125),
-                           days=random.randint(-100,100))
+    return val + timedelta(weeks=rng.randint(-125, 125),
+                           days=rng.randint(-100,100))
 
-def date_to_str(val):
+def date_to_str(val, rng=random):
     """ Insert UTF BOMs at start of string  """
     date_formats = [
         "%d/%m/%y",
@@ -70,24 +74,24 @@ def date_to_str(val):
         "%m.%d.%y %H:%M:%S"
     ]
 
-    return val.strftime(random.choice(date_formats))
+    return val.strftime(rng.choice(date_formats))
 
 
 # NUMERIC METHODS
 
 
-def nanify(val, use_numpy=True):
+def nanify(val, use_numpy=True, rng=random):
     """ Insert some random null values  """
     null_choices = [None, 'null', 'n/a', '', -1]
     if HAS_NUMPY and use_numpy:
-        return random.choice(null_choices + [np.nan])
-    return random.choice(null_choices)
+        return rng.choice(null_choices + [np.nan])
+    return rng.choice(null_choices)
 
 
-def bigints(val):
+def bigints(val, rng=random):
     """ Return positive or negative big integers (magic #s) """
-    return random.choice(
-        [2**15-1, 2**31-1, 2**32-1, 2**63-1]) * random.choice([1, -1])
+    return rng.choice(
+        [2**15-1, 2**31-1, 2**32-1, 2**63-1]) * rng.choice([1, -1])
 
 
 def hexify(val):
@@ -97,12 +101,38 @@ def hexify(val):
     return hex(int(val))
     
 
+# NUMPY BATCH METHODS
+
+
+def nanify_array(vals, use_numpy=True, rng=None):
+    """ Batch version of `nanify` for a numpy column slice """
+    rng = rng or np.random.default_rng()
+    null_choices = [None, 'null', 'n/a', '', -1]
+    if use_numpy:
+        null_choices.append(np.nan)
+    null_choices = np.array(null_choices, dtype=object)
+    return null_choices[rng.integers(0, len(null_choices), size=len(vals))]
+
+
+def bigints_array(vals, rng=None):
+    """ Batch version of `bigints` for a numpy column slice """
+    rng = rng or np.random.default_rng()
+    magic = np.array([2**15-1, 2**31-1, 2**32-1, 2**63-1], dtype=np.int64)
+    return magic[rng.integers(0, len(magic), size=len(vals))] * \
+        rng.choice([1, -1], size=len(vals))
+
+
+def hexify_array(vals, rng=None):
+    """ Batch version of `hexify` for a numpy column slice """
+    return np.frompyfunc(hex, 1, 1)(np.asarray(vals).astype(np.int64))
+
+
 # RANDOM / NEW DATA METHODS
 
 
-def sql(*args):
+def sql(*args, rng=random):
     """ Generate unkind sql statements """
-    return random.choice([
+    return rng.choice([
         "WAITFOR DELAY '0:10:0';",
         "SELECT pg_sleep(600);",
         "drop table if exists customers;",
@@ -112,15 +142,15 @@ def sql(*args):
     ])
 
 
-def metachars(val):
+def metachars(val, rng=random):
     """ Join current value with metachars  """
-    char = random.choice(list('|*\n,>.<"\'\t;/'))
+    char = rng.choice(list('|*\n,>.<"\'\t;/'))
     return char.join(list(str(val)))
 
 
-def files(val):
+def files(val, rng=random):
     """ Return file paths or commands  """
-    return random.choice([
+    return rng.choice([
         '../../',
         '/var/run',
         '/etc',
@@ -131,13 +161,13 @@ def files(val):
     ])
 
 
-def delimiter(val):
+def delimiter(val, rng=random):
     """ Add one or repeating delimiters in string """
-    delim = random.choice(list(';,\n\r\t:')) * random.randint(1, 5)
+    delim = rng.choice(list(';,\n\r\t:')) * rng.randint(1, 5)
     return delim.join(list(str(val)))
 
 
-def emoji(val):
+def emoji(val, rng=random):
     """
     Convert `val` to string and add a random emoji at the end
 
@@ -154,7 +184,7 @@ def emoji(val):
     weight_distr = list(accumulate(count))
 
     # Get one point in the multiple ranges
-    point = random.randrange(weight_distr[-1])
+    point = rng.randrange(weight_distr[-1])
 
     # Select the correct range
     emoji_range_idx = bisect(weight_distr, point)
@@ -2,15 +2,20 @@
 # pylint: disable=unused-argument
 """
 Helpers for noise.
+
+Random helpers take an optional `rng` keyword argument
+(a `random.Random` instance; defaults to the `random` module).
 """
-import logging
 import random
-import re
 import string
+from datafuzz.settings import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
 
 # STRING METHODS
 
-def pertubate_str(val):
+def pertubate_str(val, rng=random):
     """ Generate a random string by permutating some characters
         Arguments:
             val (str): original string
@@ -19,47 +24,48 @@ def pertubate_str(val):
             str
     """ 
     possible_str = string.ascii_letters + string.punctuation + string.digits
-    for _ in range(random.randrange(1, 5)):
-        char = random.choice(val)
-        replacement = random.choice(possible_str.replace(char, ''))
+    for _ in range(rng.randrange(1, 5)):
+        char = rng.choice(val)
+        replacement = rng.choice(possible_str.replace(char, ''))
         val = val.replace(char, replacement)
     return val
 
-def messy_spaces(val):
+def messy_spaces(val, rng=random):
     """ Add or remove spaces from a string
         Arguments:
             val (str): string to manipulate
         Returns:
             str
     """
-    return val.replace(' ', ' ' * random.choice([0, 2, 3, 4, 5]))
+    return val.replace(' ', ' ' * rng.choice([0, 2, 3, 4, 5]))
 
 # NUMERIC METHODS
 
-def generate_random_int(val, low=0, high=100):
+def generate_random_int(val, low=0, high=100, rng=random):
     """ Generate and integer between low and high
         Arguments:
             val (value): ignored for now
         Kwargs:
             low   (int): low value (default: 0)
             low   (int): high value (default: 100)
+            rng (random.Random): random generator to use
         Returns:
             int
 
         TODO:
             - should val be used in some way?
     """
-    new_val = random.randint(low, high)
+    new_val = rng.randint(low, high)
     tries = 0
     while new_val == val:
-        new_val = random.randint(low, high)
+        new_val = rng.randint(low, high)
         tries += 1
         if tries == 10:
-            return val + random.randint(low, high)
+            return val + rng.randint(low, high)
     return new_val
 
 
-def generate_random_float(val, low=0, high=1.0):
+def generate_random_float(val, low=0, high=1.0, rng=random):
     """ Generate a float between low and high
         Arguments:
             val (value): ignored for now
@@ -67,6 +73,7 @@ def generate_random_float(val, low=0, high=1.0):
         Kwargs:
             low   (int): low value (default: 0)
             low   (int): high value (default: 1)
+            rng (random.Random): random generator to use
         Returns:
             float
 
@@ -74,42 +81,98 @@ def generate_random_float(val, low=0, high=1.0):
             - should val be used in some way?
 
     """
-    new_val = random.uniform(low, high)
+    new_val = rng.uniform(low, high)
     tries = 0
     while new_val == val:
-        new_val = random.uniform(low, high)
+        new_val = rng.uniform(low, high)
         tries += 1
         if tries == 10:
-            return val + random.uniform(low, high)
+            return val + rng.uniform(low, high)
     return new_val
 
 
-# NUMPY TRANSFORM
-
-def numpy_type_transform(exc, dataset):
-    """ Force a numpy type transformation when
-        adding noise to numpy matrices. This will attempt to
-        parse the objective type from the exception string
-        and transform the array to that type.
+# TYPE METHODS
 
+def change_type(val, types=(str, float), rng=random):
+    """ Cast a value to one of the given types at random
         Arguments:
-            exc                   (str): Exception string
-            dataset (`dataset.DataSet`): dataset to transform
-
+            val (value): value to cast
+        Kwargs:
+            types (list of types): types to choose from
+            rng (random.Random): random generator to use
         Returns:
-            None
+            value of the chosen type
+    """
+    return rng.choice(types)(val)
 
-        Note: this modifies types in place.
+
+# NUMPY BATCH METHODS
+
+def messy_spaces_array(vals, rng=None):
+    """ Batch version of `messy_spaces` for a numpy column slice.
+        Non-string values are left untouched.
+
+        Arguments:
+            vals (np.ndarray): values to manipulate
+        Kwargs:
+            rng (np.random.Generator): random generator to use
+        Returns:
+            np.ndarray (object dtype)
+    """
+    rng = rng or np.random.default_rng()
+    new_vals = np.array(vals, dtype=object)
+    is_str = np.frompyfunc(
+        lambda v: isinstance(v, str), 1, 1)(new_vals).astype(bool)
+    spaces = np.array([' ' * num for num in [0, 2, 3, 4, 5]], dtype=object)
+    spaces = spaces[rng.integers(0, len(spaces), size=is_str.sum())]
+    new_vals[is_str] = np.frompyfunc(str.replace, 3, 1)(
+        new_vals[is_str], ' ', spaces)
+    return new_vals
+
+
+def generate_random_int_array(vals, low=0, high=100, rng=None):
+    """ Batch version of `generate_random_int` for a numpy column slice.
+        Arguments:
+            vals (np.ndarray): values to replace
+        Kwargs:
+            low   (int): low value (default: 0)
+            high  (int): high value (default: 100)
+            rng (np.random.Generator): random generator to use
+        Returns:
+            np.ndarray
+    """
+    rng = rng or np.random.default_rng()
+    vals = np.asarray(vals)
+    new_vals = rng.integers(low, high, size=len(vals), endpoint=True)
+    for _ in range(10):
+        same = new_vals == vals
+        if not same.any():
+            return new_vals
+        new_vals[same] = rng.integers(low, high, size=same.sum(),
+                                      endpoint=True)
+    same = new_vals == vals
+    new_vals[same] = new_vals[same] + rng.integers(
+        low, high, size=same.sum(), endpoint=True)
+    return new_vals
+
+
+def generate_random_float_array(vals, low=0, high=1.0, rng=None):
+    """ Batch version of `generate_random_float` for a numpy column slice.
+        Arguments:
+            vals (np.ndarray): values to replace
+        Kwargs:
+            low   (int): low value (default: 0)
+            high  (int): high value (default: 1)
+            rng (np.random.Generator): random generator to use
+        Returns:
+            np.ndarray
     """
-    pattern = re.compile(r'could not convert (?P<type>\w+)')
-    try:
-        necessary_type = re.search(pattern, str(exc)).group('type')
-    except AttributeError:
-        logging.error('Error in numpy transform: %s', exc)
-        return
-    if necessary_type == 'float':
-        dataset.records = dataset.records.astype(float)
-    elif necessary_type == 'int':
-        dataset.records = dataset.records.astype(int)
-    elif necessary_type == 'string':
-        dataset.records = dataset.records.astype(str)
+    rng = rng or np.random.default_rng()
+    vals = np.asarray(vals)
+    # same formula as `random.uniform`, so NaN limits give NaN values
+    new_vals = low + (high - low) * rng.random(len(vals))
+    same = new_vals == vals
+    if same.any():
+        new_vals[same] = new_vals[same] + low + \
+            (high - low) * rng.random(same.sum())
+    return new_vals
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for reading and writing binary numpy (.npy and .npz) files.
+
+Arrays are memory mapped in copy-on-write mode ('c'): only the pages
+which strategies change are copied into memory and the input file is
+never modified. Arrays stored uncompressed in .npz archives (`np.savez`)
+are mapped in place as well; compressed members are loaded into memory.
+"""
+import os
+import shutil
+import struct
+import zipfile
+from datafuzz.settings import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+ZIP_HEADER = struct.Struct('<4s5H3L2H')
+WRITE_ROWS = 64 * 1024
+
+
+def read_npy_header(myf):
+    """ Read a .npy header from an open file
+
+        Arguments:
+            myf (file): file positioned at the start of the .npy data
+
+        Returns:
+            tuple of (version, shape, fortran_order, dtype)
+    """
+    version = np.lib.format.read_magic(myf)
+    if version == (1, 0):
+        header = np.lib.format.read_array_header_1_0(myf)
+    else:
+        header = np.lib.format.read_array_header_2_0(myf)
+    return (version,) + header
+
+
+def load_array(filename, key=None, mmap_mode='c'):
+    """ Load an array from a .npy or .npz file
+
+        Arguments:
+            filename (str): .npy or .npz file path
+
+        Kwargs:
+            key (str): .npz array name (default: the first array)
+            mmap_mode (str): numpy memory map mode (default 'c' for
+                             copy-on-write, None to load into memory)
+
+        Returns:
+            `numpy.memmap` or `numpy.ndarray`
+    """
+    if not filename.endswith('.npz'):
+        return np.load(filename, mmap_mode=mmap_mode)
+    with zipfile.ZipFile(filename) as archive:
+        names = archive.namelist()
+        member = archive.getinfo(key + '.npy' if key else names[0])
+        if mmap_mode is None or member.compress_type != zipfile.ZIP_STORED:
+            with archive.open(member) as myf:
+                return np.lib.format.read_array(myf)
+    with open(filename, 'rb') as myf:
+        myf.seek(member.header_offset)
+        header = ZIP_HEADER.unpack(myf.read(ZIP_HEADER.size))
+        myf.seek(header[-2] + header[-1], os.SEEK_CUR)
+        _, shape, fortran_order, dtype = read_npy_header(myf)
+        if dtype.hasobject:
+            raise ValueError('Object arrays can not be memory mapped.')
+        offset = myf.tell()
+    return np.memmap(filename, dtype=dtype, mode=mmap_mode, offset=offset,
+                     shape=shape, order='F' if fortran_order else 'C')
+
+
+def save_array(filename, array):
+    """ Write an array to a .npy file
+
+        Memory mapped arrays are written straight from their pages,
+        so they are never loaded into memory at once.
+    """
+    with open(filename, 'wb') as myf:
+        np.save(myf, array)
+    return filename
+
+
+def append_array(filename, array):
+    """ Append rows to an existing .npy file
+
+        The header shape is rewritten in place (numpy pads .npy headers
+        so the row count can grow) and the rows are written at the end.
+
+        raises Exception if the dtype, columns or layout don't match
+    """
+    with open(filename, 'rb+') as myf:
+        version, shape, fortran_order, dtype = read_npy_header(myf)
+        header_size = myf.tell()
+        if fortran_order or dtype.hasobject or dtype != array.dtype or \
+                tuple(shape[1:]) != array.shape[1:]:
+            raise Exception(
+                'Can not append {} {} rows to {} ({} {}).'.format(
+                    array.shape, array.dtype, filename, shape, dtype))
+        header = {'descr': np.lib.format.dtype_to_descr(dtype),
+                  'fortran_order': False,
+                  'shape': (shape[0] + array.shape[0],) + tuple(shape[1:])}
+        myf.seek(0)
+        if version == (1, 0):
+            np.lib.format.write_array_header_1_0(myf, header)
+        else:
+            np.lib.format.write_array_header_2_0(myf, header)
+        if myf.tell() != header_size:
+            raise Exception('Could not grow the header of {}.'.format(
+                filename))
+        myf.seek(0, os.SEEK_END)
+        np.ascontiguousarray(array).tofile(myf)
+    return filename
+
+
+def write_changed_rows(source, filename, array, rows):
+    """ Write a changed copy of a memory mapped .npy file
+
+        The source file is copied (by the OS, without reading it into
+        Python) and only the changed rows are written to the copy.
+
+        Arguments:
+            source   (str): .npy file the array is mapped from
+            filename (str): output .npy file (may be the source)
+            array (`numpy.memmap`): changed array
+            rows (`numpy.ndarray`): sorted indexes of the changed rows
+    """
+    if os.path.abspath(source) != os.path.abspath(filename):
+        shutil.copyfile(source, filename)
+    output = np.load(filename, mmap_mode='r+')
+    for start in range(0, len(rows), WRITE_ROWS):
+        block = rows[start:start + WRITE_ROWS]
+        output[block] = array[block]
+    output.flush()
+    del output
+    return filename
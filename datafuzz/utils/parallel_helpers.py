@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for running column transformations in a process pool.
+
+Column values are split into blocks of `BLOCK_SIZE` rows. Each block is
+transformed by a worker process and the results are put back together
+in submission order, so the output does not depend on which worker
+finished first. Each block draws from its own seeded random stream, so
+the output does not depend on the number of workers either.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from numbers import Number
+from datafuzz.settings import HAS_NUMPY
+from datafuzz.utils.random_helpers import numpy_rng, python_rng, accepts_rng
+
+if HAS_NUMPY:
+    import numpy as np
+    from multiprocessing import shared_memory
+
+BLOCK_SIZE = 50000
+
+
+def split_blocks(num_values, block_size=BLOCK_SIZE):
+    """ Return (start, stop) row ranges covering `num_values` rows
+
+        Arguments:
+            num_values (int): number of values to split
+
+        Kwargs:
+            block_size (int): rows per block (default: `BLOCK_SIZE`)
+
+        Returns:
+            list of tuples
+    """
+    return [(start, min(start + block_size, num_values))
+            for start in range(0, num_values, block_size)]
+
+
+@contextmanager
+def shared_values(values):
+    """ Put numeric numpy values in shared memory so worker processes
+        can read their block without the values being pickled.
+
+        Other values (lists, object or string arrays) are passed as is.
+
+        Arguments:
+            values (list or np.ndarray): values to share
+
+        Yields:
+            values or a (name, dtype, length) descriptor of the shared block
+    """
+    if not HAS_NUMPY or not isinstance(values, np.ndarray) or \
+            values.dtype.kind not in 'biuf' or not values.nbytes:
+        yield values
+        return
+    shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    try:
+        buffer = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+        buffer[:] = values
+        del buffer
+        yield (shm.name, values.dtype.str, len(values))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def read_block(values, start, stop):
+    """ Return values[start:stop] from values or a shared memory descriptor
+    """
+    if not isinstance(values, tuple):
+        return values[start:stop]
+    name, dtype, length = values
+    shm = shared_memory.SharedMemory(name=name)
+    block = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+    new_block = block[start:stop].copy()
+    del block
+    shm.close()
+    return new_block
+
+
+def transform_block(function, batch_func, values, start, stop, seed_seq):
+    """ Transform one block of column values (run in a worker process)
+
+        Arguments:
+            function   (func): function to apply to each value
+            batch_func (func): batch version of function (or None)
+            values     (list, np.ndarray or tuple): column values or
+                               shared memory descriptor
+            start       (int): first row of the block
+            stop        (int): row after the last row of the block
+            seed_seq (`numpy.random.SeedSequence`): random stream
+                               for this block
+
+        Returns:
+            list or np.ndarray of new values (an object array if
+            the new values of a numpy block are not all numbers)
+    """
+    block = read_block(values, start, stop)
+    if batch_func is not None:
+        return batch_func(block, rng=numpy_rng(seed_seq))
+    if accepts_rng(function):
+        function = partial(function, rng=python_rng(seed_seq))
+    new_values = [function(val) for val in block]
+    if HAS_NUMPY and isinstance(block, np.ndarray):
+        if all(isinstance(val, Number) for val in new_values):
+            return np.asarray(new_values)
+        # np.asarray would turn mixed strings and numbers into strings
+        array = np.empty(len(new_values), dtype=object)
+        array[:] = new_values
+        return array
+    return new_values
+
+
+def guarded_block(errors, *job):
+    """ Run `transform_block(*job)`, returning any exception of the
+        types in `errors` instead of raising it """
+    try:
+        return transform_block(*job)
+    except errors as exc:
+        return exc
+
+
+def run_blocks(jobs, workers, errors=()):
+    """ Run `transform_block` jobs, in a process pool if `workers` > 1
+
+        Arguments:
+            jobs (list of tuples): `transform_block` arguments
+            workers         (int): number of worker processes
+
+        Kwargs:
+            errors (tuple): exception types to return in place of the
+                            result of the job which raised them (so one
+                            failing job does not stop the others)
+
+        Returns:
+            list of results, in the same order as `jobs`
+    """
+    function = partial(guarded_block, errors) if errors else transform_block
+    if workers <= 1:
+        return [function(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def imap_ordered(function, jobs, workers, initializer=None, initargs=()):
+    """ Lazily run `function(*job)` for each job in a process pool
+
+        Results are yielded in the same order as `jobs`. At most
+        two jobs per worker are pending at once, so results are
+        not held in memory faster than they are consumed.
+
+        Arguments:
+            function (func): module level function to run
+            jobs   (iterable of tuples): function arguments
+            workers   (int): number of worker processes
+
+        Kwargs:
+            initializer (func): run once in each worker process
+            initargs   (tuple): arguments for initializer
+
+        Yields:
+            function results
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(function, *job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
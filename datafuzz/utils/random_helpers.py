@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for seeded random number generation.
+
+Every DataSet, strategy and generator owns a `numpy.random.SeedSequence`.
+Independent child streams are spawned from it (per strategy, per column
+and per block of rows), so the same seed always gives the same output,
+whichever process ends up drawing the numbers.
+
+Without numpy, a `SeedStream` stands in for the `SeedSequence` and
+`numpy_rng` returns a `random.Random`, so list data can still be
+sampled and generated from a seed.
+"""
+import hashlib
+import inspect
+import random
+from datafuzz.settings import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+class SeedStream(object):
+    """ Pure Python stand-in for `numpy.random.SeedSequence`
+        (used when numpy is not installed)
+
+        Children are spawned the same way: each child adds its
+        position to the spawn key of its parent, so streams are
+        independent and reproducible.
+
+        Kwargs:
+            entropy     (int): seed (None draws fresh entropy from the OS)
+            spawn_key (tuple): position of the stream in the spawn tree
+
+        Attributes:
+            entropy            (int): seed
+            spawn_key        (tuple): position in the spawn tree
+            n_children_spawned (int): number of children spawned so far
+    """
+
+    def __init__(self, entropy=None, spawn_key=()):
+        if entropy is None:
+            entropy = random.SystemRandom().getrandbits(128)
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+
+    def spawn(self, n_children):
+        """ Return a list of `n_children` new independent streams """
+        start = self.n_children_spawned
+        self.n_children_spawned += n_children
+        return [SeedStream(self.entropy, self.spawn_key + (idx,))
+                for idx in range(start, start + n_children)]
+
+    def generate_state(self, n_words):
+        """ Return a list of `n_words` 32 bit integers for this stream """
+        words = []
+        block = 0
+        while len(words) < n_words:
+            digest = hashlib.sha256(repr(
+                (self.entropy, self.spawn_key, block)).encode()).digest()
+            words.extend(int.from_bytes(digest[idx:idx + 4], 'little')
+                         for idx in range(0, len(digest), 4))
+            block += 1
+        return words[:n_words]
+
+
+def seed_sequence(seed=None):
+    """ Return a `numpy.random.SeedSequence` for the given seed
+
+        Arguments:
+            seed (int, SeedSequence or None): seed to use
+                                  (None draws fresh entropy from the OS)
+
+        Returns:
+            `numpy.random.SeedSequence` (a `SeedStream` if numpy
+            is not installed)
+    """
+    if not HAS_NUMPY:
+        return seed if isinstance(seed, SeedStream) else SeedStream(seed)
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def numpy_rng(seed_seq):
+    """ Return a `numpy.random.Generator` drawing from `seed_seq`
+        (a `random.Random` if numpy is not installed) """
+    if not HAS_NUMPY:
+        return python_rng(seed_seq)
+    return np.random.default_rng(seed_seq)
+
+
+def python_rng(seed_seq):
+    """ Return a `random.Random` instance drawing from `seed_seq` """
+    if not HAS_NUMPY:
+        return random.Random(sum(word << (32 * idx) for idx, word in
+                                 enumerate(seed_seq.generate_state(8))))
+    state = seed_seq.generate_state(4, dtype=np.uint64)
+    return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+
+def accepts_rng(function):
+    """ Return True if `function` takes an `rng` keyword argument
+
+        Helpers in `datafuzz.utils` take `rng`; plain lambdas or
+        builtins do not, and will use the global `random` module.
+    """
+    try:
+        return 'rng' in inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
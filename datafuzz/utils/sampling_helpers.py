@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for sampling rows without replacement.
+
+Row indexes are drawn as sorted numpy arrays, never as Python lists
+of every row number. The method depends on the share of rows drawn:
+
+    - few rows (at most 1 in `FLOYD_CUTOFF`): Floyd's algorithm
+      (`numpy.random.Generator.choice`), which only allocates the sample
+    - almost all rows: the rows to leave out are drawn with Floyd's
+      algorithm and the rest are taken from a boolean mask of every row
+      (one byte per row, an eighth of the indexes returned)
+    - anything in between: a Bernoulli mask drawn `BLOCK_ROWS` rows at a
+      time, corrected to the exact sample size
+
+so apart from that mask, memory use stays proportional to the sample,
+not to the dataset.
+
+Without numpy, indexes are drawn with `random.Random.sample` and
+returned as a sorted list.
+"""
+from datafuzz.settings import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+FLOYD_CUTOFF = 50
+BLOCK_ROWS = 2 ** 20
+OVERSAMPLE_SD = 6
+
+
+def bernoulli_indexes(rng, num_rows, fraction):
+    """ Return the indexes of rows kept by a Bernoulli mask
+        (each row is kept with probability `fraction`)
+
+        The mask is drawn `BLOCK_ROWS` rows at a time, so only
+        one block of random numbers is held in memory.
+
+        Arguments:
+            rng (`numpy.random.Generator`): generator to draw from
+            num_rows (int): number of rows
+            fraction (float): probability of keeping each row
+
+        Returns:
+            sorted `numpy.ndarray` of row indexes
+    """
+    blocks = [np.flatnonzero(rng.random(min(BLOCK_ROWS, num_rows - start))
+                             < fraction) + start
+              for start in range(0, num_rows, BLOCK_ROWS)]
+    if not blocks:
+        return np.array([], dtype=np.intp)
+    return np.concatenate(blocks)
+
+
+def sample_indexes(rng, num_rows, size):
+    """ Return `size` unique row indexes drawn uniformly at random
+
+        Arguments:
+            rng (`numpy.random.Generator`): generator to draw from
+                                            (`random.Random` without numpy)
+            num_rows (int): number of rows to draw from
+            size     (int): number of rows to draw (at most `num_rows`)
+
+        Returns:
+            sorted `numpy.ndarray` of row indexes
+            (a sorted list if numpy is not installed)
+    """
+    size = max(min(int(size), num_rows), 0)
+    if not HAS_NUMPY:
+        return sorted(rng.sample(range(num_rows), size))
+    if size * FLOYD_CUTOFF <= num_rows:
+        return np.sort(rng.choice(num_rows, size, replace=False))
+    elif (num_rows - size) * FLOYD_CUTOFF <= num_rows:
+        mask = np.ones(num_rows, dtype=bool)
+        mask[rng.choice(num_rows, num_rows - size, replace=False)] = False
+        return np.flatnonzero(mask)
+    fraction = size / num_rows
+    # Oversample by a few standard deviations, so the mask almost
+    # always keeps enough rows, and drop the extra rows at random.
+    spread = OVERSAMPLE_SD * (fraction * (1 - fraction) / num_rows) ** 0.5
+    indexes = bernoulli_indexes(rng, num_rows, min(fraction + spread, 1.0))
+    while len(indexes) < size:
+        indexes = bernoulli_indexes(rng, num_rows,
+                                    min(fraction + 2 * spread, 1.0))
+    return np.delete(indexes, rng.choice(len(indexes), len(indexes) - size,
+                                         replace=False))
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for compiling generator schemas.
+
+A schema is compiled once into a tuple of (field name, kind, values)
+field specs, where kind is one of:
+    - faker:  values is the faker provider name (i.e. 'name')
+    - range:  values is a `range`
+    - choice: values is a tuple or numpy array to choose from
+    - pool:   values is a (provider name, pool size, pool path) tuple,
+              for faker fields sampled from a pre-generated pool
+
+A field can also be a dict with the value and field options, i.e.
+{'value': 'faker.name', 'pool_size': 10000, 'pool_path': 'names.json'}
+
+`range(...)` and `arange(...)` strings are parsed without `eval`.
+Compiled specs are cached by schema content, so generators built
+from the same schema (i.e. the same YAML file) skip the parse.
+"""
+try:
+    from collections.abc import Iterable
+except ImportError:
+    from collections import Iterable
+import json
+import re
+from functools import lru_cache
+from datafuzz.settings import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+RANGE_REGEX = re.compile(r'range\((?P<start>-?\d+),(?P<stop>-?\d+)\)$')
+ARANGE_REGEX = re.compile(
+    r'arange\((?P<start>-?\d+(\.\d+)?),(?P<stop>-?\d+(\.\d+)?)\)$')
+CACHE_SIZE = 128
+
+
+def parse_number(val):
+    """ Return int or float from a number string """
+    if '.' in val:
+        return float(val)
+    return int(val)
+
+
+def compile_field(field_val):
+    """ Compile one schema value into a (kind, values) pair
+
+        Arguments:
+            field_val (obj): schema value (i.e. 'faker.name',
+                             'range(1,20)', 'arange(-5.0,5.0)', a list
+                             or a dict with `value` and field options)
+
+        Returns:
+            tuple or None (if the value can't be generated)
+    """
+    if isinstance(field_val, dict):
+        compiled = compile_field(field_val.get('value'))
+        if compiled and compiled[0] == 'faker' and \
+                field_val.get('pool_size'):
+            return ('pool', (compiled[1], int(field_val.get('pool_size')),
+                             field_val.get('pool_path')))
+        return compiled
+    if isinstance(field_val, str):
+        match = RANGE_REGEX.match(field_val)
+        if match:
+            return ('range', range(int(match.group('start')),
+                                   int(match.group('stop'))))
+        match = ARANGE_REGEX.match(field_val)
+        if match and HAS_NUMPY:
+            field_val = np.arange(parse_number(match.group('start')),
+                                  parse_number(match.group('stop')))
+            field_val.flags.writeable = False
+        elif 'faker.' in field_val:
+            return ('faker', field_val.replace('faker.', ''))
+    if isinstance(field_val, range):
+        return ('range', field_val)
+    if isinstance(field_val, Iterable):
+        if not (HAS_NUMPY and isinstance(field_val, np.ndarray)):
+            field_val = tuple(field_val)
+        return ('choice', field_val)
+    return None
+
+
+def _compile(items):
+    """ Compile (field name, value) pairs into field specs """
+    specs = []
+    for field_name, field_val in items:
+        compiled = compile_field(field_val)
+        if compiled:
+            specs.append((field_name,) + compiled)
+    return tuple(specs)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(schema_key):
+    """ Compile a JSON encoded list of schema items (cached) """
+    return _compile(json.loads(schema_key))
+
+
+def compile_schema(schema):
+    """ Compile a generator schema into field specs
+
+        Schemas which can be JSON encoded (i.e. parsed from YAML or
+        the CLI) are cached by content; others are compiled each time.
+
+        Arguments:
+            schema (dict): field names and values
+
+        Returns:
+            tuple of (field name, kind, values) tuples
+            (fields which can't be generated are skipped)
+    """
+    try:
+        schema_key = json.dumps(list(schema.items()))
+    except TypeError:
+        return _compile(schema.items())
+    return _compile_cached(schema_key)
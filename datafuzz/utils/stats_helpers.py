@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for computing column statistics (see `DataSet.column_stats`).
+
+Statistics are computed from one read of the column values: numeric
+columns are summarized with numpy, other columns in one Python loop.
+The number of distinct values is estimated with a k minimum values
+(KMV) sketch of 64 bit hashes, which is exact for columns with fewer
+than `KMV_SIZE` distinct values.
+
+Column types of list data are inferred from a sample of rows (see
+`infer_dtype`) instead of the first row only.
+"""
+from collections import Counter
+from datafuzz.settings import HAS_NUMPY, HAS_PANDAS
+
+if HAS_NUMPY:
+    import numpy as np
+
+if HAS_PANDAS:
+    import pandas as pd
+
+KMV_SIZE = 1024
+HASH_RANGE = 2 ** 64
+DTYPE_SAMPLE = 100
+
+
+def sample_positions(num_rows, sample_size=DTYPE_SAMPLE):
+    """ Return evenly spaced row positions to infer column types from
+        (always including the first row)
+
+        Arguments:
+            num_rows (int): number of rows
+
+        Kwargs:
+            sample_size (int): maximum number of rows to sample
+
+        Returns:
+            range
+    """
+    step = max(num_rows // max(sample_size, 1), 1)
+    return range(0, num_rows, step)[:sample_size]
+
+
+def value_type(value):
+    """ Return the type of a value (None for None and NaN values) """
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return type(value)
+
+
+def infer_dtype(types):
+    """ Infer a column type from the types of sampled values
+
+        The most common type wins, so a few null or fuzzed values
+        don't change the type of a column. Integers count as floats
+        if the sample has both (like pandas).
+
+        Arguments:
+            types (iterable): value types (see `value_type`)
+
+        Returns:
+            type (NoneType if all sampled values are null)
+    """
+    counts = Counter(dtype for dtype in types if dtype is not None)
+    if int in counts and float in counts:
+        counts[float] += counts.pop(int)
+    if not counts:
+        return type(None)
+    return counts.most_common(1)[0][0]
+
+
+def mix_hashes(hashes):
+    """ Spread 64 bit hashes evenly over the uint64 range
+        (the splitmix64 finalizer)
+
+        Arguments:
+            hashes (`numpy.ndarray`): uint64 hashes
+
+        Returns:
+            `numpy.ndarray` of uint64
+    """
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xbf58476d1ce4e5b9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94d049bb133111eb)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def estimate_distinct(values):
+    """ Estimate the number of distinct values
+
+        Arguments:
+            values (list or `numpy.ndarray`): non-null column values
+
+        Returns:
+            int (or None if the values can't be hashed)
+    """
+    try:
+        if not HAS_NUMPY:
+            return len(set(values))
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'biufmM':
+            if values.dtype.itemsize != 8:
+                values = values.astype(
+                    np.float64 if values.dtype.kind == 'f' else np.int64)
+            hashes = values.view(np.uint64)
+        else:
+            hashes = np.fromiter((hash(val) for val in values),
+                                 dtype=np.int64,
+                                 count=len(values)).view(np.uint64)
+    except TypeError:
+        return None
+    hashes = mix_hashes(hashes)
+    cutoff = HASH_RANGE * KMV_SIZE // max(len(hashes), 1)
+    while True:
+        if cutoff >= HASH_RANGE - 1:
+            return len(np.unique(hashes))
+        smallest = np.unique(hashes[hashes <= np.uint64(cutoff)])
+        if len(smallest) >= KMV_SIZE:
+            return int((KMV_SIZE - 1) * HASH_RANGE /
+                       (int(smallest[KMV_SIZE - 1]) + 1))
+        cutoff *= 4
+
+
+def value_range(values, dtype):
+    """ Return the min and max of values
+
+        If the values can't be compared (i.e. a few fuzzed strings in
+        a numeric column), only the values of the column type are used.
+
+        Arguments:
+            values (list): non-null values
+            dtype (obj): column dtype
+
+        Returns:
+            tuple of (min, max), (None, None) if there are no values
+            or they can't be compared
+    """
+    try:
+        if values:
+            return min(values), max(values)
+    except TypeError:
+        if dtype in (int, float):
+            dtype = (int, float)
+        elif not isinstance(dtype, type):
+            return None, None
+        values = [val for val in values if isinstance(val, dtype)]
+        return value_range(values, None)
+    return None, None
+
+
+def column_stats(values, dtype):
+    """ Compute statistics for one column
+
+        Arguments:
+            values (list, `array.array`, `numpy.ndarray` or
+                    `pandas.Series`): column values
+            dtype (obj): column dtype (see `DataSet.column_dtype`)
+
+        Returns:
+            dict with min and max (of the non-null values, None if they
+            can't be compared), nulls (count of None and NaN values),
+            dtype and distinct (estimated number of distinct non-null
+            values, see `estimate_distinct`)
+    """
+    if HAS_PANDAS and isinstance(values, pd.Series):
+        values = values.to_numpy(dtype=object) \
+            if values.dtype.kind in 'mM' else values.to_numpy()
+    elif HAS_NUMPY and not isinstance(values, (list, np.ndarray)):
+        values = np.asarray(values)
+    if HAS_NUMPY and isinstance(values, np.ndarray) and \
+            values.dtype.kind in 'biuf':
+        valid = values[~np.isnan(values)] if values.dtype.kind == 'f' \
+            else values
+        minimum = maximum = None
+        if valid.size:
+            minimum, maximum = valid.min(), valid.max()
+    else:
+        valid = [val for val in values if val is not None and val == val]
+        minimum, maximum = value_range(valid, dtype)
+    return {'min': minimum, 'max': maximum,
+            'nulls': len(values) - len(valid), 'dtype': dtype,
+            'distinct': estimate_distinct(valid)}
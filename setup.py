@@ -23,6 +23,7 @@ setup_requirements = [
 test_requirements = [
     'numpy',
     'pandas',
+    'pyarrow',
     'pytest',
     'pytest-coverage',
     'pylint',
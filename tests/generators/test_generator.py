@@ -1,6 +1,7 @@
 import pytest
 import os
 import pandas as pd
+from datetime import datetime, timezone
 
 from datafuzz.generators import DatasetGenerator
 from datafuzz.parsers import SchemaYAMLParser
@@ -61,3 +62,119 @@ def test_to_output(input_parser):
         assert isinstance(output, pd.DataFrame)
     elif ds_generator.output.startswith('file'):
         assert os.path.exists(output)
+
+
+def test_generate_seed():
+    schema = {'schema': {'name': 'faker.name', 'num': 'range(0,100)'},
+              'output': 'list', 'num_rows': 10, 'seed': 4}
+    first = DatasetGenerator(dict(schema))
+    first.generate()
+    second = DatasetGenerator(dict(schema))
+    second.generate()
+    assert first.records == second.records
+
+
+def test_generate_columns():
+    schema = {'schema': {'name': 'faker.name', 'num': 'range(0,10)',
+                         'amount': 'arange(-5.0,5.0)', 'kind': ['a', 'b']},
+              'output': 'list', 'num_rows': 250}
+    ds_generator = DatasetGenerator(schema)
+    assert [name for name, _ in ds_generator.plan] == \
+        ['name', 'num', 'amount', 'kind']
+    columns = ds_generator.generate_columns(50)
+    assert all(len(values) == 50 for values in columns.values())
+    assert all(type(val) is int and 0 <= val < 10 for val in columns['num'])
+    assert all(type(val) is float for val in columns['amount'])
+    assert set(columns['kind']) <= {'a', 'b'}
+    ds_generator.BATCH_SIZE = 100
+    ds_generator.generate()
+    assert len(ds_generator.records) == 250
+    assert list(ds_generator.records[0].keys()) == \
+        ['name', 'num', 'amount', 'kind']
+
+
+def test_generate_workers():
+    schema = {'schema': {'name': 'faker.name', 'num': 'range(0,100)'},
+              'output': 'list', 'num_rows': 50, 'seed': 8}
+    outputs = []
+    for workers in [1, 2]:
+        ds_generator = DatasetGenerator(dict(schema, workers=workers))
+        ds_generator.BATCH_SIZE = 7
+        ds_generator.generate()
+        outputs.append(ds_generator.records)
+    assert len(outputs[0]) == 50
+    assert outputs[0] == outputs[1]
+
+
+def test_generate_from_parser_workers():
+    from datafuzz.parsers.helpers import generate_from_parser
+    output = generate_from_parser({
+        'schema': {'name': 'faker.name', 'num': 'range(0,100)'},
+        'output': 'pandas', 'num_rows': 20, 'workers': 2})
+    assert isinstance(output, pd.DataFrame)
+    assert output.shape == (20, 2)
+
+
+def test_generate_pool(tmp_path):
+    pool_path = str(tmp_path / 'names.json')
+    schema = {'schema': {'name': {'value': 'faker.name', 'pool_size': 5,
+                                  'pool_path': pool_path}},
+              'output': 'list', 'num_rows': 100}
+    ds_generator = DatasetGenerator(schema)
+    ds_generator.generate()
+    pool = ds_generator.pools['name'].tolist()
+    assert len(pool) == 5
+    assert set(row['name'] for row in ds_generator.records) <= set(pool)
+    assert os.path.exists(pool_path)
+
+    reloaded = DatasetGenerator(schema)
+    assert reloaded.pools['name'].tolist() == pool
+
+
+def test_iter_batches():
+    schema = {'schema': {'num': 'range(0,100)'}, 'output': 'list',
+              'num_rows': 25}
+    ds_generator = DatasetGenerator(schema)
+    batches = list(ds_generator.iter_batches(batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert ds_generator.records == []
+    assert len(list(ds_generator.iter_rows())) == 25
+
+
+def test_iter_rows_unbounded():
+    from itertools import islice
+    ds_generator = DatasetGenerator({'schema': {'num': 'range(0,100)'},
+                                     'output': 'list', 'num_rows': None})
+    rows = list(islice(ds_generator.iter_rows(batch_size=3), 10))
+    assert len(rows) == 10
+
+
+def test_iter_batches_timeseries():
+    ds_generator = DatasetGenerator({
+        'schema': {'num': 'range(0,100)'}, 'output': 'list',
+        'num_rows': 100, 'start_time': datetime(2017, 1, 1),
+        'end_time': datetime(2017, 1, 2), 'increments': 'hours'})
+    rows = list(ds_generator.iter_rows(batch_size=4))
+    timestamps = [row['timestamp'] for row in rows]
+    assert timestamps == sorted(timestamps)
+    assert timestamps[0] == '2017-01-01T00:00:00'
+    assert timestamps[-1] < '2017-01-02T00:00:00'
+
+
+@pytest.mark.parametrize('start_time', [
+    datetime(2017, 1, 1, 3, 4, 5),
+    datetime(2017, 1, 1, 3, 4, 5, 120),
+    datetime(2017, 1, 1, tzinfo=timezone.utc),
+])
+def test_iter_timestamp_batches(start_time):
+    ds_generator = DatasetGenerator({
+        'schema': {}, 'output': 'list', 'num_rows': 25,
+        'start_time': start_time, 'increments': 'random'})
+    batches = list(ds_generator.iter_timestamp_batches(batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    timestamps = [datetime.fromisoformat(ts)
+                  for batch in batches for ts in batch]
+    assert timestamps[0] == start_time
+    assert batches[0][0] == start_time.isoformat()
+    assert all(later > earlier for earlier, later in
+               zip(timestamps, timestamps[1:]))
@@ -0,0 +1,136 @@
+import pytest
+
+from datafuzz.dataset import DataSet
+from datafuzz.output import chunks_to_output
+from datafuzz.parsers.helpers import run_strategies
+
+pa = pytest.importorskip('pyarrow')
+feather = pytest.importorskip('pyarrow.feather')
+pq = pytest.importorskip('pyarrow.parquet')
+pd = pytest.importorskip('pandas')
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'id': range(100),
+                         'name': ['name {}'.format(i) for i in range(100)],
+                         'price': [float(i) for i in range(100)]})
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'arrow', 'feather'])
+@pytest.mark.parametrize('kwargs', [{}, {'pandas': False}])
+def test_arrow_roundtrip(tmp_path, frame, extension, kwargs):
+    input_file = tmp_path / 'input.{}'.format(extension)
+    output_file = tmp_path / 'output.{}'.format(extension)
+    if extension == 'parquet':
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False),
+                       input_file)
+    else:
+        feather.write_feather(frame, input_file)
+
+    data = DataSet('file://{}'.format(input_file),
+                   output='file://{}'.format(output_file), **kwargs)
+    assert len(data) == 100
+    assert data.passthrough is None
+    data.to_output()
+
+    if extension == 'parquet':
+        table = pq.read_table(output_file)
+    else:
+        table = feather.read_table(output_file)
+    assert table.column_names == ['id', 'name', 'price']
+    assert table.column('name').to_pylist() == list(frame['name'])
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'pandas': False}])
+def test_arrow_column_projection(tmp_path, frame, kwargs):
+    input_file = tmp_path / 'input.parquet'
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False),
+                   input_file)
+
+    data = DataSet('file://{}'.format(input_file), columns=['price'],
+                   output='file://{}'.format(tmp_path / 'out.parquet'),
+                   **kwargs)
+    if data.data_type == 'pandas':
+        assert list(data.records.columns) == ['price']
+    else:
+        assert list(data.records[0].keys()) == ['price']
+    assert data.passthrough.column_names == ['id', 'name']
+
+    data.to_output()
+    table = pq.read_table(tmp_path / 'out.parquet')
+    assert table.column_names == ['id', 'name', 'price']
+    assert table.column('id').to_pylist() == list(range(100))
+
+    merged = DataSet('file://{}'.format(input_file), columns=['price'],
+                     **kwargs).to_output()
+    if isinstance(merged, pd.DataFrame):
+        assert list(merged.columns) == ['id', 'name', 'price']
+    else:
+        assert list(merged[0].keys()) == ['id', 'name', 'price']
+
+
+def test_arrow_chunks_row_groups(tmp_path, frame):
+    input_file = tmp_path / 'input.parquet'
+    output_file = tmp_path / 'output.parquet'
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False),
+                   input_file)
+
+    data = DataSet('file://{}'.format(input_file), columns=['price'],
+                   output='file://{}'.format(output_file), chunksize=30,
+                   seed=5)
+
+    def fuzzed_chunks():
+        for chunk in data.iter_chunks():
+            assert len(chunk) <= 30
+            run_strategies([{'type': 'fuzz', 'percentage': 20,
+                             'columns': ['price']}], chunk)
+            yield chunk
+
+    chunks_to_output(fuzzed_chunks())
+    parquet_file = pq.ParquetFile(output_file)
+    assert parquet_file.num_row_groups == 4
+    table = parquet_file.read()
+    assert table.num_rows == 100
+    assert table.column('name').to_pylist() == list(frame['name'])
+
+
+def test_arrow_projection_rows_changed(tmp_path, frame):
+    input_file = tmp_path / 'input.arrow'
+    feather.write_feather(frame, input_file)
+    data = DataSet('file://{}'.format(input_file), columns=['price'],
+                   output='file://{}'.format(tmp_path / 'out.arrow'))
+    data.append([{'price': 1.0}])
+    with pytest.raises(Exception):
+        data.to_output()
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'arrow'])
+def test_arrow_chunks_mixed_later(tmp_path, extension):
+    output = 'file://{}'.format(tmp_path / 'output.{}'.format(extension))
+    chunks = [DataSet([{'a': 1, 'b': 1.5}, {'a': 2, 'b': None}],
+                      output=output, pandas=False),
+              DataSet([{'a': 'x', 'b': 2.5}, {'a': 3, 'b': 'y'}],
+                      output=output, pandas=False),
+              DataSet([{'a': 4, 'b': 3.5}], output=output, pandas=False)]
+    chunks_to_output(iter(chunks))
+    if extension == 'parquet':
+        table = pq.read_table(output[len('file://'):])
+    else:
+        table = feather.read_table(output[len('file://'):])
+    assert table.column('a').to_pylist() == ['1', '2', 'x', '3', '4']
+    assert table.column('b').to_pylist() == ['1.5', None, '2.5', 'y', '3.5']
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'arrow'])
+def test_arrow_output_header(tmp_path, extension):
+    filename = tmp_path / 'output.{}'.format(extension)
+    data = DataSet('file://tests/data/test_csv.csv', csv_engine='rows',
+                   output='file://{}'.format(filename), chunksize=2)
+    chunks_to_output(data.iter_chunks())
+    if extension == 'parquet':
+        table = pq.read_table(filename)
+    else:
+        table = feather.read_table(filename)
+    assert table.column_names == ['my_str', 'my_int', 'my_float']
+    assert table.column('my_int').to_pylist()[:2] == ['12', '13']
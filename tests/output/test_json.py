@@ -0,0 +1,60 @@
+import json
+import numpy as np
+import pytest
+
+from datafuzz.dataset import DataSet
+from datafuzz.output import core, chunks_to_output
+from datafuzz.output.core import JSONOutput, dump_json
+
+RECORDS = [{'a': i, 'b': 'row {}'.format(i)} for i in range(25)]
+
+
+@pytest.mark.parametrize('kwargs', [{'pandas': False}, {}])
+@pytest.mark.parametrize('chunksize', [None, 10])
+def test_output_json_records(tmp_path, kwargs, chunksize):
+    filename = str(tmp_path / 'output.json')
+    data = DataSet(RECORDS, **kwargs)
+    output = JSONOutput(data, filename=filename, chunksize=chunksize)
+    output.to_json()
+    with open(filename) as myf:
+        assert json.load(myf) == RECORDS
+    assert json.loads(output.dumps()) == RECORDS
+
+
+def test_output_json_append(tmp_path):
+    filename = str(tmp_path / 'output.json')
+    data = DataSet(RECORDS[:10], pandas=False)
+    JSONOutput(data, filename=filename).to_json()
+    data.records = []
+    JSONOutput(data, filename=filename, append=True).to_json()
+    data.records = RECORDS[10:]
+    JSONOutput(data, filename=filename, append=True, chunksize=4).to_json()
+    with open(filename) as myf:
+        assert json.load(myf) == RECORDS
+
+
+@pytest.mark.parametrize('has_orjson', [True, False])
+def test_dump_json(monkeypatch, has_orjson):
+    if has_orjson and not core.HAS_ORJSON:
+        pytest.skip('orjson is not installed')
+    monkeypatch.setattr(core, 'HAS_ORJSON', has_orjson)
+    assert json.loads(dump_json(np.array([[1.5, 2], [3, 4]]))) == \
+        [[1.5, 2], [3, 4]]
+    assert json.loads(dump_json(np.array([[1, 'a']], dtype=object))) == \
+        [[1, 'a']]
+    assert json.loads(dump_json([{'a': np.datetime64('2020-01-01')}]))
+    assert dump_json([{'a': 1, 'b': 'x'}]) == b'[{"a":1,"b":"x"}]'
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'chunksize': 2}])
+def test_output_json_header(tmp_path, kwargs):
+    filename = tmp_path / 'output.json'
+    data = DataSet('file://tests/data/test_csv.csv', csv_engine='rows',
+                   output='file://{}'.format(filename), **kwargs)
+    chunks_to_output(data.iter_chunks())
+    with open(filename) as myf:
+        written = json.load(myf)
+    assert written[0] == {'my_str': "'test'", 'my_int': '12',
+                          'my_float': '1.45'}
+    assert len(written) == len(DataSet('file://tests/data/test_csv.csv',
+                                       pandas=False))
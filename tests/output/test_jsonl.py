@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pytest
+
+from datafuzz.dataset import DataSet
+from datafuzz.output import chunks_to_output
+from datafuzz.output.core import JSONLinesOutput, json_lines
+
+
+def test_json_lines():
+    assert json_lines([]) == ''
+    assert json_lines([{'a': 1}, [1, 'b']]) == '{"a": 1}\n[1, "b"]\n'
+
+
+@pytest.mark.parametrize('kwargs', [{'pandas': False}, {}])
+@pytest.mark.parametrize('extension', ['jsonl', 'ndjson'])
+def test_output_jsonl(tmp_path, kwargs, extension):
+    input_obj = [{'a': i, 'b': 'row {}'.format(i)} for i in range(25)]
+    filename = tmp_path / 'output.{}'.format(extension)
+    data = DataSet(input_obj, output='file://{}'.format(filename), **kwargs)
+    output = JSONLinesOutput(data, filename=str(filename), chunksize=10)
+    assert len(list(output.iter_lines())) == 3
+    output.to_jsonl()
+    with open(filename) as myf:
+        assert [json.loads(line) for line in myf] == input_obj
+
+
+def test_output_jsonl_numpy(tmp_path):
+    filename = tmp_path / 'output.jsonl'
+    DataSet(np.array([[1, 2], [3, 4]]),
+            output='file://{}'.format(filename)).to_output()
+    with open(filename) as myf:
+        assert myf.read() == '[1, 2]\n[3, 4]\n'
+
+
+@pytest.mark.parametrize('kwargs', [{'pandas': False}, {}])
+def test_jsonl_chunks(tmp_path, kwargs):
+    input_obj = [{'a': i, 'b': 'row {}'.format(i)} for i in range(25)]
+    input_file = tmp_path / 'input.jsonl'
+    output_file = tmp_path / 'output.jsonl'
+    with open(input_file, 'w') as myf:
+        myf.write(json_lines(input_obj))
+
+    data = DataSet('file://{}'.format(input_file),
+                   output='file://{}'.format(output_file), chunksize=10,
+                   **kwargs)
+    assert len(data) == 10
+    chunks_to_output(data.iter_chunks())
+    with open(output_file) as myf:
+        assert [json.loads(line) for line in myf] == input_obj
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'chunksize': 2}])
+def test_output_jsonl_header(tmp_path, kwargs):
+    filename = tmp_path / 'output.jsonl'
+    data = DataSet('file://tests/data/test_csv.csv', csv_engine='rows',
+                   output='file://{}'.format(filename), **kwargs)
+    chunks_to_output(data.iter_chunks())
+    with open(filename) as myf:
+        written = [json.loads(line) for line in myf]
+    assert written[0] == {'my_str': "'test'", 'my_int': '12',
+                          'my_float': '1.45'}
+    assert len(written) == len(DataSet('file://tests/data/test_csv.csv',
+                                       pandas=False))
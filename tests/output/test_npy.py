@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from datafuzz.dataset import DataSet
+from datafuzz.output import chunks_to_output
+from datafuzz.parsers.helpers import run_strategies
+
+NULLS = [{'type': 'noise', 'percentage': 5, 'columns': [1],
+          'noise': ['add_nulls']}]
+
+
+@pytest.fixture
+def array():
+    return np.arange(2000, dtype=float).reshape(1000, 2)
+
+
+def test_output_npy_changed_rows(tmp_path, array):
+    np.save(tmp_path / 'input.npy', array)
+    data = DataSet('file://{}'.format(tmp_path / 'input.npy'),
+                   output='file://{}'.format(tmp_path / 'output.npy'),
+                   seed=3)
+    assert isinstance(data.records, np.memmap)
+    run_strategies(NULLS, data)
+    changed = data.changed_rows()
+    assert 0 < len(changed) <= 50
+    data.to_output()
+
+    output = np.load(tmp_path / 'output.npy')
+    assert set(np.flatnonzero(np.isnan(output[:, 1]))) == set(changed)
+    assert (output[:, 0] == array[:, 0]).all()
+    # input file is never written to
+    assert (np.load(tmp_path / 'input.npy') == array).all()
+
+
+@pytest.mark.parametrize('records', [
+    [[1, 2], [3, 4]],
+    [{'a': 1, 'b': 2}, {'a': 3, 'b': 4}],
+])
+def test_output_npy(tmp_path, records):
+    filename = tmp_path / 'output.npy'
+    data = DataSet(records, output='file://{}'.format(filename))
+    data.to_output()
+    assert np.load(filename).tolist() == [[1, 2], [3, 4]]
+
+
+def test_output_npy_chunks(tmp_path, array):
+    np.save(tmp_path / 'input.npy', array)
+    data = DataSet('file://{}'.format(tmp_path / 'input.npy'),
+                   output='file://{}'.format(tmp_path / 'output.npy'),
+                   chunksize=300, seed=3)
+
+    def fuzzed_chunks():
+        for chunk in data.iter_chunks():
+            assert len(chunk) <= 300
+            run_strategies(NULLS, chunk)
+            yield chunk
+
+    chunks_to_output(fuzzed_chunks())
+    output = np.load(tmp_path / 'output.npy')
+    assert output.shape == array.shape
+    assert (output[:, 0] == array[:, 0]).all()
+    assert np.isnan(output[:, 1]).any()
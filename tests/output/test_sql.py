@@ -3,6 +3,7 @@ import pytest
 import dataset as dataset_db
 
 from datafuzz.dataset import DataSet
+from datafuzz.utils.db_helpers import connect, close_connections
 
 @pytest.mark.parametrize('input_obj,kwargs',[
     ([{'a': 1, 'b': 2, 'c': 3},
@@ -24,6 +25,90 @@ def test_output_sql(input_obj, kwargs):
     # removing id
     assert sorted(list(rows[0].values())[1:]) == sorted(list(input_obj[0].values()))
 
+    db.close()
+    close_connections(kwargs.get('db_uri'))
     if os.path.exists(kwargs.get('db_uri').replace('sqlite:///', '')):
         os.remove(kwargs.get('db_uri').replace('sqlite:///', ''))
 
+
+@pytest.mark.parametrize('kwargs', [{'pandas': False}, {}])
+def test_output_sql_chunked(tmp_path, kwargs):
+    from datafuzz.output.core import SQLOutput
+    db_uri = 'sqlite:///{}'.format(tmp_path / 'chunked.db')
+    input_obj = [{'a': i, 'b': str(i)} for i in range(25)]
+    data = DataSet(input_obj, output='sql', db_uri=db_uri, table='test',
+                   **kwargs)
+    output = SQLOutput(data, db_uri=db_uri, table='test', chunksize=10)
+    assert output.to_sql() == 25
+    assert output.progress['chunks'] == 3
+    assert output.progress['rows'] == 25
+
+    db = dataset_db.connect(db_uri)
+    rows = list(db.query('select a, b from test order by a;'))
+    assert [row['a'] for row in rows] == list(range(25))
+    db.close()
+
+
+def test_output_sql_shared_connection(tmp_path):
+    from datafuzz.output.core import SQLOutput
+    db_uri = 'sqlite:///{}'.format(tmp_path / 'shared.db')
+    data = DataSet([{'a': 1}, {'a': 2}], output='sql', db_uri=db_uri,
+                   table='test', pandas=False)
+    output = SQLOutput(data, db_uri=db_uri, table='test')
+    assert data.db is connect(db_uri)
+    assert output.db is data.db
+    output.to_sql()
+
+    read = DataSet('sql', db_uri=db_uri, query='select a from test',
+                   pandas=False)
+    assert read.db is data.db
+    assert [row['a'] for row in read.records] == [1, 2]
+
+    close_connections(db_uri)
+    assert connect(db_uri) is not data.db
+    close_connections()
+
+
+@pytest.mark.parametrize('kwargs', [{'pandas': False},
+                                    {'sql_method': 'multi'}])
+def test_output_sql_chunksize_setting(tmp_path, kwargs):
+    db_uri = 'sqlite:///{}'.format(tmp_path / 'setting.db')
+    data = DataSet([{'a': i} for i in range(25)], output='sql',
+                   db_uri=db_uri, table='test', sql_chunksize=10, **kwargs)
+    assert data.to_output() == 25
+
+    db = dataset_db.connect(db_uri)
+    assert [row['a'] for row in db.query('select a from test order by a')] \
+        == list(range(25))
+    db.close()
+    close_connections(db_uri)
+
+
+def test_generator_output_sql_chunked(tmp_path):
+    from datafuzz.generators import DatasetGenerator
+    from datafuzz.output import chunks_to_output
+    db_uri = 'sqlite:///{}'.format(tmp_path / 'generated.db')
+    generator = DatasetGenerator({
+        'schema': {'num': 'range(0,10)'}, 'output': 'sql', 'num_rows': 25,
+        'db_uri': db_uri, 'table': 'test', 'sql_chunksize': 10})
+    generator.BATCH_SIZE = 10
+    assert chunks_to_output(generator.iter_chunks()) == 25
+
+    db = dataset_db.connect(db_uri)
+    assert len(list(db.query('select num from test'))) == 25
+    db.close()
+    close_connections(db_uri)
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'sql_chunksize': 2}])
+def test_output_sql_header(tmp_path, kwargs):
+    db_uri = 'sqlite:///{}'.format(tmp_path / 'header.db')
+    data = DataSet('file://tests/data/test_csv.csv', csv_engine='rows',
+                   output='sql', db_uri=db_uri, table='test', **kwargs)
+    assert data.to_output() == len(data)
+
+    db = dataset_db.connect(db_uri)
+    rows = list(db.query('select my_str, my_int, my_float from test'))
+    assert [tuple(row.values()) for row in rows] == data.records
+    db.close()
+    close_connections(db_uri)
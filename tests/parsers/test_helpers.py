@@ -1,7 +1,8 @@
 import pytest
 import numpy as np
 
-from datafuzz.parsers.helpers import build_strategy, fuzz_from_parser, generate_from_parser
+from datafuzz.parsers.helpers import build_strategy, fuzz_from_parser, \
+    generate_from_parser, projected_columns
 from datafuzz.parsers.core import StrategyYAMLParser, SchemaYAMLParser, StrategyCLIParser, SchemaCLIParser
 from datafuzz.fuzz import Fuzzer
 from datafuzz.noise import NoiseMaker
@@ -31,3 +32,41 @@ def test_build_strategy(input_dict,output,percent,cols):
     assert strategy_obj.percentage == percent
     if cols:
         assert len(strategy_obj.columns) == cols
+
+
+def test_fuzz_from_parser_chunks():
+    parser = StrategyCLIParser(
+        input='file://tests/data/test_csv.csv',
+        output='file:///tmp/test_fuzz_chunks.csv', chunksize=2,
+        strategies=[{'type': 'noise', 'percentage': 50,
+                     'noise': ['add_nulls']},
+                    {'type': 'dupe', 'percentage': 50}])
+    output = fuzz_from_parser(parser)
+    assert output == '/tmp/test_fuzz_chunks.csv'
+    # 50% of 3 rows: the rounding remainder of the first chunk (2 rows)
+    # carries over, so 2 rows are duplicated in total
+    assert len(DataSet('file://' + output)) == 5
+
+
+def test_fuzz_from_parser_chunks_percentage(tmpdir):
+    input_file = tmpdir.join('input.csv')
+    input_file.write('a,b\n' + ''.join('{},{}\n'.format(idx, idx * 2)
+                                        for idx in range(10)))
+    parser = StrategyCLIParser(
+        input='file://{}'.format(input_file),
+        output='file://{}'.format(tmpdir.join('output.csv')), chunksize=3,
+        strategies=[{'type': 'dupe', 'percentage': 25}])
+    output = fuzz_from_parser(parser)
+    # per chunk rounding would give 1 + 1 + 1 + 0 duplicates
+    assert len(DataSet('file://' + output)) == 12
+
+
+@pytest.mark.parametrize('strategies,columns', [
+    ([{'type': 'fuzz', 'columns': ['a', 'b']},
+      {'type': 'noise', 'columns': ['b', 'c']}], ['a', 'b', 'c']),
+    ([{'type': 'fuzz', 'columns': ['a']}, {'type': 'noise'}], None),
+    ([{'type': 'fuzz', 'columns': [0, 1]}], None),
+    ([{'type': 'duplicate', 'columns': ['a']}], None),
+])
+def test_projected_columns(strategies, columns):
+    assert projected_columns(strategies) == columns
@@ -50,3 +50,33 @@ def test_strategy_cli():
     assert isinstance(strategy_cli.strategies, list)
     assert isinstance(strategy_cli.strategies[0], dict)
     assert sorted(list(strategy_cli.strategies[0].keys())) == ['noise', 'percentage', 'type']
+
+
+def test_strategy_cli_csv_engine():
+    strategy_cli = StrategyCLIParser()
+    strategy_cli.parse_args(['run', '-s', json.dumps({'type': 'fuzz',
+                                                      'percentage': 50}),
+                             '-i', 'file:///itest.csv',
+                             '-o', 'file:///otest.csv',
+                             '--csv_engine', 'rows', '--columnar'])
+    assert strategy_cli.csv_engine == 'rows'
+    assert strategy_cli.columnar is True
+
+
+def test_sql_output_settings_cli():
+    strategy_cli = StrategyCLIParser()
+    strategy_cli.parse_args(['run', '-s', json.dumps({'type': 'fuzz',
+                                                      'percentage': 50}),
+                             '-i', 'file:///itest.csv', '-o', 'sql',
+                             '--sql_chunksize', '500',
+                             '--sql_method', 'multi'])
+    assert strategy_cli.sql_chunksize == 500
+    assert strategy_cli.sql_method == 'multi'
+
+    gen_cli = SchemaCLIParser()
+    gen_cli.parse_args(['generate', '-f', 'num', '-v', 'range(0,9)',
+                        '-o', 'sql', '-n', '10', '--table', 'test',
+                        '--sql_chunksize', '5'])
+    assert gen_cli.table == 'test'
+    assert gen_cli.sql_chunksize == 5
+    assert gen_cli.sql_method is None
@@ -1,4 +1,6 @@
 import argparse
+import subprocess
+import sys
 import pytest
 
 from datafuzz.parsers.core import SchemaYAMLParser, StrategyYAMLParser
@@ -28,3 +30,11 @@ def test_yaml_parser(ptype, fn, inst):
 def test_main():
     # TODO: how to test prints? mock?
     main(['run', 'datafuzz/examples/yaml_files/read_csv_and_dupe.yaml'])
+
+
+def test_serve_module_entry_point():
+    result = subprocess.run(
+        [sys.executable, '-m', 'datafuzz.cli', 'serve', '--help'],
+        capture_output=True, text=True)
+    assert result.returncode == 0
+    assert '--framing' in result.stdout
@@ -4,15 +4,26 @@ except ImportError:
     from collections import Iterable
 
 import os
+import json
 import pytest
 import dataset as dataset_db
 
 from datafuzz.dataset import DataSet
+from datafuzz.output import chunks_to_output
+from datafuzz.utils.db_helpers import close_connections
 
 import pandas as pd
 import numpy as np
 
 
+@pytest.fixture(autouse=True, scope='module')
+def shared_connections():
+    # sql tests share one connection per database; close them so
+    # sqlite removes its -wal and -shm files
+    yield
+    close_connections()
+
+
 @pytest.mark.parametrize('input_obj',[
     [{'a': 1, 'b': 2, 'd': 5},
       {'a': 4, 'b': 5, 'd': 90}],
@@ -248,3 +259,258 @@ def test_column_agg(input_obj, column, agg, result, kwargs):
     if isinstance(column, str):
         column = data.column_idx(column)
     assert data.column_agg(column, agg) == result
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'pandas': False}])
+def test_iter_chunks(kwargs):
+    data = DataSet('file://tests/data/test_csv.csv', chunksize=2, **kwargs)
+    assert len(data) == 2
+    sizes = [len(chunk) for chunk in data.iter_chunks()]
+    assert sizes == [2, 1]
+    assert data.original == 'file://tests/data/test_csv.csv'
+
+
+def test_iter_chunks_no_chunksize():
+    data = DataSet([[1, 2], [3, 4]])
+    assert [len(chunk) for chunk in data.iter_chunks()] == [2]
+
+
+@pytest.mark.parametrize('output,kwargs', [
+    ('file:///tmp/test_chunks.csv', {}),
+    ('file:///tmp/test_chunks.csv', {'pandas': False}),
+    ('file:///tmp/test_chunks.json', {}),
+    ('file:///tmp/test_chunks.json', {'pandas': False}),
+])
+def test_chunks_to_output(output, kwargs):
+    data = DataSet('file://tests/data/test_csv.csv', chunksize=2,
+                   output=output, **kwargs)
+    filename = chunks_to_output(data.iter_chunks())
+    assert filename == output.replace('file://', '')
+    if filename.endswith('.json'):
+        with open(filename) as myf:
+            assert len(json.load(myf)) == 3
+    else:
+        assert len(DataSet(output, pandas=False)) == 3
+    os.remove(filename)
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'pandas': False}])
+def test_iter_chunks_sql(tmp_path, kwargs):
+    db_uri = 'sqlite:///{}'.format(tmp_path / 'input.db')
+    db = dataset_db.connect(db_uri)
+    db['test'].insert_many([{'a': i, 'b': str(i)} for i in range(25)])
+    db.close()
+    data = DataSet('sql', db_uri=db_uri, query='select a, b from test',
+                   chunksize=10, **kwargs)
+    assert data.data_type == ('list' if kwargs else 'pandas')
+    sizes = [len(chunk) for chunk in data.iter_chunks()]
+    assert sizes == [10, 10, 5]
+
+
+def test_chunks_to_output_in_memory():
+    data = DataSet('file://tests/data/test_csv.csv', chunksize=2,
+                   output='list', pandas=False)
+    records = chunks_to_output(data.iter_chunks())
+    assert isinstance(records, list)
+    assert len(records) == 3
+
+
+def test_copy_on_write_pandas():
+    input_obj = pd.DataFrame({'a': np.arange(10.), 'b': np.arange(10.),
+                              'c': list('abcdefghij')})
+    data = DataSet(input_obj, copy_on_write=True)
+    assert np.shares_memory(data.records['a'].values, input_obj['a'].values)
+    copied = data.materialize(0)
+    assert copied == input_obj['a'].values.nbytes
+    assert data.materialize(0) == 0
+    data.records.iloc[[1, 2], 0] = -1
+    assert input_obj['a'].tolist() == list(np.arange(10.))
+    assert data.records['a'].tolist()[1:3] == [-1, -1]
+
+
+def test_copy_on_write_numpy():
+    input_obj = np.arange(12.).reshape(4, 3)
+    data = DataSet(input_obj, copy_on_write=True)
+    assert np.shares_memory(data.records, input_obj)
+    assert data.materialize(1) == input_obj.nbytes
+    assert not np.shares_memory(data.records, input_obj)
+    assert data.materialize(2) == 0
+
+
+@pytest.mark.parametrize('input_obj,kwargs', [
+    (pd.DataFrame({'a': range(20), 'b': range(20)}), {}),
+    (np.arange(40).reshape(20, 2), {}),
+    ([{'a': i, 'b': i} for i in range(20)], {'pandas': False}),
+])
+def test_sample_seed(input_obj, kwargs):
+    first = DataSet(input_obj, seed=5, **kwargs).sample(.5)
+    second = DataSet(input_obj, seed=5, **kwargs).sample(.5)
+    if isinstance(first, pd.DataFrame):
+        assert first.equals(second)
+    elif isinstance(first, np.ndarray):
+        assert np.array_equal(first, second)
+    else:
+        assert first == second
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_init_npz(tmp_path, compressed):
+    array = np.arange(12.0).reshape(6, 2)
+    save = np.savez_compressed if compressed else np.savez
+    save(tmp_path / 'input.npz', first=array, second=array * 2)
+    data = DataSet('file://{}'.format(tmp_path / 'input.npz'),
+                   npz_key='second')
+    assert data.data_type == 'numpy'
+    assert isinstance(data.records, np.memmap) is not compressed
+    assert data.records.tolist() == (array * 2).tolist()
+    assert data.changed_rows() is None
+
+
+def test_npy_changed_rows(tmp_path):
+    np.save(tmp_path / 'input.npy', np.zeros((10, 3)))
+    data = DataSet('file://{}'.format(tmp_path / 'input.npy'))
+    assert data.mmap_filename.endswith('input.npy')
+    assert data.changed_rows().tolist() == []
+    data.records[[4, 2], 1] = 1
+    data.track_rows([4, 2])
+    data.track_rows(np.array([2]))
+    assert data.changed_rows().tolist() == [2, 4]
+    data.append([[1, 1, 1]])
+    assert data.changed_rows() is None
+
+
+@pytest.mark.parametrize('kwargs', [{'pandas': False}, {}])
+def test_init_json_lines(tmp_path, kwargs):
+    filename = tmp_path / 'input.ndjson'
+    with open(filename, 'w') as myf:
+        myf.write('{"a": 1, "b": "x"}\n\n{"a": 2, "b": "y"}\n')
+    data = DataSet('file://{}'.format(filename), **kwargs)
+    assert len(data) == 2
+    assert data.data_type == ('list' if kwargs else 'pandas')
+    assert data[1]['b'] == 'y'
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'chunksize': 2}])
+def test_csv_engine_rows(tmp_path, kwargs):
+    data = DataSet('file://tests/data/test_csv.csv', csv_engine='rows',
+                   output='file://{}'.format(tmp_path / 'output.csv'),
+                   **kwargs)
+    assert data.data_type == 'list'
+    assert data.header == ['my_str', 'my_int', 'my_float']
+    assert data.records[0] == ("'test'", '12', '1.45')
+    assert data.column_idx('my_float') == 2
+    chunks_to_output(data.iter_chunks())
+
+    written = DataSet('file://{}'.format(tmp_path / 'output.csv'),
+                      pandas=False)
+    original = DataSet('file://tests/data/test_csv.csv', pandas=False)
+    assert written.records == original.records
+
+
+def test_csv_engine_rows_dataset_output():
+    data = DataSet('file://tests/data/test_csv.csv', csv_engine='rows',
+                   output='dataset')
+    output = data.to_output()
+    assert isinstance(output, DataSet)
+    assert list(output.records.columns) == data.header
+    assert output.records.iloc[0].tolist() == list(data.records[0])
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'chunksize': 2},
+                                    {'csv_engine': 'rows'}])
+def test_columnar_csv(tmp_path, kwargs):
+    data = DataSet('file://tests/data/test_csv.csv', columnar=True,
+                   output='file://{}'.format(tmp_path / 'output.csv'),
+                   **kwargs)
+    assert data.data_type == 'columnar'
+    assert data[0] == {'my_str': "'test'", 'my_int': 12, 'my_float': 1.45}
+    assert data.column_idx('my_float') == 2
+    assert data.column_dtype(0) == str
+    assert data.column_dtype(1) == 'int64'
+    assert data.column_dtype(2) == 'float64'
+    chunks_to_output(data.iter_chunks())
+
+    written = DataSet('file://{}'.format(tmp_path / 'output.csv'))
+    original = DataSet('file://tests/data/test_csv.csv')
+    assert written.records.equals(original.records)
+
+
+def test_columnar_list():
+    input_obj = [{'a': idx, 'b': idx / 2, 'c': str(idx)} for idx in range(10)]
+    data = DataSet(input_obj, columnar=True, seed=1)
+    assert data.data_type == 'columnar'
+    assert [row for row in data] == input_obj
+    assert data.column_agg(0, max) == 9
+    assert data.column_agg(1, min) == 0.0
+    assert data.column_dtype(2) == str
+
+    sample = data.sample(0.5)
+    assert len(sample) == 5
+    assert all(row in input_obj for row in sample)
+    assert len(data.sample(0.7, columns=True)) == 2
+    data.append(sample)
+    data.append([{'a': 'x', 'b': None, 'c': '10'}])
+    assert len(data) == 16
+    assert data.column_dtype(0) == int
+    assert data[-1] == {'a': 'x', 'b': None, 'c': '10'}
+    assert data.to_output() is data.records
+
+
+def test_columnar_copy_on_write():
+    input_obj = [{'a': idx, 'b': float(idx)} for idx in range(10)]
+    data = DataSet(input_obj, columnar=True, copy_on_write=True)
+    assert data.records.columns[0] is data.input.columns[0]
+    assert data.materialize(0) == 80
+    assert data.materialize(0) == 0
+    data.records.set_values(0, [0, 1], [-1, -2])
+    assert list(data.input.columns[0]) == list(range(10))
+    assert data.records.columns[1] is data.input.columns[1]
+
+
+@pytest.mark.parametrize('input_obj,kwargs', [
+    ([{'a': 3, 'b': 'x'}, {'a': None, 'b': 'y'}, {'a': 1, 'b': 'x'}],
+     {'pandas': False}),
+    ([{'a': 3.0, 'b': 'x'}, {'a': np.nan, 'b': 'y'}, {'a': 1.0, 'b': 'x'}],
+     {'columnar': True}),
+    (pd.DataFrame({'a': [3, np.nan, 1], 'b': ['x', 'y', 'x']}), {}),
+])
+def test_column_stats(input_obj, kwargs):
+    data = DataSet(input_obj, **kwargs)
+    stats = data.column_stats(0)
+    assert (stats['min'], stats['max']) == (1, 3)
+    assert stats['nulls'] == 1
+    assert stats['distinct'] == 2
+    assert data.column_stats(1)['distinct'] == 2
+    assert data.column_stats(0) is stats
+    assert data.column_agg(0, max) == 3
+
+    data.append(data.sample(1.0))
+    assert data.column_stats(0) is not stats
+
+
+def test_column_stats_invalidated_by_strategy():
+    from datafuzz.noise import NoiseMaker
+    data = DataSet(np.arange(20.).reshape(10, 2))
+    assert data.column_stats(0)['nulls'] == 0
+    assert data.column_stats(1)['max'] == 19
+    NoiseMaker(data, columns=[0], percentage=50, noise=['add_nulls'],
+               seed=1).run_strategy()
+    assert 0 not in data.stats
+    assert data.column_stats(0)['nulls'] > 0
+    assert data.stats[1]['max'] == 19
+
+
+@pytest.mark.parametrize('first,first_type', [
+    (None, type(None)), (float('nan'), type(None)), ('fuzzed', str)])
+def test_column_dtype_sampled(first, first_type):
+    input_obj = [[first, 'a']] + [[idx, 'b'] for idx in range(1, 10)]
+    data = DataSet(input_obj, pandas=False)
+    assert data.column_dtype(0) == int
+    assert data.column_dtype(1) == str
+    assert DataSet(input_obj, pandas=False,
+                   dtype_sample=1).column_dtype(0) == first_type
+
+    data.track_dtypes(0, np.arange(10), [str(idx) for idx in range(10)])
+    assert data.column_dtype(0) == str
+    data.track_dtypes(0, [1, 2], [1.5, 2.5])
+    assert data.column_dtype(0) == str
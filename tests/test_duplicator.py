@@ -75,3 +75,31 @@ def test_duplicate_with_noise(input_obj):
         counter = collections.Counter([str(r) for r in dataset.records])
         assert not any([val if val[1] > 1 else None for val in counter.most_common()])
         assert dataset.records != dataset.input
+
+
+@pytest.mark.parametrize('output', ['file://{}/output.csv',
+                                    'file://{}/output.parquet', 'pandas'])
+def test_duplicate_noise_csv_rows(tmpdir, output):
+    input_file = tmpdir.join('input.csv')
+    input_file.write('a,b,c\n' + ''.join(
+        '{},{},x{}\n'.format(idx, idx * .5, idx) for idx in range(30)))
+    dataset = DataSet('file://{}'.format(input_file), csv_engine='rows',
+                      output=output.format(tmpdir), seed=1)
+    duper = Duplicator(dataset, percentage=30, add_noise=True, seed=1)
+    duper.run_strategy()
+    assert len(dataset) == 39
+    assert all(isinstance(row, tuple) for row in dataset.records)
+    result = dataset.to_output()
+    if output == 'pandas':
+        assert result.shape == (39, 3)
+    else:
+        assert len(DataSet(result if result.startswith('file://')
+                           else 'file://' + result)) == 39
+
+
+def test_duplicate_noise_dict_rows():
+    dataset = DataSet([{'a': idx, 'b': float(idx)} for idx in range(20)],
+                      pandas=False, seed=2)
+    Duplicator(dataset, percentage=50, add_noise=True, seed=2).run_strategy()
+    assert len(dataset) == 30
+    assert all(isinstance(row, dict) for row in dataset.records)
@@ -6,7 +6,8 @@ import pytest
 import numpy as np
 from datafuzz.utils.fuzz_helpers import add_format, change_encoding, to_bytes, \
         insert_boms, nanify, bigints, hexify,  \
-        sql, metachars, files, delimiter, emoji
+        sql, metachars, files, delimiter, emoji, nanify_array, \
+        bigints_array, hexify_array
 
 
 test_strings = ['testíng', 'tÅst 123' * 40, '\n👿\n妖魔']
@@ -63,6 +64,23 @@ def test_hexify(input_num):
     assert isinstance(int(output_num, 16), int)
 
 
+def test_numeric_arrays():
+    vals = np.array(test_numbers)
+    rng = np.random.default_rng(7)
+
+    nulls = nanify_array(vals, rng=rng)
+    assert nulls.shape == vals.shape
+    assert all(n is np.nan or n in [None, 'null', 'n/a', '', -1]
+               for n in nulls)
+    assert np.nan not in list(nanify_array(vals, use_numpy=False, rng=rng))
+
+    big = bigints_array(vals, rng=rng)
+    assert all((abs(int(b)) + 1) & abs(int(b)) == 0 for b in big)
+
+    hexes = hexify_array(vals, rng=rng)
+    assert [int(h, 16) for h in hexes] == [int(v) for v in vals]
+
+
 def test_sql():
     output = sql('foo')
     assert output.endswith(';')
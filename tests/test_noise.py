@@ -80,8 +80,80 @@ def test_set_value(input_obj,cols,val):
     noizer.set_value(val)
     for col in noizer.columns:
         if noizer.dataset.data_type == 'pandas':
-            assert noizer.dataset.records[noizer.dataset.records.loc[:,col] == val].shape[0] >= 1
+            assert noizer.dataset.records[noizer.dataset.records.iloc[:, col] == val].shape[0] >= 1
         elif noizer.dataset.data_type == 'numpy':
             assert val in noizer.dataset.records[:,col]
         else:
             assert val in [r[col] for r in noizer.dataset.records]
+
+
+def test_copy_on_write_report():
+    input_obj = pd.DataFrame({'a': np.arange(10.), 'b': np.arange(10.)})
+    dataset = DataSet(input_obj, copy_on_write=True)
+    noizer = NoiseMaker(dataset, columns=['a'], percentage=50,
+                        noise=['string_permutation', 'random'])
+    noizer.run_strategy()
+    assert input_obj['a'].tolist() == list(np.arange(10.))
+    assert dataset.memory_report['NoiseMaker'] == input_obj['a'].values.nbytes
+
+
+def test_columnar_nulls_widen_int_column():
+    input_obj = [{'a': idx, 'b': str(idx)} for idx in range(10)]
+    dataset = DataSet(input_obj, columnar=True, copy_on_write=True)
+    noizer = NoiseMaker(dataset, columns=['a'], percentage=50,
+                        noise=['add_nulls'], seed=1)
+    noizer.run_strategy()
+    assert dataset.column_dtype(0) == 'float64'
+    assert dataset.column_agg(0, lambda col: sum(val != val for val in col))
+    assert dataset.input.dtype(0) == 'int64'
+    assert dataset.memory_report['NoiseMaker'] == 80
+
+
+@pytest.mark.parametrize('input_obj,kwargs,column', [
+    (pd.DataFrame({'a': range(100)}, index=range(500, 600)), {}, 'a'),
+    (pd.DataFrame({'b': range(100), 'a': range(100)},
+                  index=range(500, 600)), {}, 1),
+    (np.arange(200).reshape(100, 2).astype(float), {}, 0),
+    ([[idx, idx] for idx in range(100)], {'pandas': False}, 0),
+    ([{'a': idx, 'b': idx} for idx in range(100)], {'columnar': True}, 0),
+])
+def test_set_value_distinct_rows(input_obj, kwargs, column):
+    dataset = DataSet(input_obj, **kwargs)
+    noizer = NoiseMaker(dataset, columns=[column], percentage=30,
+                        noise=['add_nulls'], seed=2)
+    noizer.set_value(np.nan, column)
+    assert len(dataset) == 100
+    if isinstance(column, str):
+        column = dataset.column_idx(column)
+    assert dataset.column_agg(
+        column, lambda col: sum(val != val for val in col)) == 30
+
+
+@pytest.mark.parametrize('noise', [['type_transform'], ['string_permutation']])
+def test_numpy_noise_to_csv(tmpdir, noise):
+    output = tmpdir.join('noise.csv')
+    dataset = DataSet(np.arange(40).reshape(20, 2),
+                      output='file://{}'.format(output), seed=3)
+    noizer = NoiseMaker(dataset, columns=[0], percentage=50, noise=noise,
+                        seed=3)
+    noizer.run_strategy()
+    assert dataset.records.dtype == object
+    assert dataset.to_output() == str(output)
+    lines = output.read().splitlines()
+    assert len(lines) == 20
+    assert lines[-1].endswith(',39')
+
+
+def test_type_transform_skips_failing_column():
+    outputs = []
+    for workers in (1, 2):
+        dataset = DataSet(pd.DataFrame({'a': range(20), 'b': ['x y'] * 20,
+                                        'c': [1.5] * 20}), seed=1)
+        NoiseMaker(dataset, percentage=50, noise=['type_transform'],
+                   columns=['a', 'b', 'c'], workers=workers,
+                   seed=4).run_strategy()
+        outputs.append(dataset.records)
+    assert outputs[0].equals(outputs[1])
+    assert (outputs[0]['b'] == 'x y').all()
+    changed = [val for val in outputs[0]['c'] if val != 1.5]
+    assert changed and {type(val) for val in changed} <= {str, int}
@@ -1,5 +1,8 @@
 import pytest
-from datafuzz.utils.noise_helpers import messy_spaces, pertubate_str
+import numpy as np
+from datafuzz.utils.noise_helpers import messy_spaces, pertubate_str, \
+    messy_spaces_array, generate_random_int_array, \
+    generate_random_float_array
 
 input_strs = ['testing this', 'testing with spaces', 'testing with spaces and numbers 121 !!']
 
@@ -10,3 +13,33 @@ def test_messy_spaces(input_str):
 @pytest.mark.parametrize('input_str', input_strs)
 def test_pertubate_str(input_str):
     assert input_str != pertubate_str(input_str)
+
+
+def test_messy_spaces_array():
+    vals = np.array(input_strs + [np.nan], dtype=object)
+    rng = np.random.default_rng(42)
+    output = messy_spaces_array(vals, rng=rng)
+    assert output.shape == vals.shape
+    assert output.dtype == object
+    for orig, new in zip(input_strs, output):
+        assert new.replace(' ', '') == orig.replace(' ', '')
+    assert np.isnan(output[-1])
+
+
+@pytest.mark.parametrize('low,high', [(0, 100), (-5, 5), (3, 3)])
+def test_generate_random_int_array(low, high):
+    vals = np.arange(low, low + 20)
+    output = generate_random_int_array(vals, low=low, high=high,
+                                       rng=np.random.default_rng(0))
+    assert output.shape == vals.shape
+    assert np.issubdtype(output.dtype, np.integer)
+    assert not (output == vals).any()
+
+
+def test_generate_random_float_array():
+    vals = np.random.rand(50)
+    output = generate_random_float_array(vals, low=-1, high=1,
+                                         rng=np.random.default_rng(0))
+    assert output.shape == vals.shape
+    assert ((output >= -1) & (output <= 1)).all()
+    assert not (output == vals).any()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from datafuzz.utils.parallel_helpers import split_blocks, shared_values, \
+    read_block, transform_block, run_blocks
+from datafuzz.utils.noise_helpers import generate_random_int, \
+    generate_random_int_array
+
+
+@pytest.mark.parametrize('num_values,block_size,blocks', [
+    (0, 10, []),
+    (10, 10, [(0, 10)]),
+    (25, 10, [(0, 10), (10, 20), (20, 25)]),
+])
+def test_split_blocks(num_values, block_size, blocks):
+    assert split_blocks(num_values, block_size=block_size) == blocks
+
+
+@pytest.mark.parametrize('values', [
+    np.arange(20, dtype=float),
+    np.array(['a', 'b', 'c'] * 5, dtype=object),
+    list(range(20)),
+])
+def test_shared_values(values):
+    with shared_values(values) as shared:
+        if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+            assert isinstance(shared, tuple)
+        assert list(read_block(shared, 2, 7)) == list(values[2:7])
+
+
+def test_run_blocks_in_order():
+    values = np.arange(100, dtype=np.int64)
+    with shared_values(values) as shared:
+        jobs = [(abs, None, shared, start, stop, np.random.SeedSequence(1))
+                for start, stop in split_blocks(100, block_size=7)]
+        results = run_blocks(jobs, 3)
+    assert np.concatenate(results).tolist() == list(range(100))
+
+
+def test_transform_block_seeded():
+    values = np.arange(10)
+    first = transform_block(None, generate_random_int_array, values,
+                            0, 10, np.random.SeedSequence(42))
+    second = transform_block(None, generate_random_int_array, values,
+                             0, 10, np.random.SeedSequence(42))
+    assert np.array_equal(first, second)
+
+
+def test_transform_block_passes_rng():
+    values = list(range(20))
+    first = transform_block(generate_random_int, None, values,
+                            0, 20, np.random.SeedSequence(7))
+    second = transform_block(generate_random_int, None, values,
+                             0, 20, np.random.SeedSequence(7))
+    assert first == second
+
+
+def test_transform_block_mixed_types():
+    mixed = transform_block(lambda val: str(val) if val % 2 else float(val),
+                            None, np.arange(6), 0, 6, None)
+    assert mixed.dtype == object
+    assert mixed.tolist() == [0.0, '1', 2.0, '3', 4.0, '5']
+    numbers = transform_block(float, None, np.arange(3), 0, 3, None)
+    assert numbers.dtype == float
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from datafuzz.utils.random_helpers import SeedStream
+
+WITHOUT_NUMPY = '''
+import sys
+
+class BlockNumpy(object):
+    def find_spec(self, name, path=None, target=None):
+        if name.split('.')[0] in ('numpy', 'pandas', 'pyarrow'):
+            raise ImportError(name)
+
+sys.meta_path.insert(0, BlockNumpy())
+from datafuzz.settings import HAS_NUMPY
+from datafuzz.dataset import DataSet
+from datafuzz.duplicator import Duplicator
+from datafuzz.generators import DatasetGenerator
+assert not HAS_NUMPY
+dataset = DataSet([[idx, str(idx)] for idx in range(20)], seed=1)
+assert len(dataset.sample(.5)) == 10
+Duplicator(dataset, percentage=50).run_strategy()
+assert len(dataset) == 30
+generator = DatasetGenerator({'schema': {'num': 'range(0,10)'},
+                              'output': 'list', 'num_rows': 5, 'seed': 2})
+generator.generate()
+assert len(generator.records) == 5
+'''
+
+
+def test_seed_stream():
+    first, second = SeedStream(4), SeedStream(4)
+    assert first.generate_state(10) == second.generate_state(10)
+    children = first.spawn(2) + first.spawn(1)
+    assert [child.spawn_key for child in children] == [(0,), (1,), (2,)]
+    assert children[0].generate_state(4) != children[1].generate_state(4)
+    assert children[2].generate_state(4) == \
+        second.spawn(3)[2].generate_state(4)
+    assert all(0 <= word < 2 ** 32 for word in first.generate_state(20))
+
+
+def test_without_numpy():
+    subprocess.run([sys.executable, '-c', WITHOUT_NUMPY], check=True)
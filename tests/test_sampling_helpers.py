@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from datafuzz.utils import sampling_helpers
+from datafuzz.utils.sampling_helpers import bernoulli_indexes, sample_indexes
+
+
+@pytest.mark.parametrize('num_rows,size', [
+    (100000, 10),       # floyd
+    (100000, 99990),    # complement of floyd
+    (100000, 30000),    # bernoulli mask
+    (100000, 0),
+    (100000, 100000),
+    (10, 20),
+    (0, 0),
+])
+def test_sample_indexes(num_rows, size):
+    indexes = sample_indexes(np.random.default_rng(3), num_rows, size)
+    assert len(indexes) == min(size, num_rows)
+    assert len(np.unique(indexes)) == len(indexes)
+    assert (np.diff(indexes) > 0).all()
+    assert ((indexes >= 0) & (indexes < max(num_rows, 1))).all()
+    again = sample_indexes(np.random.default_rng(3), num_rows, size)
+    assert (indexes == again).all()
+
+
+def test_sample_indexes_uniform(monkeypatch):
+    monkeypatch.setattr(sampling_helpers, 'BLOCK_ROWS', 7)
+    rng = np.random.default_rng(4)
+    counts = np.zeros(20)
+    for _ in range(2000):
+        counts[sample_indexes(rng, 20, 8)] += 1
+    assert (abs(counts - 800) < 120).all()
+
+
+def test_bernoulli_indexes(monkeypatch):
+    monkeypatch.setattr(sampling_helpers, 'BLOCK_ROWS', 1000)
+    indexes = bernoulli_indexes(np.random.default_rng(5), 10500, .5)
+    assert abs(len(indexes) - 5250) < 300
+    assert (np.diff(indexes) > 0).all() and indexes[-1] < 10500
+    assert len(bernoulli_indexes(np.random.default_rng(5), 0, .5)) == 0
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+
+from datafuzz.utils.schema_helpers import compile_field, compile_schema, \
+    _compile_cached
+
+
+@pytest.mark.parametrize('field_val,kind,values', [
+    ('range(1,20)', 'range', range(1, 20)),
+    ('range(-5,-1)', 'range', range(-5, -1)),
+    ('arange(-5.0,5.0)', 'choice', np.arange(-5.0, 5.0)),
+    ('arange(1,4)', 'choice', np.arange(1, 4)),
+    ('faker.name', 'faker', 'name'),
+    (['a', 'b'], 'choice', ('a', 'b')),
+    ('abc', 'choice', ('a', 'b', 'c')),
+])
+def test_compile_field(field_val, kind, values):
+    compiled = compile_field(field_val)
+    assert compiled[0] == kind
+    if isinstance(values, np.ndarray):
+        assert compiled[1].dtype == values.dtype
+        assert np.array_equal(compiled[1], values)
+    else:
+        assert compiled[1] == values
+
+
+def test_compile_field_skips():
+    assert compile_field(12) is None
+    assert compile_field(None) is None
+
+
+def test_compile_schema_cached():
+    schema = {'name': 'faker.name', 'num': 'range(0,10)', 'bad': 3}
+    first = compile_schema(schema)
+    hits = _compile_cached.cache_info().hits
+    second = compile_schema(dict(schema))
+    assert first is second
+    assert _compile_cached.cache_info().hits == hits + 1
+    assert [spec[0] for spec in first] == ['name', 'num']
+
+
+def test_compile_schema_uncached():
+    schema = {'num': range(3), 'vals': np.arange(3)}
+    specs = compile_schema(schema)
+    assert specs[0] == ('num', 'range', range(3))
+    assert specs[1][1] == 'choice'
+
+
+def test_compile_field_pool():
+    assert compile_field({'value': 'faker.name', 'pool_size': 10}) == \
+        ('pool', ('name', 10, None))
+    assert compile_field({'value': 'range(1,3)'}) == ('range', range(1, 3))
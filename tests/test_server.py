@@ -0,0 +1,96 @@
+import asyncio
+import csv
+import io
+import json
+import pytest
+
+from datafuzz.generators import DatasetGenerator
+from datafuzz.server import DataStreamServer, serialize_rows
+from datafuzz.cli import get_serve_parser
+
+
+@pytest.mark.parametrize('framing,header,expected', [
+    ('ndjson', False, b'{"a": 1, "b": "x"}\n{"a": 2, "b": "y"}\n'),
+    ('csv', True, b'a,b\r\n1,x\r\n2,y\r\n'),
+    ('csv', False, b'1,x\r\n2,y\r\n'),
+])
+def test_serialize_rows(framing, header, expected):
+    rows = [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}]
+    assert serialize_rows(rows, framing=framing, header=header) == expected
+
+
+def test_serialize_rows_bad_framing():
+    with pytest.raises(NotImplementedError):
+        serialize_rows([], framing='xml')
+
+
+async def read_all(path, num_clients):
+    async def client():
+        reader, writer = await asyncio.open_unix_connection(path=path)
+        data = await reader.read()
+        writer.close()
+        return data
+    return await asyncio.gather(*[client() for _ in range(num_clients)])
+
+
+@pytest.mark.parametrize('framing,strategies', [
+    ('ndjson', None),
+    ('csv', [{'type': 'noise', 'percentage': 20, 'columns': ['num'],
+              'noise': ['add_nulls']}]),
+])
+def test_stream_server(tmp_path, framing, strategies):
+    path = str(tmp_path / 'datafuzz.sock')
+    generator = DatasetGenerator({'schema': {'num': 'range(0,10)'},
+                                  'output': 'list', 'num_rows': 55})
+    stream_server = DataStreamServer(generator, framing=framing,
+                                     batch_size=10, unix_socket=path,
+                                     strategies=strategies)
+
+    async def run():
+        server = await stream_server.start()
+        async with server:
+            return await read_all(path, 3)
+
+    results = asyncio.run(run())
+    for data in results:
+        if framing == 'ndjson':
+            rows = [json.loads(line) for line in data.decode().splitlines()]
+        else:
+            rows = list(csv.DictReader(io.StringIO(data.decode())))
+        assert len(rows) == 55
+        assert set(rows[0].keys()) == {'num'}
+    assert stream_server.rows_sent == 165
+    assert stream_server.clients == 0
+
+
+def test_stream_server_unbounded_clients(tmp_path):
+    path = str(tmp_path / 'datafuzz.sock')
+    generator = DatasetGenerator({'schema': {'num': 'range(0,10)'},
+                                  'output': 'list', 'num_rows': None})
+    # with a write buffer this large drain() never waits, so only
+    # the yield after each batch lets the second client be served
+    stream_server = DataStreamServer(generator, batch_size=10,
+                                     unix_socket=path, high_water=2 ** 30)
+
+    async def client():
+        reader, writer = await asyncio.open_unix_connection(path=path)
+        lines = [await reader.readline() for _ in range(100)]
+        writer.close()
+        return lines
+
+    async def run():
+        server = await stream_server.start()
+        async with server:
+            return await asyncio.wait_for(
+                asyncio.gather(client(), client()), timeout=30)
+
+    for lines in asyncio.run(run()):
+        assert all(json.loads(line).keys() == {'num'} for line in lines)
+
+
+def test_serve_parser():
+    args = get_serve_parser().parse_args(
+        ['serve', 'schema.yaml', '--framing', 'csv', '--num_rows', '0'])
+    assert args.file_name == 'schema.yaml'
+    assert args.framing == 'csv'
+    assert args.num_rows == 0
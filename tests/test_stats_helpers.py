@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from datafuzz.utils.stats_helpers import column_stats, estimate_distinct, \
+    infer_dtype, sample_positions
+
+
+@pytest.mark.parametrize('values', [
+    np.arange(100000) % 50000,
+    np.random.default_rng(1).random(200000),
+    ['value {}'.format(idx % 30000) for idx in range(100000)],
+])
+def test_estimate_distinct(values):
+    exact = len(set(values.tolist() if isinstance(values, np.ndarray)
+                    else values))
+    assert abs(estimate_distinct(values) - exact) < exact * 0.1
+
+
+def test_estimate_distinct_small():
+    assert estimate_distinct(np.array([1, 2, 2, 3], dtype=np.int8)) == 3
+    assert estimate_distinct(['a', 'a']) == 1
+    assert estimate_distinct([[1], [2]]) is None
+
+
+def test_column_stats_unordered():
+    stats = column_stats(['a', 1, None, 'a'], object)
+    assert stats['min'] is None and stats['max'] is None
+    assert stats['nulls'] == 1
+    assert stats['distinct'] == 2
+
+
+def test_infer_dtype():
+    assert infer_dtype([int, int, float, None]) == float
+    assert infer_dtype([str, str, int, None, None]) == str
+    assert infer_dtype([None]) is type(None)
+    assert list(sample_positions(10, 3)) == [0, 3, 6]
+    assert list(sample_positions(2, 100)) == [0, 1]
@@ -0,0 +1,114 @@
+from functools import partial
+import pytest
+import numpy as np
+import pandas as pd
+
+from datafuzz.dataset import DataSet
+from datafuzz.strategy import Strategy
+from datafuzz.utils.fuzz_helpers import nanify
+from datafuzz.utils.noise_helpers import messy_spaces, messy_spaces_array, \
+    generate_random_int, generate_random_int_array
+
+
+@pytest.mark.parametrize('input_obj', [
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+    [(1, 2, 3), (4, 5, 6), (7, 8, 9)],
+    [{'a': 1, 'b': 2, 'c': 3},
+     {'a': 4, 'b': 5, 'c': 6},
+     {'a': 7, 'b': 8, 'c': 9}],
+])
+def test_apply_func_to_column_list(input_obj):
+    dataset = DataSet(input_obj, pandas=False)
+    strategy = Strategy(dataset, percentage=50)
+    strategy.apply_func_to_column(lambda x: x * -1, 1)
+
+    changed = 0
+    for orig, row in zip(input_obj, dataset.records):
+        orig_vals = list(orig.values()) if isinstance(orig, dict) else orig
+        vals = list(row.values()) if isinstance(row, dict) else row
+        assert type(row) is type(orig) or isinstance(row, list)
+        assert vals[0] == orig_vals[0] and vals[2] == orig_vals[2]
+        if vals[1] != orig_vals[1]:
+            assert vals[1] == orig_vals[1] * -1
+            changed += 1
+    assert changed > 0
+    # input rows are never modified in place
+    assert dataset.input == input_obj
+
+
+def test_update_rows_only_touches_indexes():
+    records = [{'a': i, 'b': i} for i in range(10)]
+    dataset = DataSet(records, pandas=False)
+    Strategy.update_rows(dataset, {2, 5}, 0, str)
+    assert [r['a'] for r in dataset.records] == \
+        [0, 1, '2', 3, 4, '5', 6, 7, 8, 9]
+    assert [r['b'] for r in dataset.records] == list(range(10))
+    assert dataset.records[0] is records[0]
+
+
+def test_vectorize():
+    assert Strategy.vectorize(messy_spaces) is messy_spaces_array
+    batch = Strategy.vectorize(partial(generate_random_int, low=1, high=3))
+    assert batch.func is generate_random_int_array
+    assert batch.keywords == {'low': 1, 'high': 3}
+    assert Strategy.vectorize(lambda x: x) is None
+    assert Strategy.vectorize(partial(generate_random_int, 5)) is None
+
+
+@pytest.mark.parametrize('input_obj', [
+    np.arange(30, dtype=float).reshape(10, 3),
+    pd.DataFrame({'a': range(10), 'b': np.arange(10) * 1.5}),
+])
+def test_apply_func_to_column_batch(input_obj):
+    dataset = DataSet(input_obj)
+    strategy = Strategy(dataset, percentage=50)
+    strategy.apply_func_to_column(nanify, 1)
+    if dataset.data_type == 'pandas':
+        column = dataset.records.iloc[:, 1].tolist()
+        original = input_obj.iloc[:, 1].tolist()
+    else:
+        column = dataset.records[:, 1].tolist()
+        original = input_obj[:, 1].tolist()
+    assert column != original
+    assert all(c == o or c in [None, 'null', 'n/a', '', -1] or c != c
+               for c, o in zip(column, original))
+
+
+@pytest.mark.parametrize('input_obj,kwargs', [
+    (np.arange(300, dtype=float).reshape(100, 3), {}),
+    (pd.DataFrame({'a': range(100), 'b': ['a b c'] * 100}), {}),
+    ([[i, 'a b c'] for i in range(100)], {'pandas': False}),
+    ([{'a': i, 'b': 'a b c'} for i in range(100)], {'pandas': False}),
+])
+def test_apply_funcs_to_columns_workers(input_obj, kwargs):
+    dataset = DataSet(input_obj, **kwargs)
+    strategy = Strategy(dataset, percentage=50, workers=2)
+    strategy.apply_funcs_to_columns([
+        (partial(generate_random_int, low=-10, high=-1), 0),
+        (messy_spaces, 1),
+        (lambda x: x, 2)] if dataset.data_type == 'numpy' else [
+        (partial(generate_random_int, low=-10, high=-1), 0),
+        (messy_spaces, 1)])
+    first = [strategy.column_values(dataset, [idx], 0)[0]
+             for idx in range(len(dataset))]
+    assert len(first) == 100
+    assert any(val < 0 for val in first)
+    assert all(val >= -10 for val in first)
+
+
+@pytest.mark.parametrize('input_obj,kwargs', [
+    (np.arange(300, dtype=float).reshape(100, 3), {}),
+    (pd.DataFrame({'a': range(100), 'b': ['a b c'] * 100}), {}),
+    ([{'a': i, 'b': 'a b c'} for i in range(100)], {'pandas': False}),
+])
+def test_seed_same_output_any_workers(input_obj, kwargs):
+    outputs = []
+    for workers in [1, 2]:
+        dataset = DataSet(input_obj, **kwargs)
+        strategy = Strategy(dataset, percentage=50, workers=workers, seed=3)
+        strategy.apply_funcs_to_columns([
+            (partial(generate_random_int, low=-10, high=-1), 0),
+            (messy_spaces, 1)])
+        outputs.append([strategy.column_values(dataset, [idx], col)[0]
+                        for idx in range(len(dataset)) for col in [0, 1]])
+    assert outputs[0] == outputs[1]